@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+RAG 질의 HTTP API 서버 (Streamlit 없이 다른 서비스에서 검색/답변 요청)
+
+    python api_server.py --port 8000 --workers 4
+
+    GET  /health   구성 요소 준비 상태 (모두 준비되기 전에는 503)
+    POST /search   하이브리드 검색 결과
+    POST /answer   RAG 답변 ("stream": true면 Server-Sent Events로 검색 결과, 답변 조각, 최종 결과 전송)
+    GET  /metrics  Prometheus 지표 (워커별)
+
+워커 프로세스마다 하나의 RAGSystem과 AsyncRAGEngine을 만들어 모든 요청이 공유합니다.
+워커를 여러 개 띄우면 부모 프로세스가 먼저 코퍼스/BM25 디스크 스냅샷을 만들어 두므로,
+각 워커는 Pinecone을 다시 읽지 않고 스냅샷을 메모리 매핑해 바로 인덱스를 엽니다.
+"""
+
+import os
+import json
+import logging
+import argparse
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, field_validator
+
+from config import Config
+from fusion import METHODS
+from metrics import REGISTRY
+from lazy import FAILED, READY
+from async_engine import AsyncRAGEngine
+from rag_system import RAGSystem, get_shared_rag_system
+
+logger = logging.getLogger(__name__)
+
+
+class SearchRequest(BaseModel):
+    """검색 요청 (BM25 가중치는 1 - vector_weight)"""
+
+    query: str = Field(..., min_length=1, max_length=Config.MAX_QUERY_LENGTH)
+    vector_weight: float = Field(Config.VECTOR_WEIGHT, ge=0.0, le=1.0)
+    vector_top_k: int = Field(Config.VECTOR_TOP_K, ge=1, le=100)
+    bm25_top_k: int = Field(Config.BM25_TOP_K, ge=1, le=100)
+    final_top_k: int = Field(Config.FINAL_TOP_K, ge=1, le=20)
+    fusion: Optional[str] = None
+
+    @field_validator("fusion")
+    @classmethod
+    def _check_fusion(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None and value not in METHODS:
+            raise ValueError(f"fusion은 {', '.join(METHODS)} 중 하나여야 합니다.")
+        return value
+
+    def search_kwargs(self) -> Dict[str, Any]:
+        return {
+            "vector_weight": self.vector_weight,
+            "bm25_weight": round(1.0 - self.vector_weight, 6),
+            "final_top_k": self.final_top_k,
+            "fusion": self.fusion
+        }
+
+
+class AnswerRequest(SearchRequest):
+    """답변 요청"""
+
+    model: str = Config.GPT_MODEL
+    stream: bool = False
+    use_cache: bool = True
+
+
+def _sse(event: Dict[str, Any]) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def create_app(rag_system: Optional[RAGSystem] = None, **engine_kwargs) -> FastAPI:
+    """
+    API 애플리케이션 생성
+
+    Args:
+        rag_system: 사용할 RAGSystem (없으면 시작 시 프로세스 공유 인스턴스 생성)
+        engine_kwargs: AsyncRAGEngine 인자 (openai_base_url, pinecone_host 등)
+    """
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        system = rag_system or get_shared_rag_system(
+            Config.PINECONE_API_KEY, Config.PINECONE_INDEX_NAME, Config.OPENAI_API_KEY, warmup=False
+        )
+        # 준비는 백그라운드에서 진행하고 준비 전 요청은 필요한 구성 요소를 기다림 (/health는 503)
+        system.start_loading()
+        app.state.rag_system = system
+        app.state.engine = AsyncRAGEngine(system, **engine_kwargs)
+        try:
+            yield
+        finally:
+            await app.state.engine.aclose()
+
+    app = FastAPI(title="유니베라 RAG API", lifespan=lifespan)
+
+    def _engine(request: Request) -> AsyncRAGEngine:
+        failed = {key: status["error"] for key, status in request.app.state.rag_system.readiness().items()
+                  if status["state"] == FAILED}
+        if failed:
+            raise HTTPException(status_code=503, detail={"failed": failed})
+        return request.app.state.engine
+
+    @app.get("/health")
+    async def health(request: Request):
+        components = request.app.state.rag_system.readiness()
+        states = {status["state"] for status in components.values()}
+        if FAILED in states:
+            status = "failed"
+        elif states == {READY}:
+            status = "ready"
+        else:
+            status = "loading"
+        body = {"status": status, "pid": os.getpid(), "components": components,
+                "limits": request.app.state.engine.stats(),
+                "coalescing": request.app.state.engine.inflight.stats()}
+        return JSONResponse(body, status_code=200 if status == "ready" else 503)
+
+    @app.post("/search")
+    async def search(body: SearchRequest, request: Request):
+        engine = _engine(request)
+        timings: Dict[str, float] = {}
+        results = await engine.hybrid_search(
+            body.query, vector_top_k=body.vector_top_k, bm25_top_k=body.bm25_top_k,
+            timings=timings, **body.search_kwargs()
+        )
+        return {"query": body.query, "results": results, "timings": timings}
+
+    @app.post("/answer")
+    async def answer(body: AnswerRequest, request: Request):
+        engine = _engine(request)
+        options = {**body.search_kwargs(), "model": body.model, "use_cache": body.use_cache}
+        if not body.stream:
+            return await engine.rag_query(body.query, **options)
+
+        async def events() -> AsyncIterator[str]:
+            # 클라이언트가 끊기면 스트림을 닫아 OpenAI 연결과 동시 요청 제한 자리를 바로 반환
+            async with aclosing(engine.rag_query_stream(body.query, **options)) as stream:
+                async for event in stream:
+                    if await request.is_disconnected():
+                        logger.info("클라이언트 연결 종료: 답변 스트림 중단")
+                        break
+                    yield _sse(event)
+
+        return StreamingResponse(events(), media_type="text/event-stream",
+                                 headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @app.get("/metrics")
+    async def metrics():
+        return PlainTextResponse(REGISTRY.to_prometheus(), media_type="text/plain; version=0.0.4")
+
+    return app
+
+
+# uvicorn api_server:app (워커 프로세스마다 import)
+app = create_app()
+
+
+def preload() -> RAGSystem:
+    """워커를 띄우기 전에 코퍼스/BM25를 준비해 디스크 스냅샷 저장 (워커는 스냅샷을 바로 로드)"""
+    system = get_shared_rag_system(Config.PINECONE_API_KEY, Config.PINECONE_INDEX_NAME,
+                                   Config.OPENAI_API_KEY, warmup=False)
+    system.wait_for_corpus()
+    if not system.enable_snapshot:
+        logger.warning("스냅샷이 꺼져 있어 워커마다 벡터 저장소에서 코퍼스를 다시 구축합니다.")
+    return system
+
+
+def main():
+    parser = argparse.ArgumentParser(description="유니베라 RAG HTTP API 서버")
+    parser.add_argument("--host", default=Config.API_HOST)
+    parser.add_argument("--port", type=int, default=Config.API_PORT)
+    parser.add_argument("--workers", type=int, default=Config.API_WORKERS, help="워커 프로세스 수")
+    parser.add_argument("--no-preload", action="store_true", help="시작 전 코퍼스/스냅샷 준비 생략")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+    if not Config.validate_config():
+        raise SystemExit(1)
+
+    system = None if args.no_preload else preload()
+    if args.workers > 1:
+        # 워커는 새 프로세스에서 이 모듈을 import해 각자 RAGSystem을 만듦
+        uvicorn.run("api_server:app", host=args.host, port=args.port, workers=args.workers,
+                    log_level=Config.LOG_LEVEL.lower())
+    else:
+        uvicorn.run(create_app(system), host=args.host, port=args.port, log_level=Config.LOG_LEVEL.lower())
+
+
+if __name__ == "__main__":
+    main()
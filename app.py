@@ -1,11 +1,13 @@
 import streamlit as st
 import os
 import sys
+import time
 from datetime import datetime
 import json
 
 # 로컬 모듈 import
-from rag_system import RAGSystem
+from rag_system import get_shared_rag_system, start_background_warmup
+from quick_answers import get_shared_quick_answers
 from ui_components import ChatUI, SidebarUI
 from config import Config
 
@@ -208,22 +210,58 @@ def initialize_session_state():
     if 'rag_system' not in st.session_state:
         st.session_state.rag_system = None
     
+    if 'quick_answers' not in st.session_state:
+        st.session_state.quick_answers = None
+    
     if 'dark_mode' not in st.session_state:
         st.session_state.dark_mode = False
     
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
 
+    if 'vector_weight' not in st.session_state:
+        st.session_state.vector_weight = Config.VECTOR_WEIGHT
+    
+    if 'bm25_weight' not in st.session_state:
+        st.session_state.bm25_weight = Config.BM25_WEIGHT
+
+# 구성 요소 상태 표시 아이콘
+READINESS_ICONS = {"pending": "⏸️", "loading": "⏳", "ready": "✅", "failed": "❌"}
+
+def wait_until_ready(rag_system, poll_interval: float = 0.3):
+    """구성 요소별 로딩 상태를 표시하며 모두 준비될 때까지 대기 (실패 시 예외)"""
+    placeholder = st.empty()
+    while not rag_system.is_ready:
+        readiness = rag_system.readiness()
+        with placeholder.container():
+            st.info("🔧 RAG 시스템을 준비하는 중... (구성 요소를 동시에 로딩합니다)")
+            for component in readiness.values():
+                seconds = f" ({component['seconds']:.1f}초)" if component['seconds'] is not None else ""
+                st.write(f"{READINESS_ICONS[component['state']]} {component['name']}{seconds}")
+        
+        errors = [f"{c['name']}: {c['error']}" for c in readiness.values() if c['state'] == "failed"]
+        if errors:
+            placeholder.empty()
+            raise RuntimeError("; ".join(errors))
+        time.sleep(poll_interval)
+    placeholder.empty()
+
 def load_rag_system():
-    """RAG 시스템 로드"""
+    """RAG 시스템 로드 (프로세스 공유 인스턴스를 세션에 연결)"""
     if st.session_state.rag_system is None:
         try:
-            with st.spinner("🔧 RAG 시스템을 자동으로 초기화하는 중... (시간이 걸릴 수 있습니다)"):
-                st.session_state.rag_system = RAGSystem(
-                    pinecone_api_key=Config.PINECONE_API_KEY,
-                    pinecone_index_name=Config.PINECONE_INDEX_NAME,
-                    openai_api_key=Config.OPENAI_API_KEY
-                )
+            # 공유 인스턴스는 바로 반환되고 무거운 구성 요소는 백그라운드에서 로딩
+            rag_system = get_shared_rag_system(
+                pinecone_api_key=Config.PINECONE_API_KEY,
+                pinecone_index_name=Config.PINECONE_INDEX_NAME,
+                openai_api_key=Config.OPENAI_API_KEY
+            )
+            wait_until_ready(rag_system)
+            # 세션에는 공유 인스턴스에 대한 참조만 저장
+            st.session_state.rag_system = rag_system
+            # 빠른 질문 답변은 프로세스당 한 번 미리 계산하고 백그라운드에서 갱신
+            if Config.QUICK_ANSWERS_ENABLED:
+                st.session_state.quick_answers = get_shared_quick_answers(rag_system)
             st.success("✅ RAG 시스템이 성공적으로 로드되었습니다!")
             return True
         except Exception as e:
@@ -238,7 +276,7 @@ def load_rag_system():
             # 설정 정보 표시
             with st.expander("📋 현재 설정", expanded=False):
                 st.json({
-                    "문서 경로": Config.FOLDER_PATH,
+                    "문서 경로": Config.DATABASE_PATH,
                     "Pinecone API 키": Config.PINECONE_API_KEY[:20] + "...",
                     "OpenAI API 키": Config.OPENAI_API_KEY[:20] + "...",
                     "인덱스 이름": Config.PINECONE_INDEX_NAME
@@ -259,7 +297,7 @@ def load_rag_system():
                 if st.button("📋 설정 확인"):
                     st.write("**현재 설정:**")
                     st.json({
-                        "문서 경로": Config.FOLDER_PATH,
+                        "문서 경로": Config.DATABASE_PATH,
                         "Pinecone API 키": Config.PINECONE_API_KEY[:20] + "...",
                         "OpenAI API 키": Config.OPENAI_API_KEY[:20] + "...",
                         "인덱스 이름": Config.PINECONE_INDEX_NAME
@@ -270,6 +308,13 @@ def load_rag_system():
 
 def main():
     """메인 애플리케이션"""
+    # 프로세스 최초 실행 시 공유 RAG 시스템 예열 시작 (이후 호출은 무시됨)
+    start_background_warmup(
+        pinecone_api_key=Config.PINECONE_API_KEY,
+        pinecone_index_name=Config.PINECONE_INDEX_NAME,
+        openai_api_key=Config.OPENAI_API_KEY
+    )
+    
     load_css()
     initialize_session_state()
     
@@ -0,0 +1,478 @@
+"""
+asyncio 기반 RAG 질의 엔진 (API 서버 등 비동기 호출자용)
+
+RAGSystem의 모델, 코퍼스/BM25, 캐시를 그대로 공유하고 네트워크 구간만 비동기로 바꿉니다.
+요청이 OpenAI/Pinecone 응답을 기다리는 동안 스레드를 붙잡지 않으므로 스레드 수와 무관하게
+수백 개의 요청을 동시에 처리할 수 있습니다.
+    OpenAI    공유 AsyncOpenAI 클라이언트 (연결 풀 재사용, 429는 Retry-After에 따라 재시도)
+    Pinecone  데이터 플레인 REST API(/query)를 연결 풀을 쓰는 httpx.AsyncClient로 호출
+              (로컬 벡터 저장소는 스레드 풀에서 실행)
+    임베딩, BM25, 컨텍스트 구성은 CPU 작업이므로 엔진의 스레드 풀에서 실행합니다.
+
+엔진 하나가 OpenAI/Pinecone 동시 요청 수를 제한하므로 프로세스(이벤트 루프)당 하나를 만들어
+모든 요청이 공유하세요.
+
+    async with AsyncRAGEngine(rag_system) as engine:
+        result = await engine.rag_query("유니베라의 미션은?")
+"""
+
+import time
+import asyncio
+import logging
+import functools
+from contextlib import aclosing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+import openai
+
+from config import Config
+from batch_query import with_backoff_async
+from metrics import REGISTRY, Trace, span
+from rag_system import ANSWER_ERROR_MESSAGE, RAGSystem
+from singleflight import AsyncSingleFlight
+
+logger = logging.getLogger(__name__)
+
+REGISTRY.describe("rag_limiter_wait_seconds", "비동기 엔진 동시 요청 제한 대기 시간 (초)")
+REGISTRY.describe("rag_limiter_active", "비동기 엔진 진행 중인 요청 수")
+REGISTRY.describe("rag_limiter_waiting", "비동기 엔진 제한 대기 중인 요청 수")
+
+PINECONE_API_VERSION = "2024-10"
+
+
+class ConcurrencyLimit:
+    """동시 요청 수 제한 (asyncio.Semaphore + 대기/진행 중 요청 수 집계)
+
+        async with limit:
+            response = await client.post(...)
+    """
+
+    def __init__(self, name: str, limit: int):
+        self.name = name
+        self.limit = limit
+        self.active = 0
+        self.waiting = 0
+        self.peak = 0
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __aenter__(self) -> "ConcurrencyLimit":
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        REGISTRY.observe("rag_limiter_wait_seconds", time.perf_counter() - start, service=self.name)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.active -= 1
+        self._semaphore.release()
+
+    def stats(self) -> Dict[str, int]:
+        return {"limit": self.limit, "active": self.active, "waiting": self.waiting, "peak": self.peak}
+
+
+class AsyncRAGEngine:
+    """RAGSystem의 인덱스/캐시를 공유하는 asyncio 질의 엔진"""
+
+    def __init__(self, rag_system: RAGSystem, openai_api_key: Optional[str] = None,
+                 openai_base_url: Optional[str] = None, pinecone_host: Optional[str] = None,
+                 pinecone_api_key: Optional[str] = None,
+                 llm_concurrency: int = Config.ASYNC_LLM_CONCURRENCY,
+                 vector_concurrency: int = Config.ASYNC_VECTOR_CONCURRENCY,
+                 max_retries: int = Config.BATCH_MAX_RETRIES):
+        """
+        Args:
+            rag_system: 모델/코퍼스/캐시를 공유할 RAGSystem
+            openai_api_key: OpenAI API 키 (없으면 Config.OPENAI_API_KEY)
+            openai_base_url: OpenAI 호환 엔드포인트 (없으면 Config.OPENAI_BASE_URL)
+            pinecone_host: Pinecone 데이터 플레인 주소 (없으면 Config.PINECONE_INDEX_HOST,
+                그것도 없으면 Pinecone 저장소는 describe_index로 조회하고 로컬 저장소는 직접 검색)
+            pinecone_api_key: Pinecone API 키 (없으면 Config.PINECONE_API_KEY)
+            llm_concurrency: OpenAI 동시 요청 상한
+            vector_concurrency: Pinecone 동시 질의 상한
+            max_retries: 429/5xx/시간 초과 시 최대 재시도 횟수
+        """
+        self.rag = rag_system
+        self.max_retries = max_retries
+        limits = httpx.Limits(max_connections=Config.HTTP_MAX_CONNECTIONS,
+                              max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE)
+        timeout = httpx.Timeout(Config.HTTP_TIMEOUT, connect=5.0)
+
+        self.openai_client = openai.AsyncOpenAI(
+            api_key=openai_api_key or Config.OPENAI_API_KEY,
+            base_url=openai_base_url or Config.OPENAI_BASE_URL,
+            max_retries=max_retries,
+            timeout=timeout,
+            http_client=openai.DefaultAsyncHttpxClient(limits=limits, timeout=timeout)
+        )
+        self._http = httpx.AsyncClient(limits=limits, timeout=timeout)
+        self._pinecone_host = pinecone_host or Config.PINECONE_INDEX_HOST
+        self._pinecone_api_key = pinecone_api_key or Config.PINECONE_API_KEY
+
+        self.llm_limit = ConcurrencyLimit("openai", llm_concurrency)
+        self.vector_limit = ConcurrencyLimit("vector", vector_concurrency)
+        # CPU 작업(임베딩, BM25, 컨텍스트 구성)용 스레드 풀
+        self._executor = ThreadPoolExecutor(max_workers=Config.RETRIEVAL_WORKERS,
+                                            thread_name_prefix="rag-async")
+        self.inflight = AsyncSingleFlight("async_rag_query")
+        self._corpus_ready = False
+        self._host_resolved = False
+        REGISTRY.add_collector(self._limit_gauges)
+
+    async def __aenter__(self) -> "AsyncRAGEngine":
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """연결 풀과 스레드 풀 정리, 지표 수집 등록 해제"""
+        REGISTRY.remove_collector(self._limit_gauges)
+        await self.openai_client.close()
+        await self._http.aclose()
+        self._executor.shutdown(wait=False)
+
+    def _limit_gauges(self) -> List[tuple]:
+        gauges = []
+        for limit in (self.llm_limit, self.vector_limit):
+            gauges.append(("rag_limiter_active", {"service": limit.name}, limit.active))
+            gauges.append(("rag_limiter_waiting", {"service": limit.name}, limit.waiting))
+        return gauges
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """동시 요청 제한 상태"""
+        return {"openai": self.llm_limit.stats(), "vector": self.vector_limit.stats()}
+
+    async def _run(self, fn, *args, **kwargs) -> Any:
+        """CPU 작업을 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(fn, *args, **kwargs))
+
+    async def _require_corpus(self):
+        if not self._corpus_ready:
+            await self._run(self.rag._require_corpus)
+            self._corpus_ready = True
+
+    async def wait_ready(self):
+        """모델/코퍼스/BM25 준비와 예열이 끝날 때까지 대기"""
+        await self._run(self.rag.warmup)
+
+    # === 검색 ===
+    async def _vector_host(self) -> Optional[str]:
+        """REST로 질의할 Pinecone 주소 (로컬 벡터 저장소면 None)"""
+        if self._pinecone_host is None and not self._host_resolved:
+            store = await self._run(lambda: self.rag.vector_store)
+            if getattr(store, "backend", None) == "pinecone":
+                self._pinecone_host = await self._run(lambda: store.host)
+                self._pinecone_api_key = store.api_key
+            self._host_resolved = True
+        return self._pinecone_host
+
+    async def _query_pinecone(self, host: str, vector: List[float], top_k: int) -> Dict[str, Any]:
+        async with self.vector_limit:
+            response = await self._http.post(
+                f"{host.rstrip('/')}/query",
+                json={"vector": vector, "topK": top_k, "includeMetadata": True, "includeValues": False},
+                headers={"Api-Key": self._pinecone_api_key or "",
+                         "X-Pinecone-API-Version": PINECONE_API_VERSION}
+            )
+            response.raise_for_status()
+            return response.json()
+
+    async def _query_vectors(self, vector: List[float], top_k: int) -> Dict[str, Any]:
+        host = await self._vector_host()
+        if host is None:
+            async with self.vector_limit:
+                return await self._run(self.rag.vector_store.query, vector=vector, top_k=top_k,
+                                       include_metadata=True)
+        return await with_backoff_async(lambda: self._query_pinecone(host, vector, top_k),
+                                        max_retries=self.max_retries)
+
+    async def vector_search(self, query: str, top_k: int = 15,
+                            trace: Optional[Trace] = None, raise_errors: bool = False) -> Dict[str, float]:
+        """벡터 검색 (RAGSystem.vector_search와 같은 결과)"""
+        try:
+            with span(trace, 'embedding'):
+                query_vec = await self._run(self.rag.embed, query, is_query=True)
+            with span(trace, 'vector_query'):
+                results = await self._query_vectors(query_vec.tolist(), top_k)
+            return RAGSystem.match_scores(results)
+        except Exception as e:
+            if raise_errors:
+                raise
+            logger.error(f"벡터 검색 오류: {e}")
+            return {}
+
+    async def bm25_search(self, query: str, top_k: int = 10, trace: Optional[Trace] = None,
+                          corpus=None) -> Dict[str, float]:
+        """BM25 검색 (스레드 풀에서 실행, corpus는 RAGSystem.bm25_search와 같음)"""
+        return await self._run(self.rag.bm25_search, query, top_k=top_k, trace=trace, corpus=corpus)
+
+    async def _with_timeout(self, name: str, coro, timeout: float,
+                            timings: Dict[str, float]) -> Dict[str, float]:
+        start = time.perf_counter()
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"{name} 검색 시간 초과 ({timeout}초): 다른 검색 결과로 진행합니다.")
+            timings[f'{name}_timeout'] = timeout
+            REGISTRY.inc("rag_timeouts_total", retriever=name)
+            return {}
+        except Exception as e:
+            logger.error(f"{name} 검색 오류: {e}")
+            timings[f'{name}_error'] = time.perf_counter() - start
+            return {}
+        finally:
+            timings[f'{name}_search'] = time.perf_counter() - start
+
+    async def hybrid_search(self, query: str, vector_top_k: int = 15,
+                            bm25_top_k: int = 10, vector_weight: float = 0.6,
+                            bm25_weight: float = 0.4, final_top_k: int = 5,
+                            timings: Optional[Dict[str, float]] = None,
+                            trace: Optional[Trace] = None,
+                            fusion: Optional[str] = None) -> List[Dict[str, Any]]:
+        """하이브리드 검색 (벡터/BM25 동시 실행, 인자와 결과는 RAGSystem.hybrid_search와 같음)"""
+        if timings is None:
+            timings = {}
+        if trace is None:
+            trace = Trace()
+        await self._require_corpus()
+        # BM25 결과와 집계가 같은 코퍼스를 보도록 질의마다 한 번만 읽음
+        corpus = self.rag._corpus_view()
+        search_start = time.perf_counter()
+
+        vector_results, bm25_results = await asyncio.gather(
+            self._with_timeout('vector', self.vector_search(query, vector_top_k, trace, raise_errors=True),
+                               Config.VECTOR_SEARCH_TIMEOUT, timings),
+            self._with_timeout('bm25', self.bm25_search(query, bm25_top_k, trace, corpus=corpus),
+                               Config.BM25_SEARCH_TIMEOUT, timings)
+        )
+        timings['retrieval'] = time.perf_counter() - search_start
+        fusion_start = time.perf_counter()
+        results = self.rag.fuse_results(vector_results, bm25_results, vector_weight, bm25_weight,
+                                        final_top_k, fusion=fusion, store=corpus[0])
+        timings['fusion'] = time.perf_counter() - fusion_start
+        trace.record('retrieval', search_start, timings['retrieval'])
+        trace.record('fusion', fusion_start, timings['fusion'])
+        return results
+
+    # === 답변 생성 ===
+    async def generate_answer(self, query: str, search_results: List[Dict[str, Any]],
+                              model: str = "gpt-4o-mini", max_tokens: int = 1000,
+                              usage: Optional[Dict[str, int]] = None,
+                              context_stats: Optional[Dict[str, Any]] = None,
+                              trace: Optional[Trace] = None) -> str:
+        """GPT 답변 생성 (오류 시 안내 문구 반환)"""
+        try:
+            with span(trace, 'context'):
+                messages = await self._run(self.rag.build_messages, query, search_results,
+                                           context_stats=context_stats)
+            async with self.llm_limit:
+                with span(trace, 'llm'):
+                    response = await self.openai_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.1,
+                        top_p=0.9
+                    )
+            token_usage = RAGSystem._usage_dict(response.usage)
+            if token_usage:
+                RAGSystem._record_tokens(token_usage)
+                if usage is not None:
+                    usage.update(token_usage)
+            return response.choices[0].message.content
+        except Exception as e:
+            logger.error(f"GPT 답변 생성 오류: {e}")
+            return ANSWER_ERROR_MESSAGE
+
+    async def generate_answer_stream(self, query: str, search_results: List[Dict[str, Any]],
+                                     model: str = "gpt-4o-mini", max_tokens: int = 1000,
+                                     stats: Optional[Dict[str, Any]] = None,
+                                     trace: Optional[Trace] = None) -> AsyncIterator[str]:
+        """GPT 답변 스트리밍 (stats는 RAGSystem.generate_answer_stream과 같음)"""
+        if stats is None:
+            stats = {}
+        stats['error'] = False
+        stats['context'] = {}
+        start = time.perf_counter()
+        received = False
+        stream = None
+        try:
+            with span(trace, 'context'):
+                messages = await self._run(self.rag.build_messages, query, search_results,
+                                           context_stats=stats['context'])
+            # 스트림이 끝날 때까지 연결을 쓰므로 제한도 끝까지 유지 (클라이언트가 끊겨 생성기가
+            # 닫히면 finally에서 업스트림 스트림을 닫고 제한 자리를 바로 반환)
+            async with self.llm_limit:
+                try:
+                    llm_start = time.perf_counter()
+                    stream = await self.openai_client.chat.completions.create(
+                        model=model,
+                        messages=messages,
+                        max_tokens=max_tokens,
+                        temperature=0.1,
+                        top_p=0.9,
+                        stream=True,
+                        stream_options={"include_usage": True}
+                    )
+                    async for chunk in stream:
+                        if chunk.usage is not None:
+                            stats['usage'] = RAGSystem._usage_dict(chunk.usage)
+                        if not chunk.choices:
+                            continue
+                        delta = chunk.choices[0].delta.content
+                        if delta:
+                            if not received:
+                                received = True
+                                stats['ttft'] = time.perf_counter() - start
+                                if trace is not None:
+                                    trace.record('llm_first_token', llm_start, time.perf_counter() - llm_start)
+                            yield delta
+                    if trace is not None:
+                        trace.record('llm', llm_start, time.perf_counter() - llm_start)
+                finally:
+                    if stream is not None:
+                        try:
+                            await stream.close()
+                        except Exception as e:
+                            logger.warning(f"GPT 스트림 닫기 실패: {e}")
+            if stats.get('usage'):
+                RAGSystem._record_tokens(stats['usage'])
+        except Exception as e:
+            logger.error(f"GPT 답변 스트리밍 오류: {e}")
+            REGISTRY.inc("rag_errors_total", stage='llm', type=type(e).__name__)
+            stats['error'] = True
+            if not received:
+                yield ANSWER_ERROR_MESSAGE
+
+    # === 전체 파이프라인 ===
+    async def _cached(self, query: str, vector_weight: float, bm25_weight: float, final_top_k: int,
+                      model: str, fusion: str, use_cache: bool, trace: Trace):
+        """답변 캐시 키/의미 캐시 범위와 캐시된 결과 (없거나 use_cache=False면 None)"""
+        # 키에 코퍼스 버전이 들어가므로 코퍼스가 준비된 뒤 계산
+        await self._require_corpus()
+        keys = self.rag._answer_cache_keys(query, vector_weight, bm25_weight, final_top_k, model, fusion)
+        if not use_cache:
+            return keys, None
+        # 의미 캐시 조회에 질의 임베딩이 필요할 수 있으므로 스레드 풀에서 실행
+        return keys, await self._run(self.rag._lookup_answer, query, keys, trace)
+
+    async def rag_query(self, query: str, vector_weight: float = 0.6,
+                        bm25_weight: float = 0.4, final_top_k: int = 5,
+                        model: str = "gpt-4o-mini", use_cache: bool = True,
+                        fusion: Optional[str] = None) -> Dict[str, Any]:
+        """전체 RAG 파이프라인 (결과 형식은 RAGSystem.rag_query와 같음)"""
+        trace = Trace()
+        start = trace.start
+        timings = {}
+        REGISTRY.inc("rag_requests_total", mode="async")
+        fusion = fusion or Config.FUSION_METHOD
+
+        keys, cached = await self._cached(query, vector_weight, bm25_weight, final_top_k,
+                                               model, fusion, use_cache, trace)
+        if cached is not None:
+            timings['total'] = RAGSystem._finish_trace(trace, start)
+            return {**cached, 'query': query, 'cached': True, 'timings': timings, 'trace': trace.to_dict()}
+
+        # 처리 중인 동일 질의가 있으면 그 결과를 함께 받음 (계산은 별도 태스크라 먼저 온 요청이 끊겨도 계속됨)
+        async def compute() -> Dict[str, Any]:
+            search_results = await self.hybrid_search(
+                query, vector_weight=vector_weight, bm25_weight=bm25_weight, final_top_k=final_top_k,
+                timings=timings, trace=trace, fusion=fusion
+            )
+            usage = {}
+            context_stats = {}
+            generation_start = time.perf_counter()
+            answer = await self.generate_answer(query, search_results, model=model, usage=usage,
+                                                context_stats=context_stats, trace=trace)
+            timings['generation'] = time.perf_counter() - generation_start
+            timings['total'] = RAGSystem._finish_trace(trace, start)
+
+            result = {
+                'query': query,
+                'search_results': search_results,
+                'answer': answer,
+                'usage': usage or None,
+                'context': context_stats or None,
+                'timestamp': datetime.now().isoformat(),
+                'cached': False,
+                'timings': timings,
+                'trace': trace.to_dict()
+            }
+            if use_cache and answer != ANSWER_ERROR_MESSAGE and not RAGSystem._retrieval_degraded(timings):
+                await self._run(self.rag._store_answer, query, keys, result)
+            return result
+
+        if not Config.SINGLE_FLIGHT:
+            return await compute()
+        result, shared = await self.inflight.do(keys[0], compute)
+        if shared:
+            logger.info("처리 중인 동일 질의 결과 공유")
+            return RAGSystem._coalesced_result(result, query, trace, start)
+        return result
+
+    async def rag_query_stream(self, query: str, vector_weight: float = 0.6,
+                               bm25_weight: float = 0.4, final_top_k: int = 5,
+                               model: str = "gpt-4o-mini", use_cache: bool = True,
+                               fusion: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """스트리밍 RAG 파이프라인 (이벤트 형식은 RAGSystem.rag_query_stream과 같음)"""
+        trace = Trace()
+        start = trace.start
+        timings = {}
+        REGISTRY.inc("rag_requests_total", mode="async_stream")
+        fusion = fusion or Config.FUSION_METHOD
+
+        keys, cached = await self._cached(query, vector_weight, bm25_weight, final_top_k,
+                                               model, fusion, use_cache, trace)
+        if cached is not None:
+            yield {'type': 'search_results', 'search_results': cached['search_results']}
+            timings['ttft'] = time.perf_counter() - start
+            yield {'type': 'delta', 'content': cached['answer']}
+            timings['total'] = RAGSystem._finish_trace(trace, start)
+            yield {'type': 'done', 'result': {**cached, 'query': query, 'cached': True,
+                                              'timings': timings, 'trace': trace.to_dict()}}
+            return
+
+        search_results = await self.hybrid_search(
+            query, vector_weight=vector_weight, bm25_weight=bm25_weight, final_top_k=final_top_k,
+            timings=timings, trace=trace, fusion=fusion
+        )
+        yield {'type': 'search_results', 'search_results': search_results}
+
+        stats = {}
+        parts = []
+        generation_start = time.perf_counter()
+        # 이 생성기가 중간에 닫혀도 답변 스트림(OpenAI 연결, 동시 요청 제한 자리)을 바로 닫음
+        async with aclosing(self.generate_answer_stream(query, search_results, model=model,
+                                                        stats=stats, trace=trace)) as deltas:
+            async for delta in deltas:
+                if not parts:
+                    timings['ttft'] = time.perf_counter() - start
+                    trace.record('ttft', start, timings['ttft'])
+                parts.append(delta)
+                yield {'type': 'delta', 'content': delta}
+        timings['generation'] = time.perf_counter() - generation_start
+        timings['total'] = RAGSystem._finish_trace(trace, start)
+
+        result = {
+            'query': query,
+            'search_results': search_results,
+            'answer': "".join(parts),
+            'usage': stats.get('usage'),
+            'context': stats.get('context') or None,
+            'timestamp': datetime.now().isoformat(),
+            'cached': False,
+            'timings': timings,
+            'trace': trace.to_dict()
+        }
+        if use_cache and not stats['error'] and not RAGSystem._retrieval_degraded(timings):
+            await self._run(self.rag._store_answer, query, keys, result)
+        yield {'type': 'done', 'result': result}
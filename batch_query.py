@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+오프라인 대량 질의응답 (평가, FAQ 사전 생성용)
+
+    python batch_query.py questions.txt -o answers.jsonl --concurrency 8
+
+입력은 한 줄에 질문 하나인 텍스트 파일 또는 "query" 필드를 가진 JSONL입니다.
+"""
+
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# 재시도 대상 HTTP 상태 코드 (요청 한도 초과 및 일시적 서버 오류)
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """OpenAI/Pinecone 예외에서 HTTP 상태 코드 추출"""
+    for attr in ("status_code", "status"):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """응답의 Retry-After 헤더 (초)"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or getattr(error, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def is_retryable(error: Exception) -> bool:
+    """요청 한도 초과, 일시적 서버 오류, 연결/시간 초과 여부"""
+    status = _status_code(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+    name = type(error).__name__
+    return isinstance(error, (TimeoutError, ConnectionError)) or "Timeout" in name or "Connection" in name
+
+
+def with_backoff(fn: Callable[[], Any], max_retries: int = 5, base_delay: float = 0.5,
+                 max_delay: float = 30.0, stats: Optional[Dict[str, int]] = None) -> Any:
+    """
+    재시도 가능한 오류에 대해 지수 백오프(full jitter)로 재시도
+
+    Retry-After 헤더가 있으면 그 값을 우선 사용합니다.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if stats is not None:
+                stats["retries"] = stats.get("retries", 0) + 1
+                if _status_code(e) == 429:
+                    stats["rate_limited"] = stats.get("rate_limited", 0) + 1
+            logger.warning(f"재시도 {attempt + 1}/{max_retries} ({delay:.2f}초 후): {e}")
+            time.sleep(delay)
+
+
+async def with_backoff_async(fn: Callable[[], Awaitable[Any]], max_retries: int = 5,
+                             base_delay: float = 0.5, max_delay: float = 30.0,
+                             stats: Optional[Dict[str, int]] = None) -> Any:
+    """with_backoff의 asyncio 버전 (대기 중에도 이벤트 루프를 막지 않음)"""
+    for attempt in range(max_retries + 1):
+        try:
+            return await fn()
+        except Exception as e:
+            if attempt >= max_retries or not is_retryable(e):
+                raise
+            delay = _retry_after(e)
+            if delay is None:
+                delay = random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+            if stats is not None:
+                stats["retries"] = stats.get("retries", 0) + 1
+                if _status_code(e) == 429:
+                    stats["rate_limited"] = stats.get("rate_limited", 0) + 1
+            logger.warning(f"재시도 {attempt + 1}/{max_retries} ({delay:.2f}초 후): {e}")
+            await asyncio.sleep(delay)
+
+
+def rag_query_batch(rag_system, queries: List[str], output_path: Optional[str] = None,
+                    vector_weight: float = 0.6, bm25_weight: float = 0.4,
+                    vector_top_k: int = 15, bm25_top_k: int = 10, final_top_k: int = 5,
+                    model: str = "gpt-4o-mini", concurrency: int = Config.BATCH_CONCURRENCY,
+                    max_retries: int = Config.BATCH_MAX_RETRIES,
+                    embed_batch_size: int = Config.BATCH_EMBED_SIZE, fusion: Optional[str] = None,
+                    on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    여러 질문에 대한 RAG 답변을 일괄 생성
+
+    1) 모든 질의를 한 번의 encode 호출로 임베딩하고, 2) BM25는 질의 × 문서 행렬로
+    한 번에 점수화한 뒤, 3) Pinecone 검색과 GPT 생성은 최대 concurrency개씩 병렬로
+    실행합니다. 완료되는 순서대로 결과를 JSONL에 기록합니다.
+
+    Args:
+        rag_system: RAGSystem 인스턴스
+        queries: 질문 목록
+        output_path: 결과 JSONL 경로 (None이면 파일에 쓰지 않음)
+        concurrency: Pinecone/OpenAI 동시 요청 수
+        max_retries: 요청별 최대 재시도 횟수 (OpenAI SDK 자체 재시도는 끄고 with_backoff만 재시도)
+        embed_batch_size: 임베딩 배치 크기
+        fusion: 검색 결과 결합 방식 (없으면 Config.FUSION_METHOD)
+        on_result: 결과마다 호출되는 콜백
+
+    Returns:
+        처리 통계 (성공/실패 수, 재시도 수, 소요 시간, 초당 질문 수)
+    """
+    start = time.perf_counter()
+    stats: Dict[str, Any] = {"questions": len(queries), "succeeded": 0, "failed": 0,
+                             "retries": 0, "rate_limited": 0}
+    stats_lock = threading.Lock()
+    # SDK 재시도와 겹치면 요청당 시도 횟수가 곱해지므로 재시도는 with_backoff에서만
+    client = rag_system.openai_client.with_options(max_retries=0)
+
+    # 1. 배치 임베딩 + 2. BM25 행렬 점수화
+    embed_start = time.perf_counter()
+    vectors = rag_system.embed_batch(queries, is_query=True, batch_size=embed_batch_size)
+    stats["embedding_s"] = time.perf_counter() - embed_start
+    bm25_start = time.perf_counter()
+    bm25_batch = rag_system.bm25_search_batch(queries, top_k=bm25_top_k)
+    stats["bm25_s"] = time.perf_counter() - bm25_start
+
+    def answer(i: int) -> Dict[str, Any]:
+        query = queries[i]
+        retry_stats: Dict[str, int] = {}
+        query_start = time.perf_counter()
+        try:
+            vector_results = with_backoff(
+                lambda: rag_system.vector_search(query, top_k=vector_top_k,
+                                                 query_vector=vectors[i], raise_errors=True),
+                max_retries=max_retries, stats=retry_stats
+            )
+            search_results = rag_system.fuse_results(
+                vector_results, bm25_batch[i], vector_weight, bm25_weight, final_top_k, fusion=fusion
+            )
+            usage: Dict[str, int] = {}
+            context_stats: Dict[str, Any] = {}
+            answer_text = with_backoff(
+                lambda: rag_system.generate_answer(query, search_results, model=model, usage=usage,
+                                                   raise_errors=True, context_stats=context_stats,
+                                                   client=client),
+                max_retries=max_retries, stats=retry_stats
+            )
+            result = {
+                "index": i,
+                "query": query,
+                "answer": answer_text,
+                "sources": [r["filename"] for r in search_results],
+                "scores": [r["hybrid_score"] for r in search_results],
+                "usage": usage or None,
+                "context": context_stats or None,
+                "latency_s": time.perf_counter() - query_start,
+                "timestamp": datetime.now().isoformat()
+            }
+        except Exception as e:
+            logger.error(f"질문 {i} 처리 실패: {e}")
+            result = {"index": i, "query": query, "error": str(e),
+                      "latency_s": time.perf_counter() - query_start,
+                      "timestamp": datetime.now().isoformat()}
+        with stats_lock:
+            stats["retries"] += retry_stats.get("retries", 0)
+            stats["rate_limited"] += retry_stats.get("rate_limited", 0)
+        return result
+
+    # 3. 제한된 동시성으로 검색/생성, 완료 순서대로 기록
+    output = open(output_path, "w", encoding="utf-8") if output_path else None
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch") as pool:
+            futures = [pool.submit(answer, i) for i in range(len(queries))]
+            for done, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                stats["failed" if "error" in result else "succeeded"] += 1
+                if output:
+                    output.write(json.dumps(result, ensure_ascii=False) + "\n")
+                    output.flush()
+                if on_result:
+                    on_result(result)
+                if done % 50 == 0 or done == len(queries):
+                    elapsed = time.perf_counter() - start
+                    logger.info(f"일괄 처리 {done}/{len(queries)} - {done / elapsed:.2f}개/초")
+    finally:
+        if output:
+            output.close()
+
+    stats["elapsed_s"] = time.perf_counter() - start
+    stats["questions_per_sec"] = len(queries) / stats["elapsed_s"] if stats["elapsed_s"] > 0 else 0.0
+    return stats
+
+
+def read_questions(path: str) -> List[str]:
+    """텍스트(한 줄에 하나) 또는 JSONL("query" 필드) 질문 파일 읽기"""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                questions.append(json.loads(line)["query"])
+            else:
+                questions.append(line)
+    return questions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG 대량 질의응답")
+    parser.add_argument("questions", help="질문 파일 (.txt 또는 .jsonl)")
+    parser.add_argument("-o", "--output", default="answers.jsonl", help="결과 JSONL 경로")
+    parser.add_argument("--concurrency", type=int, default=Config.BATCH_CONCURRENCY)
+    parser.add_argument("--max-retries", type=int, default=Config.BATCH_MAX_RETRIES)
+    parser.add_argument("--embed-batch-size", type=int, default=Config.BATCH_EMBED_SIZE)
+    parser.add_argument("--vector-weight", type=float, default=Config.VECTOR_WEIGHT)
+    parser.add_argument("--final-top-k", type=int, default=Config.FINAL_TOP_K)
+    parser.add_argument("--fusion", default=Config.FUSION_METHOD, help="검색 결과 결합 방식")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+    from rag_system import RAGSystem
+
+    rag = RAGSystem(
+        pinecone_api_key=Config.PINECONE_API_KEY,
+        pinecone_index_name=Config.PINECONE_INDEX_NAME,
+        openai_api_key=Config.OPENAI_API_KEY
+    )
+    questions = read_questions(args.questions)
+    stats = rag_query_batch(
+        rag, questions, output_path=args.output,
+        vector_weight=args.vector_weight, bm25_weight=1.0 - args.vector_weight,
+        vector_top_k=Config.VECTOR_TOP_K, bm25_top_k=Config.BM25_TOP_K,
+        final_top_k=args.final_top_k, model=Config.GPT_MODEL,
+        concurrency=args.concurrency, max_retries=args.max_retries,
+        embed_batch_size=args.embed_batch_size, fusion=args.fusion
+    )
+    print(f"✅ {stats['succeeded']}/{stats['questions']}개 완료 (실패 {stats['failed']}, "
+          f"재시도 {stats['retries']}) - {stats['elapsed_s']:.1f}초, "
+          f"{stats['questions_per_sec']:.2f}개/초 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
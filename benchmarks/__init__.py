@@ -0,0 +1,3 @@
+"""
+성능 벤치마크 스크립트 모음 (저장소 루트에서 `python -m benchmarks.<이름>`으로 실행)
+"""
@@ -0,0 +1,175 @@
+"""
+동시 요청 벤치마크: 스레드 기반 RAGSystem.rag_query vs asyncio AsyncRAGEngine.rag_query
+
+OpenAI와 Pinecone 대신 로컬 대역 서버(FakeOpenAIServer, FakePineconeServer)를 띄우고
+응답 지연을 주어, 동시 요청 50~200개에서 처리량, 지연 시간(p50/p95/p99), 사용 스레드 수,
+새로 맺은 Pinecone 연결 수, OpenAI 동시 요청 최대치(제한 준수 여부)를 비교합니다.
+스레드 방식은 Streamlit처럼 동시 요청마다 스레드 하나를 쓰고, 벡터 검색도 같은 대역 서버에
+동기 HTTP(연결 풀 사용)로 질의합니다.
+
+    python -m benchmarks.async_bench --concurrency 50 100 200 --requests 400
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from fakes import FakeOpenAIServer, FakePineconeServer, build_fake_rag_system
+from rag_system import ANSWER_ERROR_MESSAGE
+from benchmarks.common import latency_summary, make_labeled_corpus, save_json
+
+
+class RestIndex:
+    """대역 Pinecone 서버에 동기 HTTP로 질의하는 인덱스 (Pinecone SDK의 동기 Index 대응)"""
+
+    def __init__(self, base_url, max_connections):
+        import httpx
+
+        self.base_url = base_url
+        self.client = httpx.Client(limits=httpx.Limits(max_connections=max_connections,
+                                                       max_keepalive_connections=max_connections))
+
+    def query(self, vector, top_k=10, include_metadata=False, **kwargs):
+        response = self.client.post(f"{self.base_url}/query", json={
+            "vector": vector, "topK": top_k, "includeMetadata": include_metadata})
+        response.raise_for_status()
+        return response.json()
+
+
+class ThreadSampler:
+    """측정 중 최대 클라이언트 스레드 수 기록"""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.peak = self.count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @staticmethod
+    def count() -> int:
+        """클라이언트 측 스레드 수 (같은 프로세스에서 도는 대역 서버의 요청 처리 스레드 제외)"""
+        return sum(1 for thread in threading.enumerate() if "process_request" not in thread.name)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, self.count())
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def summarize(label, concurrency, samples, errors, elapsed, peak_threads, **extra):
+    row = {"mode": label, "concurrency": concurrency, "requests": len(samples), "errors": errors,
+           "elapsed_s": elapsed, "qps": len(samples) / elapsed, "peak_threads": peak_threads,
+           **latency_summary(samples), **extra}
+    print(f"{label:>6} | 동시 {concurrency:>3} | {row['qps']:6.1f} q/s | p50 {row['p50_ms']:7.1f}ms "
+          f"p95 {row['p95_ms']:7.1f}ms p99 {row['p99_ms']:7.1f}ms | 오류 {errors} | "
+          f"스레드 {peak_threads}" + "".join(f" | {key} {value}" for key, value in extra.items()))
+    return row
+
+
+def run_threads(system, queries, concurrency):
+    def one(query):
+        start = time.perf_counter()
+        result = system.rag_query(query, use_cache=False)
+        return time.perf_counter() - start, result["answer"] == ANSWER_ERROR_MESSAGE
+
+    start = time.perf_counter()
+    with ThreadSampler() as sampler, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        outcomes = list(pool.map(one, queries))
+    elapsed = time.perf_counter() - start
+    return summarize("thread", concurrency, [latency for latency, _ in outcomes],
+                     sum(failed for _, failed in outcomes), elapsed, sampler.peak)
+
+
+async def run_async(engine, queries, concurrency, pinecone):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with gate:
+            start = time.perf_counter()
+            result = await engine.rag_query(query, use_cache=False)
+            return time.perf_counter() - start, result["answer"] == ANSWER_ERROR_MESSAGE
+
+    engine.llm_limit.peak = 0
+    connections = pinecone.connections
+    start = time.perf_counter()
+    with ThreadSampler() as sampler:
+        outcomes = await asyncio.gather(*(one(query) for query in queries))
+    elapsed = time.perf_counter() - start
+    return summarize("async", concurrency, [latency for latency, _ in outcomes],
+                     sum(failed for _, failed in outcomes), elapsed, sampler.peak,
+                     openai_peak=engine.llm_limit.peak,
+                     pinecone_connections=pinecone.connections - connections)
+
+
+def run(args):
+    from async_engine import AsyncRAGEngine
+
+    documents, labeled = make_labeled_corpus(args.documents, n_queries=args.requests, seed=args.seed)
+    queries = [item["query"] for item in labeled]
+    report = {"documents": args.documents, "requests": len(queries), "llm_latency_s": args.llm_latency,
+              "vector_latency_s": args.vector_latency, "llm_concurrency": args.llm_concurrency,
+              "results": []}
+
+    with FakeOpenAIServer(first_token_delay=args.llm_latency, token_delay=0.0) as openai_server:
+        system = build_fake_rag_system(documents, openai_base_url=openai_server.base_url)
+        system.warmup()
+        index = system.vector_store
+        index.query_delay = args.vector_latency
+
+        with FakePineconeServer(index) as pinecone:
+            if not args.skip_threads:
+                system.vector_store = RestIndex(pinecone.base_url, max(args.concurrency))
+                for concurrency in args.concurrency:
+                    report["results"].append(run_threads(system, queries, concurrency))
+
+            async def run_all():
+                engine = AsyncRAGEngine(system, openai_api_key="fake", openai_base_url=openai_server.base_url,
+                                        pinecone_host=pinecone.base_url, pinecone_api_key="fake",
+                                        llm_concurrency=args.llm_concurrency or max(args.concurrency))
+                async with engine:
+                    await engine.wait_ready()
+                    for concurrency in args.concurrency:
+                        report["results"].append(await run_async(engine, queries, concurrency, pinecone))
+
+            asyncio.run(run_all())
+        report["openai_requests"] = openai_server.requests
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스레드 vs asyncio 동시 요청 벤치마크 (로컬 대역 서버)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--requests", type=int, default=400, help="동시성 단계별 요청 수")
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="대역 OpenAI 응답 지연 (초)")
+    parser.add_argument("--vector-latency", type=float, default=0.03, help="대역 Pinecone 질의 지연 (초)")
+    parser.add_argument("--llm-concurrency", type=int, default=0,
+                        help="비동기 엔진 OpenAI 동시 요청 상한 (0: 최대 동시성, 제한 효과를 볼 때 "
+                             f"Config.ASYNC_LLM_CONCURRENCY={Config.ASYNC_LLM_CONCURRENCY} 등 지정)")
+    parser.add_argument("--skip-threads", action="store_true", help="스레드 방식 측정 생략")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format=Config.LOG_FORMAT)
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run(args)
+    if args.output:
+        save_json(args.output, report)
+    sys.exit(1 if any(row["errors"] for row in report["results"]) else 0)
+
+
+if __name__ == "__main__":
+    main()
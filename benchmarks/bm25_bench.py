@@ -0,0 +1,86 @@
+"""
+BM25 벤치마크: rank_bm25.BM25Okapi(기존 경로) vs BM25Index(CSR 역색인)
+
+    python -m benchmarks.bm25_bench --sizes 1000 10000 100000
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from bm25_index import BM25Index
+from benchmarks.common import latency_summary, make_corpus, make_queries, save_json, time_calls
+
+
+def legacy_top_k(bm25, query, top_k):
+    """기존 RAGSystem.bm25_search의 점수 계산 + 전체 정렬 경로"""
+    scores = bm25.get_scores(query)
+    doc_scores = [(i, score) for i, score in enumerate(scores)]
+    doc_scores.sort(key=lambda x: x[1], reverse=True)
+    return [(i, score) for i, score in doc_scores[:top_k] if score > 0]
+
+
+def run(sizes, n_queries, top_k, reference_limit):
+    try:
+        from rank_bm25 import BM25Okapi
+    except ImportError:
+        BM25Okapi = None
+
+    report = {"top_k": top_k, "queries": n_queries, "results": []}
+    for size in sizes:
+        corpus = make_corpus(size)
+        queries = make_queries(corpus, n_queries)
+        row = {"documents": size}
+
+        start = time.perf_counter()
+        index = BM25Index(corpus)
+        row["index_build_s"] = time.perf_counter() - start
+        row["index_memory_mb"] = index.memory_bytes() / 1e6
+        row["index"] = latency_summary(time_calls(lambda q: index.top_k(q, top_k), queries))
+
+        if BM25Okapi is not None and size <= reference_limit:
+            start = time.perf_counter()
+            reference = BM25Okapi(corpus)
+            row["okapi_build_s"] = time.perf_counter() - start
+            row["okapi"] = latency_summary(time_calls(lambda q: legacy_top_k(reference, q, top_k), queries))
+
+            # 점수 일치 검증
+            max_diff = 0.0
+            for query in queries:
+                expected = reference.get_scores(query)
+                actual = index.get_scores(query)
+                tolerance = 1e-4 * max(1.0, float(np.abs(expected).max()))
+                diff = float(np.abs(expected - actual).max())
+                max_diff = max(max_diff, diff)
+                if diff > tolerance:
+                    raise AssertionError(f"BM25 점수 불일치 (documents={size}, diff={diff})")
+            row["max_abs_score_diff"] = max_diff
+            row["speedup_p50"] = row["okapi"]["p50_ms"] / max(row["index"]["p50_ms"], 1e-9)
+
+        report["results"].append(row)
+        line = f"{size:>7}개 문서 | BM25Index p50 {row['index']['p50_ms']:.3f}ms p95 {row['index']['p95_ms']:.3f}ms"
+        if "okapi" in row:
+            line += (f" | BM25Okapi p50 {row['okapi']['p50_ms']:.3f}ms p95 {row['okapi']['p95_ms']:.3f}ms"
+                     f" | {row['speedup_p50']:.1f}x, 최대 오차 {row['max_abs_score_diff']:.2e}")
+        print(line)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 검색 지연 시간 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--reference-limit", type=int, default=100000,
+                        help="BM25Okapi 비교를 수행할 최대 문서 수")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.queries, args.top_k, args.reference_limit)
+    if args.output:
+        save_json(args.output, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+import json
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+
+# 합성 코퍼스용 한국어 음절 (유니베라 문서와 비슷한 분포를 흉내)
+_SYLLABLES = list("유니베라알로에제품건강브랜드경영품질고객서비스연구개발글로벌미래전략역사비전미션")
+
+
+def make_vocabulary(size: int, seed: int = 0) -> List[str]:
+    """2~4음절 합성 단어 사전 생성"""
+    rng = np.random.default_rng(seed)
+    words = set()
+    while len(words) < size:
+        length = int(rng.integers(2, 5))
+        words.add("".join(rng.choice(_SYLLABLES, size=length)))
+    return sorted(words)
+
+
+def make_corpus(n_docs: int, vocab_size: int = 20000, doc_len: int = 120,
+                seed: int = 0) -> List[List[str]]:
+    """Zipf 분포를 따르는 토크나이즈된 합성 문서 생성"""
+    rng = np.random.default_rng(seed)
+    vocab = np.asarray(make_vocabulary(vocab_size, seed))
+    ranks = np.arange(1, vocab_size + 1)
+    probs = 1.0 / ranks
+    probs /= probs.sum()
+    lengths = rng.poisson(doc_len, size=n_docs).clip(5)
+    return [list(vocab[rng.choice(vocab_size, size=int(length), p=probs)]) for length in lengths]
+
+
+def make_queries(corpus: List[List[str]], n_queries: int = 50, terms: int = 4,
+                 seed: int = 1) -> List[List[str]]:
+    """코퍼스 문서에서 단어를 뽑아 질의 생성"""
+    rng = np.random.default_rng(seed)
+    queries = []
+    for doc_id in rng.integers(0, len(corpus), size=n_queries):
+        doc = corpus[int(doc_id)]
+        queries.append([doc[int(i)] for i in rng.integers(0, len(doc), size=terms)])
+    return queries
+
+
+def make_markdown_documents(n_docs: int, words_per_doc: int = 300, seed: int = 0) -> List[str]:
+    """front matter와 제목/목록을 포함한 합성 마크다운 문서 생성"""
+    rng = np.random.default_rng(seed)
+    vocab = np.asarray(make_vocabulary(5000, seed))
+    documents = []
+    for doc_id in range(n_docs):
+        words = vocab[rng.integers(0, len(vocab), size=words_per_doc)]
+        lines = [f"---\ntitle: 문서 {doc_id}\ncategory: 합성\n---"]
+        for start in range(0, words_per_doc, 15):
+            marker = "## " if start % 60 == 0 else "- "
+            lines.append(marker + " ".join(words[start:start + 15]) + "입니다.")
+        documents.append("\n".join(lines))
+    return documents
+
+
+# 한국어 조사 (질의 단어에 붙여 공백 분리 BM25와 의미 검색의 차이를 만듦)
+_PARTICLES = ["의", "은", "는", "을", "를", "에서", "으로", "과"]
+
+
+def make_labeled_corpus(n_docs: int, n_queries: int = 200, words_per_doc: int = 150,
+                        seed: int = 0) -> Tuple[Dict[str, str], List[Dict[str, Any]]]:
+    """
+    정답이 달린 합성 검색 평가 집합
+
+    문서는 주제 단어, 전체 공통 단어(Zipf), 문서 고유 단어로 구성되고 일부 문서는 같은
+    주제의 앞 문서와 고유 단어 절반을 공유합니다(개정판 문서처럼). 질의는 대상 문서의
+    고유 단어 3개와 주제 단어 1개이며 절반 확률로 조사가 붙습니다.
+
+    Returns:
+        (파일명 → 마크다운, [{"query", "relevant": {파일명: 관련도}}])
+        대상 문서 관련도 2, 질의 고유 단어를 2개 이상 포함한 다른 문서 1
+    """
+    rng = np.random.default_rng(seed)
+    vocab = [str(word) for word in rng.permutation(make_vocabulary(max(20000, n_docs * 12), seed))]
+    common, rest = vocab[:300], vocab[300:]
+    rng.shuffle(rest)
+    n_topics = max(n_docs // 25, 4)
+    topic_words = [rest[i * 30:(i + 1) * 30] for i in range(n_topics)]
+    own_pool = rest[n_topics * 30:]
+    zipf = 1.0 / np.arange(1, len(common) + 1)
+    zipf /= zipf.sum()
+
+    documents, doc_words, doc_topics = {}, [], []
+    last_in_topic: Dict[int, int] = {}
+    for doc_id in range(n_docs):
+        topic = int(rng.integers(n_topics))
+        own = [own_pool[(doc_id * 8 + i) % len(own_pool)] for i in range(8)]
+        if topic in last_in_topic and rng.random() < 0.2:
+            own[:4] = doc_words[last_in_topic[topic]][:4]
+        last_in_topic[topic] = doc_id
+        words = [common[i] for i in rng.choice(len(common), size=words_per_doc // 2, p=zipf)]
+        words += [topic_words[topic][i] for i in rng.integers(0, 30, size=words_per_doc // 3)]
+        words += [own[i] for i in rng.integers(0, len(own), size=words_per_doc - len(words))]
+        rng.shuffle(words)
+        lines = [f"---\ntitle: 문서 {doc_id}\n---", f"# {topic_words[topic][0]} {own[0]}"]
+        for start in range(0, len(words), 15):
+            lines.append(("## " if start % 60 == 0 else "") + " ".join(words[start:start + 15]) + "입니다.")
+        documents[f"doc{doc_id:05d}.md"] = "\n\n".join(lines)
+        doc_words.append(own)
+        doc_topics.append(topic)
+
+    word_docs: Dict[str, set] = {}
+    for doc_id, own in enumerate(doc_words):
+        for word in own:
+            word_docs.setdefault(word, set()).add(doc_id)
+
+    labeled = []
+    for target in rng.integers(0, n_docs, size=n_queries):
+        target = int(target)
+        terms = list(rng.choice(doc_words[target], size=3, replace=False))
+        relevant = {f"doc{target:05d}.md": 2}
+        counts: Dict[int, int] = {}
+        for word in terms:
+            for doc_id in word_docs[word]:
+                counts[doc_id] = counts.get(doc_id, 0) + 1
+        for doc_id, count in counts.items():
+            if doc_id != target and count >= 2:
+                relevant[f"doc{doc_id:05d}.md"] = 1
+        terms.append(topic_words[doc_topics[target]][int(rng.integers(30))])
+        query = " ".join(word + (_PARTICLES[int(rng.integers(len(_PARTICLES)))] if rng.random() < 0.5 else "")
+                         for word in terms)
+        labeled.append({"query": query, "relevant": relevant})
+    return documents, labeled
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 샘플(초)의 요약 통계 (밀리초)"""
+    values = np.asarray(samples, dtype=np.float64) * 1000
+    if len(values) == 0:
+        return {"count": 0}
+    return {
+        "count": int(len(values)),
+        "mean_ms": float(values.mean()),
+        "p50_ms": float(np.percentile(values, 50)),
+        "p95_ms": float(np.percentile(values, 95)),
+        "p99_ms": float(np.percentile(values, 99)),
+        "max_ms": float(values.max())
+    }
+
+
+def time_calls(fn: Callable[[Any], Any], inputs: List[Any]) -> List[float]:
+    """입력별 호출 시간 측정 (초)"""
+    samples = []
+    for item in inputs:
+        start = time.perf_counter()
+        fn(item)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def save_json(path: str, data: Dict[str, Any]):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
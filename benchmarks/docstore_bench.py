@@ -0,0 +1,103 @@
+"""
+문서 저장소 벤치마크: 기존 filenames/documents 리스트 vs DocumentStore
+
+    python -m benchmarks.docstore_bench --sizes 1000 10000 100000
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from document_store import DocumentStore
+from benchmarks.common import make_markdown_documents, save_json
+
+
+def legacy_memory(filenames, documents) -> int:
+    """리스트 두 개와 그 안의 문자열 객체 크기 합"""
+    return (sys.getsizeof(filenames) + sys.getsizeof(documents)
+            + sum(sys.getsizeof(f) for f in filenames) + sum(sys.getsizeof(t) for t in documents))
+
+
+def legacy_load(records, dedup):
+    filenames, documents = [], []
+    for filename, text in records:
+        if not dedup or filename not in filenames:  # 기존 O(n) 리스트 멤버십 검사
+            filenames.append(filename)
+            documents.append(text)
+    return filenames, documents
+
+
+def store_load(records, compression_level):
+    store = DocumentStore(compression_level=compression_level)
+    for filename, text in records:
+        store.add(filename, text)
+    return store
+
+
+def run(sizes, legacy_dedup_limit, compression_level, lookups=200):
+    report = {"compression_level": compression_level, "results": []}
+    base = make_markdown_documents(min(max(sizes), 2000))
+    for size in sizes:
+        # 본문은 기본 문서를 재사용하되 객체는 새로 만들어 실제 로딩과 같은 조건으로 측정
+        records = [(f"docs/문서_{i:06d}.md", base[i % len(base)] + f"\n문서 번호 {i}") for i in range(size)]
+        row = {"documents": size}
+
+        filenames, documents = legacy_load(records, dedup=False)
+        store = store_load(records, compression_level)
+        legacy_bytes = legacy_memory(filenames, documents)
+        store_bytes = store.memory_bytes()
+        row["legacy_bytes_per_doc"] = legacy_bytes / size
+        row["store_bytes_per_doc"] = store_bytes / size
+        row["memory_ratio"] = store_bytes / legacy_bytes
+
+        start = time.perf_counter()
+        store_load(records, compression_level)
+        row["store_load_s"] = time.perf_counter() - start
+        if size <= legacy_dedup_limit:
+            start = time.perf_counter()
+            legacy_load(records, dedup=True)
+            row["legacy_load_s"] = time.perf_counter() - start
+
+        rng = np.random.default_rng(0)
+        targets = [filenames[int(i)] for i in rng.integers(0, size, size=lookups)]
+        start = time.perf_counter()
+        for target in targets:
+            store.get(target)
+        row["store_lookup_us"] = (time.perf_counter() - start) / lookups * 1e6
+        start = time.perf_counter()
+        for target in targets:
+            for i, fname in enumerate(filenames):  # 기존 hybrid_search의 선형 탐색
+                if fname == target:
+                    documents[i]
+                    break
+        row["legacy_lookup_us"] = (time.perf_counter() - start) / lookups * 1e6
+
+        report["results"].append(row)
+        line = (f"{size:>7}개 문서 | 메모리/문서 {row['legacy_bytes_per_doc']:.0f}B → "
+                f"{row['store_bytes_per_doc']:.0f}B ({row['memory_ratio']:.2f}x) | "
+                f"조회 {row['legacy_lookup_us']:.1f}µs → {row['store_lookup_us']:.1f}µs | "
+                f"로딩 {row['store_load_s']:.2f}s")
+        if "legacy_load_s" in row:
+            line += f" (기존 {row['legacy_load_s']:.2f}s)"
+        print(line)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="문서 저장소 메모리/조회 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--legacy-dedup-limit", type=int, default=20000,
+                        help="기존 O(n²) 중복 검사 로딩을 측정할 최대 문서 수")
+    parser.add_argument("--compression-level", type=int, default=1)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.legacy_dedup_limit, args.compression_level)
+    if args.output:
+        save_json(args.output, report)
+
+
+if __name__ == "__main__":
+    main()
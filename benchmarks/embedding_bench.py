@@ -0,0 +1,128 @@
+"""
+임베딩 백엔드 벤치마크: PyTorch fp32 vs int8 동적 양자화 vs ONNX Runtime (CPU)
+
+백엔드마다 새 프로세스에서 모델을 로드해 콜드 스타트 시간, 상주 메모리, 단일 질의
+지연 시간(p50/p95), 배치 처리량을 측정하고 fp32 임베딩과의 코사인 일치도를 확인합니다.
+일치도가 Config.EMBEDDING_MIN_COSINE 미만인 백엔드가 있으면 종료 코드 1을 반환합니다.
+
+    python -m benchmarks.embedding_bench --backends torch torch-int8 onnx --threads 4
+"""
+
+import sys
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from config import Config
+from embedding_backend import check_agreement, create_embedding_model
+from benchmarks.common import latency_summary, make_markdown_documents, save_json, time_calls
+
+# 실제 사용자 질문과 비슷한 질의 (빠른 질문 목록 기반)
+SAMPLE_QUERIES = [
+    "유니베라의 미션과 비전은 무엇인가요?",
+    "주요 제품들을 알려주세요",
+    "회사 역사를 설명해주세요",
+    "브랜드 전략은 어떻게 되나요?",
+    "ESG 경영 현황은?",
+    "알로에 원료는 어디에서 재배하나요?",
+    "해외 법인은 어느 나라에 있나요?",
+    "고객 서비스 센터 운영 시간은?"
+]
+
+
+def _memory_mb():
+    """현재/최대 상주 메모리 (MB, Linux /proc 기준)"""
+    values = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ("VmRSS", "VmHWM"):
+                    values[key] = int(value.split()[0]) / 1024
+    except OSError:
+        import resource
+        values["VmHWM"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return values.get("VmRSS", 0.0), values.get("VmHWM", 0.0)
+
+
+def measure_backend(backend, threads, queries, passages, batch_size):
+    """자식 프로세스에서 실행: 로드 시간, 메모리, 지연 시간, 처리량과 임베딩 반환"""
+    rss_before, _ = _memory_mb()
+    start = time.perf_counter()
+    model = create_embedding_model(Config.EMBEDDING_MODEL, backend=backend, threads=threads,
+                                   onnx_path=Config.EMBEDDING_ONNX_PATH, onnx_file=Config.EMBEDDING_ONNX_FILE)
+    load_s = time.perf_counter() - start
+
+    query_texts = ["query: " + query for query in queries]
+    passage_texts = ["passage: " + passage for passage in passages]
+    model.encode(query_texts[:2], normalize_embeddings=True)  # 예열
+
+    latency = latency_summary(time_calls(
+        lambda text: model.encode(text, normalize_embeddings=True), query_texts * 5))
+    start = time.perf_counter()
+    passage_vectors = model.encode(passage_texts, batch_size=batch_size, normalize_embeddings=True)
+    batch_s = time.perf_counter() - start
+    query_vectors = model.encode(query_texts, batch_size=batch_size, normalize_embeddings=True)
+
+    rss_after, peak = _memory_mb()
+    row = {
+        "load_s": load_s,
+        "model_memory_mb": rss_after - rss_before,
+        "peak_rss_mb": peak,
+        "passages_per_sec": len(passages) / batch_s,
+        **latency
+    }
+    return row, query_vectors, passage_vectors
+
+
+def run(backends, threads, n_passages, batch_size):
+    queries = SAMPLE_QUERIES
+    passages = make_markdown_documents(n_passages, words_per_doc=120)
+    report = {"model": Config.EMBEDDING_MODEL, "threads": threads, "passages": n_passages,
+              "threshold": Config.EMBEDDING_MIN_COSINE, "results": {}}
+
+    # 백엔드마다 새 프로세스 (콜드 스타트와 메모리를 서로 섞이지 않게 측정)
+    context = multiprocessing.get_context("spawn")
+    outputs = {}
+    for backend in ["torch"] + [b for b in backends if b != "torch"]:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            outputs[backend] = pool.submit(
+                measure_backend, backend, threads, queries, passages, batch_size).result()
+
+    _, reference_queries, reference_passages = outputs["torch"]
+    passed = True
+    for backend, (row, query_vectors, passage_vectors) in outputs.items():
+        row["query_agreement"] = check_agreement(
+            reference_queries, query_vectors, threshold=Config.EMBEDDING_MIN_COSINE)
+        row["passage_agreement"] = check_agreement(
+            reference_passages, passage_vectors, threshold=Config.EMBEDDING_MIN_COSINE)
+        ok = row["query_agreement"]["passed"] and row["passage_agreement"]["passed"]
+        passed = passed and ok
+        report["results"][backend] = row
+        print(f"{backend:>11} | 로드 {row['load_s']:.1f}초 | 모델 {row['model_memory_mb']:.0f}MB "
+              f"(최대 {row['peak_rss_mb']:.0f}MB) | 질의 p50 {row['p50_ms']:.1f}ms p95 {row['p95_ms']:.1f}ms | "
+              f"{row['passages_per_sec']:.1f}문단/초 | 최소 코사인 "
+              f"{min(row['query_agreement']['min_cosine'], row['passage_agreement']['min_cosine']):.4f}"
+              f"{'' if ok else ' ❌'}")
+    report["passed"] = passed
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CPU 임베딩 백엔드 지연 시간/메모리/일치도 벤치마크")
+    parser.add_argument("--backends", nargs="+", default=["torch", "torch-int8", "onnx"])
+    parser.add_argument("--threads", type=int, default=Config.EMBEDDING_THREADS, help="추론 스레드 수 (0: 기본값)")
+    parser.add_argument("--passages", type=int, default=256)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args.backends, args.threads, args.passages, args.batch_size)
+    if args.output:
+        save_json(args.output, report)
+    sys.exit(0 if report["passed"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+검색 품질 평가 지표 (recall@k, MRR, nDCG)
+
+정답이 달린 질의 집합으로 hybrid_search를 실행해 문서 단위 순위 지표와 지연 시간을
+계산합니다. 질의 집합은 JSONL 한 줄에 질의 하나입니다.
+
+    {"query": "유니베라 연혁", "relevant": {"연혁.md": 2, "회사소개.md": 1}}
+    {"query": "알로에 원료 산지", "relevant": ["원료.md"]}
+
+relevant가 목록이면 모든 문서의 관련도를 1로 봅니다. 관련도는 nDCG의 이득(gain)으로
+쓰이고, recall과 MRR은 관련도가 0보다 큰 문서를 모두 정답으로 셉니다.
+"""
+
+import json
+import math
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from benchmarks.common import latency_summary
+
+DEFAULT_K_VALUES = (1, 3, 5, 10)
+
+
+def load_labeled_queries(path: str) -> List[Dict[str, Any]]:
+    """JSONL 질의 집합 로드 (relevant를 {파일명: 관련도}로 정규화)"""
+    labeled = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            relevant = item["relevant"]
+            if not isinstance(relevant, dict):
+                relevant = {filename: 1 for filename in relevant}
+            labeled.append({"query": item["query"], "relevant": relevant})
+    return labeled
+
+
+def recall_at_k(ranked: Sequence[str], relevant: Dict[str, float], k: int) -> float:
+    """상위 k개 안에 든 정답 문서 비율"""
+    positives = {doc for doc, grade in relevant.items() if grade > 0}
+    if not positives:
+        return 0.0
+    return len(positives.intersection(ranked[:k])) / len(positives)
+
+
+def reciprocal_rank(ranked: Sequence[str], relevant: Dict[str, float], k: Optional[int] = None) -> float:
+    """첫 정답 문서 순위의 역수 (k 밖이면 0)"""
+    for rank, doc in enumerate(ranked[:k] if k else ranked, 1):
+        if relevant.get(doc, 0) > 0:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: Sequence[str], relevant: Dict[str, float], k: int) -> float:
+    """관련도를 이득으로 쓰는 nDCG@k (2^rel - 1 이득, log2 할인)"""
+    def dcg(grades):
+        return sum((2 ** grade - 1) / math.log2(rank + 1) for rank, grade in enumerate(grades, 1))
+
+    ideal = dcg(sorted((grade for grade in relevant.values() if grade > 0), reverse=True)[:k])
+    if ideal == 0:
+        return 0.0
+    return dcg(relevant.get(doc, 0) for doc in ranked[:k]) / ideal
+
+
+def score_ranking(ranked: Sequence[str], relevant: Dict[str, float],
+                  k_values: Sequence[int] = DEFAULT_K_VALUES) -> Dict[str, float]:
+    """질의 하나의 지표 (recall@k, ndcg@k, mrr)"""
+    scores = {f"recall@{k}": recall_at_k(ranked, relevant, k) for k in k_values}
+    scores.update({f"ndcg@{k}": ndcg_at_k(ranked, relevant, k) for k in k_values})
+    scores["mrr"] = reciprocal_rank(ranked, relevant, max(k_values))
+    return scores
+
+
+def evaluate(search: Callable[[str], List[str]], labeled: List[Dict[str, Any]],
+             k_values: Sequence[int] = DEFAULT_K_VALUES,
+             per_query: bool = False) -> Dict[str, Any]:
+    """
+    검색 함수 평가
+
+    Args:
+        search: 질의 → 순위순 문서 파일명 목록 (max(k_values)개 이상 반환해야 함)
+        labeled: load_labeled_queries 형식의 질의 집합
+        per_query: 질의별 지표와 순위도 결과에 포함
+
+    Returns:
+        지표 평균, 지연 시간 요약(ms), 초당 질의 수
+    """
+    totals: Dict[str, float] = {}
+    samples = []
+    details = []
+    start = time.perf_counter()
+    for item in labeled:
+        query_start = time.perf_counter()
+        ranked = search(item["query"])
+        samples.append(time.perf_counter() - query_start)
+        scores = score_ranking(ranked, item["relevant"], k_values)
+        for name, value in scores.items():
+            totals[name] = totals.get(name, 0.0) + value
+        if per_query:
+            details.append({"query": item["query"], "ranked": ranked[:max(k_values)], **scores})
+    elapsed = time.perf_counter() - start
+
+    report = {
+        "queries": len(labeled),
+        "metrics": {name: value / len(labeled) for name, value in totals.items()} if labeled else {},
+        "latency": latency_summary(samples),
+        "qps": len(labeled) / elapsed if elapsed > 0 else 0.0
+    }
+    if per_query:
+        report["per_query"] = details
+    return report
+
+
+def hybrid_search_fn(rag_system, k: int, **search_kwargs) -> Callable[[str], List[str]]:
+    """RAGSystem.hybrid_search를 evaluate용 검색 함수로 감쌈 (search_kwargs: 가중치/top_k 등)"""
+    def search(query: str) -> List[str]:
+        results = rag_system.hybrid_search(query, final_top_k=k, **search_kwargs)
+        return [result["filename"] for result in results]
+    return search
+
+
+def compare_reports(current: Dict[str, float], baseline: Dict[str, float],
+                    tolerance: float = 0.005) -> Dict[str, Dict[str, float]]:
+    """
+    기준 결과 대비 지표 변화 (tolerance보다 크게 떨어진 지표만 regression으로 표시)
+
+    Returns:
+        {지표: {"baseline", "current", "delta", "regression"}}
+    """
+    changes = {}
+    for name, value in current.items():
+        if name not in baseline:
+            continue
+        delta = value - baseline[name]
+        changes[name] = {"baseline": baseline[name], "current": value, "delta": delta,
+                         "regression": delta < -tolerance}
+    return changes
@@ -0,0 +1,183 @@
+"""
+API 서버 부하 테스트: 동시 요청 수별 RPS와 지연 시간(p50/p95/p99/최대)
+
+실행 중인 서버(--url)에 요청하거나, --fake로 로컬 대역(OpenAI/Pinecone 대역 서버와
+합성 코퍼스)을 쓰는 API 서버를 같은 프로세스에 띄워 외부 서비스 없이 측정합니다.
+스트리밍 답변(--stream)은 첫 답변 조각까지의 시간(TTFT)도 함께 보고합니다.
+
+    python -m benchmarks.load_test --url http://localhost:8000 --endpoint search --concurrency 50 200
+    python -m benchmarks.load_test --fake --endpoint answer --stream --requests 500
+"""
+
+import sys
+import time
+import socket
+import asyncio
+import logging
+import argparse
+import threading
+from collections import Counter
+
+from config import Config
+from benchmarks.common import latency_summary, make_labeled_corpus, save_json
+from benchmarks.embedding_bench import SAMPLE_QUERIES
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_fake_server(args):
+    """대역 서비스를 쓰는 API 서버를 백그라운드 스레드에서 시작 (base URL, 질의 목록, 정리 함수 반환)"""
+    import uvicorn
+    from api_server import create_app
+    from fakes import FakeOpenAIServer, FakePineconeServer, build_fake_rag_system
+
+    documents, labeled = make_labeled_corpus(args.documents, n_queries=args.requests, seed=args.seed)
+    openai_server = FakeOpenAIServer(first_token_delay=args.llm_latency, token_delay=0.0).start()
+    system = build_fake_rag_system(documents, openai_base_url=openai_server.base_url)
+    system.vector_store.query_delay = args.vector_latency
+    pinecone = FakePineconeServer(system.vector_store).start()
+
+    app = create_app(system, openai_api_key="fake", openai_base_url=openai_server.base_url,
+                     pinecone_host=pinecone.base_url, pinecone_api_key="fake")
+    port = _free_port()
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           backlog=4096))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+
+    def stop():
+        server.should_exit = True
+        thread.join()
+        pinecone.stop()
+        openai_server.stop()
+
+    return f"http://127.0.0.1:{port}", [item["query"] for item in labeled], stop
+
+
+async def wait_healthy(client, base_url, timeout):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            response = await client.get(f"{base_url}/health")
+            if response.status_code == 200:
+                return response.json()
+        except Exception:
+            pass
+        await asyncio.sleep(0.2)
+    raise RuntimeError(f"{timeout}초 안에 서버가 준비되지 않았습니다: {base_url}")
+
+
+async def one_request(client, base_url, args, query):
+    """요청 하나 실행: (상태 코드, 지연 시간, TTFT 또는 None)"""
+    body = {"query": query, "final_top_k": args.final_top_k}
+    if args.fusion:
+        body["fusion"] = args.fusion
+    if args.endpoint == "answer":
+        body["use_cache"] = not args.no_cache
+        body["stream"] = args.stream
+    url = f"{base_url}/{args.endpoint}"
+    start = time.perf_counter()
+    try:
+        if args.endpoint == "answer" and args.stream:
+            ttft = None
+            async with client.stream("POST", url, json=body) as response:
+                async for line in response.aiter_lines():
+                    if ttft is None and line.startswith("event: delta"):
+                        ttft = time.perf_counter() - start
+            return response.status_code, time.perf_counter() - start, ttft
+        response = await client.post(url, json=body)
+        return response.status_code, time.perf_counter() - start, None
+    except Exception as e:
+        return type(e).__name__, time.perf_counter() - start, None
+
+
+async def run_level(client, base_url, args, queries, concurrency):
+    gate = asyncio.Semaphore(concurrency)
+    n = args.requests
+
+    async def limited(i):
+        async with gate:
+            return await one_request(client, base_url, args, queries[i % len(queries)])
+
+    start = time.perf_counter()
+    outcomes = await asyncio.gather(*(limited(i) for i in range(n)))
+    elapsed = time.perf_counter() - start
+
+    statuses = Counter(str(status) for status, _, _ in outcomes)
+    ok = [latency for status, latency, _ in outcomes if status == 200]
+    ttfts = [ttft for status, _, ttft in outcomes if status == 200 and ttft is not None]
+    row = {"endpoint": args.endpoint, "stream": args.stream, "concurrency": concurrency, "requests": n,
+           "elapsed_s": elapsed, "rps": len(ok) / elapsed, "errors": n - len(ok),
+           "statuses": dict(statuses), "latency": latency_summary(ok)}
+    if ttfts:
+        row["ttft"] = latency_summary(ttfts)
+    latency = row["latency"]
+    print(f"동시 {concurrency:>4} | {row['rps']:7.1f} RPS | p50 {latency.get('p50_ms', 0):7.1f}ms "
+          f"p95 {latency.get('p95_ms', 0):7.1f}ms p99 {latency.get('p99_ms', 0):7.1f}ms "
+          f"최대 {latency.get('max_ms', 0):7.1f}ms | 오류 {row['errors']}"
+          + (f" | TTFT p50 {row['ttft']['p50_ms']:.1f}ms p95 {row['ttft']['p95_ms']:.1f}ms" if ttfts else ""))
+    return row
+
+
+async def run(args, base_url, queries):
+    import httpx
+
+    limits = httpx.Limits(max_connections=max(args.concurrency), max_keepalive_connections=max(args.concurrency))
+    async with httpx.AsyncClient(limits=limits, timeout=args.timeout) as client:
+        health = await wait_healthy(client, base_url, args.ready_timeout)
+        print(f"서버 준비 완료 (pid {health.get('pid')}): {base_url}")
+        # 예열 (연결 수립, 첫 요청 경로)
+        await asyncio.gather(*(one_request(client, base_url, args, query) for query in queries[:8]))
+        return [await run_level(client, base_url, args, queries, concurrency)
+                for concurrency in args.concurrency]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RAG API 서버 부하 테스트")
+    parser.add_argument("--url", default=f"http://127.0.0.1:{Config.API_PORT}", help="API 서버 주소")
+    parser.add_argument("--fake", action="store_true", help="대역 서비스로 API 서버를 직접 띄워 측정")
+    parser.add_argument("--endpoint", choices=["search", "answer"], default="search")
+    parser.add_argument("--stream", action="store_true", help="/answer 스트리밍 응답 사용")
+    parser.add_argument("--no-cache", action="store_true", help="/answer 답변 캐시 사용 안 함")
+    parser.add_argument("--fusion", help="검색 결과 결합 방식")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100])
+    parser.add_argument("--requests", type=int, default=500, help="동시성 단계별 요청 수")
+    parser.add_argument("--final-top-k", type=int, default=Config.FINAL_TOP_K)
+    parser.add_argument("--queries", help="질의 파일 (한 줄에 하나, 없으면 예시 질문 또는 합성 질의)")
+    parser.add_argument("--timeout", type=float, default=60.0, help="요청 제한 시간 (초)")
+    parser.add_argument("--ready-timeout", type=float, default=300.0, help="서버 준비 대기 시간 (초)")
+    parser.add_argument("--documents", type=int, default=1000, help="--fake 합성 문서 수")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="--fake OpenAI 응답 지연 (초)")
+    parser.add_argument("--vector-latency", type=float, default=0.03, help="--fake Pinecone 질의 지연 (초)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format=Config.LOG_FORMAT)
+    logging.getLogger().setLevel(logging.WARNING)
+
+    stop = None
+    base_url, queries = args.url.rstrip("/"), SAMPLE_QUERIES
+    if args.fake:
+        base_url, queries, stop = start_fake_server(args)
+    if args.queries:
+        with open(args.queries, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    try:
+        results = asyncio.run(run(args, base_url, queries))
+    finally:
+        if stop is not None:
+            stop()
+    report = {"url": base_url, "fake": args.fake, "results": results}
+    if args.output:
+        save_json(args.output, report)
+    sys.exit(1 if any(row["errors"] for row in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
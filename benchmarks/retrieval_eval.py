@@ -0,0 +1,156 @@
+"""
+검색 품질/성능 평가: hybrid_search의 recall@k, MRR, nDCG와 지연 시간, 처리량
+
+Pinecone과 OpenAI 대신 fakes의 로컬 대역(FakePineconeIndex, FakeEmbeddingModel)을 쓰므로
+네트워크 없이 재현 가능합니다. 기본은 합성 평가 집합(benchmarks.common.make_labeled_corpus)을
+코퍼스 크기별로 만들고, --documents/--queries로 실제 마크다운 폴더와 정답 JSONL을 줄 수도
+있습니다. 결합 방식(fusion), 가중치, 후보 수(top_k) 조합을 바꿔 가며 비교하고, --baseline으로 이전 결과
+JSON과 비교해 떨어진 지표를 표시합니다.
+
+    python -m benchmarks.retrieval_eval --sizes 1000 5000 --output eval.json
+    python -m benchmarks.retrieval_eval --vector-weights 0.4 0.6 0.8 --vector-top-k 5 15
+    python -m benchmarks.retrieval_eval --fusion weighted rrf zscore combmnz --vector-top-k 3 5 10 15
+    python -m benchmarks.retrieval_eval --baseline eval.json
+"""
+
+import sys
+import json
+import logging
+import argparse
+import itertools
+import subprocess
+from datetime import datetime
+
+from config import Config
+from fakes import build_fake_rag_system
+from fusion import METHODS
+from benchmarks.common import make_labeled_corpus, save_json
+from benchmarks.evaluation import DEFAULT_K_VALUES, compare_reports, evaluate, hybrid_search_fn, load_labeled_queries
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_folder(path):
+    from ingest import scan_documents
+
+    documents = {}
+    for filename, full_path in scan_documents(path).items():
+        with open(full_path, encoding="utf-8") as f:
+            documents[filename] = f.read()
+    return documents
+
+
+def configurations(args):
+    """평가할 검색 설정 조합 (결합 방식 × 가중치 × 벡터 후보 수 × BM25 후보 수)"""
+    for fusion, vector_weight, vector_top_k, bm25_top_k in itertools.product(
+            args.fusion, args.vector_weights, args.vector_top_k, args.bm25_top_k):
+        yield {
+            "fusion": fusion,
+            "vector_weight": vector_weight,
+            "bm25_weight": round(1.0 - vector_weight, 6),
+            "vector_top_k": vector_top_k,
+            "bm25_top_k": bm25_top_k
+        }
+
+
+def config_name(options):
+    return (f"{options['fusion']}-w{options['vector_weight']:g}"
+            f"-v{options['vector_top_k']}-b{options['bm25_top_k']}")
+
+
+def run_dataset(label, documents, labeled, args):
+    system = build_fake_rag_system(documents, dimension=args.dimension)
+    try:
+        system.wait_for_corpus()
+        k = max(args.k)
+        rows = []
+        for options in configurations(args):
+            report = evaluate(hybrid_search_fn(system, k, **options), labeled, args.k)
+            metrics = report["metrics"]
+            rows.append({"dataset": label, "documents": len(documents), "chunks": len(system.store),
+                         "config": config_name(options), **options, **report})
+            print(f"{label:>10} | {config_name(options):<25} | recall@5 {metrics.get('recall@5', 0):.3f} "
+                  f"recall@10 {metrics.get('recall@10', 0):.3f} | MRR {metrics['mrr']:.3f} | "
+                  f"nDCG@10 {metrics.get('ndcg@10', 0):.3f} | p50 {report['latency']['p50_ms']:.2f}ms "
+                  f"p95 {report['latency']['p95_ms']:.2f}ms | {report['qps']:.0f} q/s")
+    finally:
+        system.close()
+    return rows
+
+
+def run(args):
+    report = {
+        "commit": _git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "k": list(args.k),
+        "tokenizer": Config.TOKENIZER_MODE,
+        "chunker": f"{Config.CHUNK_MAX_TOKENS}/{Config.CHUNK_OVERLAP_TOKENS}",
+        "results": []
+    }
+    if args.documents:
+        documents = load_folder(args.documents)
+        report["results"] += run_dataset("folder", documents, load_labeled_queries(args.queries), args)
+    else:
+        for size in args.sizes:
+            documents, labeled = make_labeled_corpus(size, args.n_queries, seed=args.seed)
+            report["results"] += run_dataset(f"synth-{size}", documents, labeled, args)
+    return report
+
+
+def compare(report, baseline_path, tolerance):
+    """같은 데이터셋/설정의 이전 결과와 지표 비교 (떨어진 지표가 있으면 True)"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    previous = {(row["dataset"], row["config"]): row for row in baseline["results"]}
+    regressed = False
+    for row in report["results"]:
+        old = previous.get((row["dataset"], row["config"]))
+        if old is None:
+            continue
+        changes = compare_reports(row["metrics"], old["metrics"], tolerance)
+        row["baseline"] = {"commit": baseline.get("commit"), "changes": changes}
+        worse = [f"{name} {change['delta']:+.3f}" for name, change in changes.items() if change["regression"]]
+        if worse:
+            regressed = True
+            print(f"❌ {row['dataset']} {row['config']}: {', '.join(worse)} (기준 {baseline.get('commit')})")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="hybrid_search 검색 품질/지연 시간 평가")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000], help="합성 코퍼스 문서 수")
+    parser.add_argument("--n-queries", type=int, default=300, help="합성 질의 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--documents", help="실제 마크다운 폴더 (--queries와 함께 사용)")
+    parser.add_argument("--queries", help="정답 JSONL ({query, relevant})")
+    parser.add_argument("--k", type=int, nargs="+", default=list(DEFAULT_K_VALUES))
+    parser.add_argument("--fusion", nargs="+", choices=METHODS, default=[Config.FUSION_METHOD],
+                        help="검색 결과 결합 방식")
+    parser.add_argument("--vector-weights", type=float, nargs="+", default=[Config.VECTOR_WEIGHT])
+    parser.add_argument("--vector-top-k", type=int, nargs="+", default=[Config.VECTOR_TOP_K])
+    parser.add_argument("--bm25-top-k", type=int, nargs="+", default=[Config.BM25_TOP_K])
+    parser.add_argument("--dimension", type=int, default=256, help="대역 임베딩 차원")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--tolerance", type=float, default=0.005, help="허용 지표 하락폭")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+    if args.documents and not args.queries:
+        parser.error("--documents에는 --queries가 필요합니다.")
+
+    logging.basicConfig(level=logging.WARNING, format=Config.LOG_FORMAT)
+    logging.getLogger().setLevel(logging.WARNING)
+    report = run(args)
+    regressed = compare(report, args.baseline, args.tolerance) if args.baseline else False
+    if args.output:
+        save_json(args.output, report)
+    sys.exit(1 if regressed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+의미 캐시 평가: 유사도 임계값별 적중률/오적중률과 조회 지연 시간
+
+질문 의도별 표현 묶음(PARAPHRASES)에서 첫 표현의 답변만 캐시에 넣은 뒤, 나머지 표현은
+같은 의도의 답변에 적중해야 하고(적중률), 비슷하게 생겼지만 다른 것을 묻는 질문
+(NEAR_MISSES)과 다른 의도의 답변에 적중하면 오적중으로 셉니다. 기본은 외부 모델 없이
+fakes.FakeEmbeddingModel로 재현 가능하게 돌리고, --backend로 운영 임베딩 모델을 지정해
+Config.SEMANTIC_CACHE_THRESHOLD를 정할 때 씁니다. 조회 지연 시간은 캐시를 max_size까지
+채운 상태에서 측정합니다.
+
+    python -m benchmarks.semantic_cache_eval --thresholds 0.85 0.9 0.93 0.95 0.97
+    python -m benchmarks.semantic_cache_eval --backend torch --output semantic.json
+"""
+
+import sys
+import time
+import argparse
+
+import numpy as np
+
+from config import Config
+from cache import SemanticCache
+from benchmarks.common import latency_summary, save_json
+
+# 의도별 같은 질문의 다른 표현 (첫 표현의 답변을 캐시에 넣음)
+PARAPHRASES = [
+    ["유니베라의 미션과 비전은?", "유니베라의 미션과 비전은 무엇인가요?", "유니베라 미션 비전 알려줘",
+     "유니베라가 추구하는 미션과 비전이 궁금합니다"],
+    ["주요 제품들을 알려주세요", "유니베라 주요 제품은 무엇인가요?", "대표 제품 알려줘",
+     "어떤 제품들을 판매하나요?"],
+    ["회사 역사를 설명해주세요", "유니베라의 역사를 알려주세요", "회사 연혁이 궁금해요",
+     "유니베라는 언제 어떻게 시작됐나요?"],
+    ["브랜드 전략은 어떻게 되나요?", "유니베라의 브랜드 전략은?", "브랜드 전략 설명해줘",
+     "브랜드를 어떤 전략으로 운영하나요?"],
+    ["ESG 경영 현황은?", "ESG 경영은 어떻게 하고 있나요?", "유니베라 ESG 현황 알려줘",
+     "환경 사회 지배구조 경영 현황은?"],
+    ["글로벌 진출 현황은?", "해외 진출 현황을 알려주세요", "글로벌 진출은 어디까지 했나요?",
+     "유니베라의 해외 시장 진출 현황은?"],
+    ["제품 개발 과정은?", "제품은 어떤 과정으로 개발하나요?", "제품 개발 과정 설명해줘",
+     "신제품 개발 절차가 궁금합니다"],
+    ["품질 관리 시스템은?", "품질 관리는 어떻게 하나요?", "품질 관리 시스템 알려줘",
+     "제품 품질을 어떻게 관리하나요?"],
+    ["고객 서비스는 어떻게 되나요?", "고객 서비스 안내해주세요", "고객 서비스 운영 방식은?",
+     "고객 지원은 어떻게 받을 수 있나요?"],
+    ["미래 계획은 무엇인가요?", "유니베라의 미래 계획은?", "앞으로의 계획 알려줘",
+     "향후 사업 계획이 궁금합니다"],
+    ["알로에 원료는 어디에서 재배하나요?", "알로에는 어디서 재배하나요?", "알로에 재배지는 어디인가요?",
+     "알로에 원료 재배 농장 위치는?"],
+    ["고객 서비스 센터 운영 시간은?", "고객센터 운영 시간 알려주세요", "고객 서비스 센터는 몇 시까지 하나요?",
+     "고객센터 상담 가능 시간은?"]
+]
+
+# 캐시된 질문과 단어가 많이 겹치지만 답이 달라야 하는 질문 (적중하면 오적중)
+NEAR_MISSES = [
+    "유니베라의 미션은?",
+    "유니베라의 비전은?",
+    "주요 제품 가격을 알려주세요",
+    "제품 환불 절차는?",
+    "회사 조직도를 설명해주세요",
+    "브랜드 로고는 어떻게 되나요?",
+    "ESG 보고서는 어디서 보나요?",
+    "글로벌 매출 현황은?",
+    "제품 배송 과정은?",
+    "품질 인증 현황은?",
+    "고객 서비스 센터 전화번호는?",
+    "알로에 원료 가격은?",
+    "알로에는 어떻게 먹나요?",
+    "채용 계획은 무엇인가요?"
+]
+
+
+def create_model(backend):
+    if backend == "fake":
+        from fakes import FakeEmbeddingModel
+        return FakeEmbeddingModel(Config.PINECONE_DIMENSION)
+    from embedding_backend import create_embedding_model
+    return create_embedding_model(Config.EMBEDDING_MODEL, backend=backend, threads=Config.EMBEDDING_THREADS,
+                                  onnx_path=Config.EMBEDDING_ONNX_PATH, onnx_file=Config.EMBEDDING_ONNX_FILE)
+
+
+def embed(model, texts):
+    vectors = model.encode(["query: " + text for text in texts], normalize_embeddings=True)
+    return np.asarray(vectors, dtype=np.float32)
+
+
+def evaluate_threshold(threshold, seeds, seed_vectors, probes):
+    """
+    임계값 하나 평가
+
+    Args:
+        seeds: 캐시에 넣을 (질문, 의도 번호)
+        probes: 조회할 (질문, 임베딩, 정답 의도 번호 또는 None)
+    """
+    cache = SemanticCache(max_size=len(seeds), threshold=threshold, ttl=None)
+    for (question, intent), vector in zip(seeds, seed_vectors):
+        cache.add(vector, "eval", question, intent)
+
+    correct = 0
+    rejected = 0
+    errors = []
+    for question, vector, expected in probes:
+        match = cache.lookup(vector, "eval")
+        if match is None:
+            rejected += expected is None
+            continue
+        intent, similarity, matched = match
+        if intent == expected:
+            correct += 1
+        else:
+            errors.append({"query": question, "matched": matched, "similarity": round(similarity, 4)})
+
+    paraphrases = sum(1 for _, _, expected in probes if expected is not None)
+    near_misses = len(probes) - paraphrases
+    stats = cache.stats()
+    # 오적중은 정답 의도를 아는 평가에서만 셀 수 있으므로 캐시가 아니라 여기서 집계
+    return {
+        "threshold": threshold,
+        "paraphrase_hit_rate": correct / paraphrases if paraphrases else 0.0,
+        "hit_rate": stats["hit_rate"],
+        "false_hits": len(errors),
+        "false_hit_rate": len(errors) / stats["hits"] if stats["hits"] else 0.0,
+        "near_miss_rejected": rejected / near_misses if near_misses else 1.0,
+        "false_hit_examples": errors[:5]
+    }
+
+
+def measure_lookup(dimension, max_size, repeats, seed):
+    """max_size까지 채운 캐시의 조회 지연 시간"""
+    rng = np.random.default_rng(seed)
+    vectors = rng.standard_normal((max_size + repeats, dimension)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    cache = SemanticCache(max_size=max_size, threshold=0.95, ttl=None)
+    for i in range(max_size):
+        cache.add(vectors[i], "bench", f"q{i}", i)
+    samples = []
+    for vector in vectors[max_size:]:
+        start = time.perf_counter()
+        cache.lookup(vector, "bench")
+        samples.append(time.perf_counter() - start)
+    return {"max_size": max_size, "dimension": dimension,
+            "matrix_mb": cache.stats()["memory_bytes"] / 1e6, **latency_summary(samples)}
+
+
+def run(args):
+    model = create_model(args.backend)
+    seeds = [(group[0], intent) for intent, group in enumerate(PARAPHRASES)]
+    probe_texts = [(text, intent) for intent, group in enumerate(PARAPHRASES) for text in group[1:]]
+    probe_texts += [(text, None) for text in NEAR_MISSES]
+
+    seed_vectors = embed(model, [question for question, _ in seeds])
+    probe_vectors = embed(model, [text for text, _ in probe_texts])
+    probes = [(text, vector, intent) for (text, intent), vector in zip(probe_texts, probe_vectors)]
+
+    report = {"backend": args.backend, "model": None if args.backend == "fake" else Config.EMBEDDING_MODEL,
+              "intents": len(PARAPHRASES), "paraphrases": len(probe_texts) - len(NEAR_MISSES),
+              "near_misses": len(NEAR_MISSES), "configured_threshold": Config.SEMANTIC_CACHE_THRESHOLD,
+              "results": []}
+    for threshold in args.thresholds:
+        row = evaluate_threshold(threshold, seeds, seed_vectors, probes)
+        report["results"].append(row)
+        marker = " ← 설정값" if abs(threshold - Config.SEMANTIC_CACHE_THRESHOLD) < 1e-9 else ""
+        print(f"임계값 {threshold:.3f} | 표현 적중률 {row['paraphrase_hit_rate']:.3f} | "
+              f"오적중 {row['false_hits']} (적중 중 {row['false_hit_rate']:.3f}) | "
+              f"유사 질문 거절률 {row['near_miss_rejected']:.3f}{marker}")
+
+    for max_size in args.cache_sizes:
+        row = measure_lookup(seed_vectors.shape[1], max_size, args.repeats, args.seed)
+        report.setdefault("lookup", []).append(row)
+        print(f"조회 | 항목 {max_size:>5} × {row['dimension']}차원 ({row['matrix_mb']:.1f}MB) | "
+              f"p50 {row['p50_ms']:.3f}ms p95 {row['p95_ms']:.3f}ms")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="의미 캐시 임계값별 적중률/오적중률 평가")
+    parser.add_argument("--backend", default="fake",
+                        help="임베딩 모델 (fake: 결정적 대역, torch/torch-int8/onnx: 운영 모델)")
+    parser.add_argument("--thresholds", type=float, nargs="+",
+                        default=sorted({0.8, 0.85, 0.9, 0.93, 0.95, 0.97, Config.SEMANTIC_CACHE_THRESHOLD}))
+    parser.add_argument("--cache-sizes", type=int, nargs="+", default=[Config.SEMANTIC_CACHE_SIZE, 5000])
+    parser.add_argument("--repeats", type=int, default=200, help="조회 지연 측정 횟수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        save_json(args.output, report)
+    configured = [row for row in report["results"]
+                  if abs(row["threshold"] - Config.SEMANTIC_CACHE_THRESHOLD) < 1e-9]
+    sys.exit(1 if configured and configured[0]["false_hits"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+토크나이저 벤치마크: 기존 RAGSystem.tokenize vs tokenizer.Tokenizer (모드별, 병렬)
+
+    python -m benchmarks.tokenizer_bench --documents 20000
+"""
+
+import re
+import time
+import argparse
+
+from tokenizer import Tokenizer, tokenize_many
+from benchmarks.common import make_markdown_documents, save_json
+
+
+def legacy_tokenize(text):
+    """기존 RAGSystem.tokenize (컴파일하지 않은 정규식 4회 + 토큰별 re.sub)"""
+    text = re.sub(r'---.*?---', '', text, flags=re.DOTALL)
+    text = re.sub(r'#+ ', '', text)
+    text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
+    text = re.sub(r'\*(.*?)\*', r'\1', text)
+
+    tokens = text.lower().split()
+    cleaned = []
+    for token in tokens:
+        clean = re.sub(r'[^\w가-힣]', '', token)
+        if len(clean) > 1:
+            cleaned.append(clean)
+    return cleaned
+
+
+def measure(fn, documents):
+    start = time.perf_counter()
+    tokenized = fn(documents)
+    elapsed = time.perf_counter() - start
+    tokens = sum(len(tokens) for tokens in tokenized)
+    return tokenized, {
+        "seconds": elapsed,
+        "tokens": tokens,
+        "docs_per_sec": len(documents) / elapsed,
+        "tokens_per_sec": tokens / elapsed
+    }
+
+
+def run(n_docs, words_per_doc, workers):
+    documents = make_markdown_documents(n_docs, words_per_doc)
+    # 강조/인라인 기호가 섞인 경우도 검증
+    documents += [f"**{doc[:200]}** *강조* `code` a## b #태그 -- {doc[-100:]}" for doc in documents[:200]]
+    report = {"documents": len(documents), "words_per_doc": words_per_doc, "results": {}}
+
+    expected, report["results"]["legacy"] = measure(lambda docs: [legacy_tokenize(d) for d in docs], documents)
+
+    whitespace = Tokenizer("whitespace")
+    actual, report["results"]["whitespace"] = measure(lambda docs: [whitespace.tokenize(d) for d in docs], documents)
+    if actual != expected:
+        raise AssertionError("whitespace 모드 토큰이 기존 토크나이저와 다릅니다.")
+
+    _, report["results"]["whitespace_parallel"] = measure(
+        lambda docs: tokenize_many(docs, whitespace, workers=workers, min_parallel=0), documents)
+
+    for mode in ("ngram", "morph"):
+        tokenizer = Tokenizer(mode)
+        if tokenizer.mode != mode:
+            continue
+        _, report["results"][mode] = measure(lambda docs: [tokenizer.tokenize(d) for d in docs], documents)
+
+    base = report["results"]["legacy"]["tokens_per_sec"]
+    for name, row in report["results"].items():
+        row["speedup"] = row["tokens_per_sec"] / base
+        print(f"{name:>20} | {row['docs_per_sec']:>10.0f} 문서/초 | {row['tokens_per_sec']:>12.0f} 토큰/초 "
+              f"| {row['speedup']:.2f}x")
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BM25 토크나이저 처리량 벤치마크")
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--words-per-doc", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=0, help="병렬 처리 프로세스 수 (0: CPU 수)")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args.documents, args.words_per_doc, args.workers)
+    if args.output:
+        save_json(args.output, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+벡터 검색 벤치마크: 로컬 인덱스(exact float32/float16, IVF, HNSW) 재현율과 지연 시간
+
+float32 정확 검색 결과를 정답으로 recall@k를 계산합니다. Pinecone 키가 설정되어 있고
+--pinecone을 주면 실제 Pinecone 인덱스의 질의 지연 시간도 함께 측정합니다.
+
+    python -m benchmarks.vector_bench --sizes 10000 100000 --dimension 768
+"""
+
+import time
+import argparse
+
+import numpy as np
+
+from vector_store import LocalVectorStore
+from benchmarks.common import latency_summary, save_json, time_calls
+
+
+def make_vectors(n: int, dimension: int, clusters: int = 200, seed: int = 0) -> np.ndarray:
+    """군집 구조가 있는 합성 임베딩 (실제 문서 임베딩처럼 주제별로 모임)"""
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dimension)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.6 * rng.standard_normal((n, dimension)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def make_queries(vectors: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    """코퍼스 벡터 근처의 질의 (문서와 비슷하지만 같지 않은 질문)"""
+    rng = np.random.default_rng(seed)
+    base = vectors[rng.integers(0, len(vectors), size=n_queries)]
+    queries = base + 0.3 * rng.standard_normal(base.shape).astype(np.float32) / np.sqrt(vectors.shape[1])
+    return queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+
+def build_store(vectors: np.ndarray, **options) -> LocalVectorStore:
+    store = LocalVectorStore(**options)
+    store.upsert([(str(i), vector, {}) for i, vector in enumerate(vectors)])
+    return store
+
+
+def ids_of(store: LocalVectorStore, query: np.ndarray, top_k: int):
+    return [match["id"] for match in store.query(query, top_k=top_k)["matches"]]
+
+
+def run(sizes, dimension, n_queries, top_k, nprobes, pinecone):
+    try:
+        import hnswlib  # noqa: F401
+        has_hnsw = True
+    except ImportError:
+        has_hnsw = False
+
+    report = {"dimension": dimension, "top_k": top_k, "queries": n_queries, "results": []}
+    for size in sizes:
+        vectors = make_vectors(size, dimension)
+        queries = make_queries(vectors, n_queries)
+
+        reference = build_store(vectors, dtype="float32", method="exact")
+        truth = [set(ids_of(reference, query, top_k)) for query in queries]
+
+        configs = [("exact-float32", {"dtype": "float32", "method": "exact"}),
+                   ("exact-float16", {"dtype": "float16", "method": "exact"})]
+        configs += [(f"ivf-nprobe{nprobe}", {"dtype": "float16", "method": "ivf", "nprobe": nprobe})
+                    for nprobe in nprobes]
+        if has_hnsw:
+            configs.append(("hnsw", {"dtype": "float32", "method": "hnsw"}))
+
+        for name, options in configs:
+            store = reference if name == "exact-float32" else build_store(vectors, **options)
+            start = time.perf_counter()
+            store._ensure_index()
+            build_s = time.perf_counter() - start
+
+            recall = np.mean([len(truth[i] & set(ids_of(store, query, top_k))) / top_k
+                              for i, query in enumerate(queries)])
+            latency = latency_summary(time_calls(lambda q: store.query(q, top_k=top_k), list(queries)))
+            row = {"vectors": size, "index": name, "recall": float(recall), "build_s": build_s,
+                   "memory_mb": store.memory_bytes() / 1e6, **latency}
+            report["results"].append(row)
+            print(f"{size:>7}개 | {name:<15} | recall@{top_k} {recall:.3f} | p50 {latency['p50_ms']:.3f}ms "
+                  f"p95 {latency['p95_ms']:.3f}ms | 구축 {build_s:.2f}초 | {row['memory_mb']:.1f}MB")
+
+    if pinecone:
+        report["pinecone"] = measure_pinecone(n_queries, top_k)
+    return report
+
+
+def measure_pinecone(n_queries: int, top_k: int):
+    """실제 Pinecone 인덱스 질의 지연 시간 (네트워크 왕복 포함)"""
+    from config import Config
+    from vector_store import PineconeVectorStore
+
+    store = PineconeVectorStore(Config.PINECONE_API_KEY, Config.PINECONE_INDEX_NAME)
+    dimension = int(store.describe_index_stats()["dimension"])
+    queries = make_queries(make_vectors(1000, dimension), n_queries)
+    latency = latency_summary(time_calls(lambda q: store.query(q.tolist(), top_k=top_k), list(queries)))
+    print(f"Pinecone | p50 {latency['p50_ms']:.1f}ms p95 {latency['p95_ms']:.1f}ms")
+    return latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 벡터 인덱스 재현율/지연 시간 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--dimension", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--top-k", type=int, default=15)
+    parser.add_argument("--nprobes", type=int, nargs="+", default=[4, 8, 16])
+    parser.add_argument("--pinecone", action="store_true", help="실제 Pinecone 지연 시간도 측정")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    args = parser.parse_args()
+
+    report = run(args.sizes, args.dimension, args.queries, args.top_k, args.nprobes, args.pinecone)
+    if args.output:
+        save_json(args.output, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import logging
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BM25Index:
+    """CSR 형태의 역색인을 사용하는 벡터화 BM25 (Okapi)
+
+    단어별 포스팅(문서 ID, 단어 빈도)을 `indptr`로 구분된 연속 배열에 저장하고,
+    IDF와 문서 길이 정규화 항을 색인 시점에 미리 계산해 포스팅별 기여도(impact)로
+    보관합니다. 질의 시에는 질의 단어의 포스팅만 NumPy로 누적하고 상위 k개는
+    argpartition으로 부분 선택합니다. 점수는 `rank_bm25.BM25Okapi`와 동일한
+    공식(음수 IDF는 epsilon * 평균 IDF로 대체)을 따릅니다.
+    """
+
+    def __init__(self, corpus: Optional[Iterable[Sequence[str]]] = None,
+                 k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25):
+        """
+        Args:
+            corpus: 토크나이즈된 문서 목록
+            k1: 단어 빈도 포화 파라미터
+            b: 문서 길이 정규화 파라미터
+            epsilon: 음수 IDF 하한 계수
+        """
+        self.k1 = k1
+        self.b = b
+        self.epsilon = epsilon
+
+        self.vocab: Dict[str, int] = {}
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.postings = np.zeros(0, dtype=np.int32)
+        self.term_freqs = np.zeros(0, dtype=np.int32)
+        self.impacts = np.zeros(0, dtype=np.float32)
+        self.doc_len = np.zeros(0, dtype=np.int32)
+        self.idf = np.zeros(0, dtype=np.float64)
+        self.avgdl = 0.0
+
+        if corpus is not None:
+            self.build(corpus)
+
+    # 스냅샷 저장/복원 대상 배열
+    ARRAY_FIELDS = ("indptr", "postings", "term_freqs", "impacts", "doc_len", "idf")
+
+    @classmethod
+    def from_arrays(cls, vocab: Dict[str, int], arrays: Dict[str, np.ndarray], avgdl: float,
+                    k1: float = 1.5, b: float = 0.75, epsilon: float = 0.25) -> "BM25Index":
+        """미리 계산된 배열(메모리 맵 포함)로 색인 복원 (재계산 없음)"""
+        index = cls(k1=k1, b=b, epsilon=epsilon)
+        index.vocab = vocab
+        for field in cls.ARRAY_FIELDS:
+            setattr(index, field, arrays[field])
+        index.avgdl = avgdl
+        return index
+
+    @property
+    def corpus_size(self) -> int:
+        return len(self.doc_len)
+
+    def build(self, corpus: Iterable[Sequence[str]]):
+        """토크나이즈된 문서들로 역색인 구축"""
+        vocab: Dict[str, int] = {}
+        term_ids: List[int] = []
+        doc_ids: List[int] = []
+        freqs: List[int] = []
+        doc_len: List[int] = []
+
+        for doc_id, tokens in enumerate(corpus):
+            doc_len.append(len(tokens))
+            for term, freq in Counter(tokens).items():
+                term_id = vocab.setdefault(term, len(vocab))
+                term_ids.append(term_id)
+                doc_ids.append(doc_id)
+                freqs.append(freq)
+
+        self.vocab = vocab
+        self.doc_len = np.asarray(doc_len, dtype=np.int32)
+
+        # 단어 ID 기준으로 정렬하여 CSR 구성 (stable 정렬로 문서 순서 유지)
+        term_array = np.asarray(term_ids, dtype=np.int64)
+        order = np.argsort(term_array, kind="stable")
+        self.postings = np.asarray(doc_ids, dtype=np.int32)[order]
+        self.term_freqs = np.asarray(freqs, dtype=np.int32)[order]
+        doc_freqs = np.bincount(term_array, minlength=len(vocab))
+        self.indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(doc_freqs, out=self.indptr[1:])
+
+        self._compute_weights(doc_freqs)
+        logger.info(f"BM25 역색인 구축 완료: {self.corpus_size}개 문서, {len(vocab)}개 단어, "
+                    f"{len(self.postings)}개 포스팅")
+
+    def _compute_weights(self, doc_freqs: np.ndarray):
+        """IDF, 문서 길이 정규화 항, 포스팅별 기여도 계산"""
+        n_docs = self.corpus_size
+        self.avgdl = float(self.doc_len.sum()) / n_docs if n_docs else 0.0
+
+        doc_freqs = doc_freqs.astype(np.float64)
+        idf = np.log(n_docs - doc_freqs + 0.5) - np.log(doc_freqs + 0.5)
+        if len(idf):
+            # BM25Okapi와 동일: 음수 IDF는 평균 IDF의 epsilon 배로 대체
+            average_idf = idf.sum() / len(idf)
+            idf[idf < 0] = self.epsilon * average_idf
+        self.idf = idf
+
+        if n_docs == 0 or self.avgdl == 0:
+            self.impacts = np.zeros(len(self.postings), dtype=np.float32)
+            return
+
+        norms = self.k1 * (1 - self.b + self.b * self.doc_len / self.avgdl)
+        term_of_posting = np.repeat(np.arange(len(idf)), np.diff(self.indptr))
+        tf = self.term_freqs.astype(np.float64)
+        impacts = idf[term_of_posting] * tf * (self.k1 + 1) / (tf + norms[self.postings])
+        self.impacts = impacts.astype(np.float32)
+
+    def _query_terms(self, query_tokens: Sequence[str]) -> List[Tuple[int, int]]:
+        """질의 단어를 (단어 ID, 등장 횟수)로 변환 (사전에 없는 단어는 제외)"""
+        terms = []
+        for term, count in Counter(query_tokens).items():
+            term_id = self.vocab.get(term)
+            if term_id is not None:
+                terms.append((term_id, count))
+        return terms
+
+    def get_scores(self, query_tokens: Sequence[str]) -> np.ndarray:
+        """전체 문서에 대한 BM25 점수 (BM25Okapi.get_scores 호환)"""
+        scores = np.zeros(self.corpus_size, dtype=np.float64)
+        for term_id, count in self._query_terms(query_tokens):
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            # 한 단어의 포스팅 내 문서 ID는 중복이 없으므로 fancy index 누적이 안전
+            scores[self.postings[start:end]] += self.impacts[start:end] * count
+        return scores
+
+    def top_k(self, query_tokens: Sequence[str], k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        점수가 양수인 상위 k개 문서 반환
+
+        Returns:
+            (문서 인덱스 배열, 점수 배열) - 점수 내림차순
+        """
+        terms = self._query_terms(query_tokens)
+        if not terms or k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+
+        if len(terms) == 1:
+            # 단일 단어 질의는 포스팅 자체가 후보 집합
+            term_id, count = terms[0]
+            start, end = self.indptr[term_id], self.indptr[term_id + 1]
+            candidates = self.postings[start:end].astype(np.int64)
+            candidate_scores = self.impacts[start:end].astype(np.float64) * count
+        else:
+            scores = self.get_scores(query_tokens)
+            candidates = np.flatnonzero(scores > 0)
+            candidate_scores = scores[candidates]
+
+        positive = candidate_scores > 0
+        candidates, candidate_scores = candidates[positive], candidate_scores[positive]
+        if len(candidates) > k:
+            top = np.sort(np.argpartition(-candidate_scores, k - 1)[:k])
+            candidates, candidate_scores = candidates[top], candidate_scores[top]
+        order = np.argsort(-candidate_scores, kind="stable")
+        return candidates[order], candidate_scores[order]
+
+    def top_k_batch(self, queries: Sequence[Sequence[str]], k: int,
+                    chunk_size: int = 256) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        여러 질의를 (질의 × 문서) 점수 행렬로 한 번에 계산하여 질의별 상위 k개 반환
+
+        질의 묶음에 등장하는 단어마다 포스팅을 한 번만 읽어 해당 단어를 포함한 모든
+        질의 행에 누적합니다. 행렬의 열은 후보 문서로만 구성하며, 메모리 사용량을
+        제한하기 위해 chunk_size 질의씩 처리합니다.
+        """
+        results: List[Tuple[np.ndarray, np.ndarray]] = []
+        empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64))
+        for chunk_start in range(0, len(queries), chunk_size):
+            chunk = queries[chunk_start:chunk_start + chunk_size]
+
+            # 단어 ID → [(행, 등장 횟수)] 역매핑
+            rows_by_term: Dict[int, List[Tuple[int, int]]] = {}
+            for row, tokens in enumerate(chunk):
+                for term_id, count in self._query_terms(tokens):
+                    rows_by_term.setdefault(term_id, []).append((row, count))
+
+            if not rows_by_term or k <= 0:
+                results.extend([empty] * len(chunk))
+                continue
+
+            # 열은 질의 단어가 등장하는 문서만으로 압축 (전체 문서 수와 무관한 행렬 크기)
+            term_ids = list(rows_by_term)
+            slices = [(self.indptr[t], self.indptr[t + 1]) for t in term_ids]
+            columns, inverse = np.unique(
+                np.concatenate([self.postings[start:end] for start, end in slices]),
+                return_inverse=True
+            )
+            scores = np.zeros((len(chunk), len(columns)), dtype=np.float64)
+            offset = 0
+            for term_id, (start, end) in zip(term_ids, slices):
+                row_counts = rows_by_term[term_id]
+                cols = inverse[offset:offset + (end - start)]
+                offset += end - start
+                rows = np.asarray([row for row, _ in row_counts])
+                counts = np.asarray([count for _, count in row_counts], dtype=np.float64)
+                impacts = self.impacts[start:end].astype(np.float64)
+                scores[np.ix_(rows, cols)] += counts[:, None] * impacts[None, :]
+
+            kth = min(k, len(columns))
+            top = np.argpartition(-scores, kth - 1, axis=1)[:, :kth]
+            top.sort(axis=1)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            for row in range(len(chunk)):
+                order = np.argsort(-top_scores[row], kind="stable")
+                candidates, candidate_scores = columns[top[row][order]], top_scores[row][order]
+                positive = candidate_scores > 0
+                results.append((candidates[positive].astype(np.int64), candidate_scores[positive]))
+        return results
+
+    def memory_bytes(self) -> int:
+        """색인 배열이 차지하는 메모리 (사전 제외)"""
+        return int(sum(getattr(self, field).nbytes for field in self.ARRAY_FIELDS))
+
@@ -0,0 +1,496 @@
+import os
+import re
+import json
+import time
+import atexit
+import sqlite3
+import hashlib
+import logging
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_query(text: str) -> str:
+    """캐시 키용 질의 정규화 (유니코드 NFC, 공백 정리)"""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class TTLCache:
+    """크기 제한(LRU)과 만료 시간(TTL)을 가진 스레드 안전 캐시
+
+    `get`이 성공하면 항목이 가장 최근 사용 위치로 이동하고, 용량을 넘기면
+    가장 오래 사용되지 않은 항목부터 제거합니다. 만료 시각은 벽시계 기준이므로
+    디스크에 저장했다가 다시 불러와도 TTL이 유지됩니다.
+    """
+
+    def __init__(self, max_size: int = 100, ttl: Optional[float] = 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_size: 최대 항목 수
+            ttl: 만료 시간 (초, None이면 만료 없음)
+            clock: 현재 시각 함수 (테스트용 주입)
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.clock = clock
+        self._data: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry)
+
+    def _expired(self, entry: Tuple[Any, float]) -> bool:
+        return self.ttl is not None and self.clock() - entry[1] > self.ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if self._expired(entry):
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any, created_at: Optional[float] = None):
+        with self._lock:
+            self._data[key] = (value, self.clock() if created_at is None else created_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def items(self):
+        """만료되지 않은 (키, 값, 생성 시각) 목록 (오래된 순)"""
+        with self._lock:
+            return [(key, value, created_at) for key, (value, created_at) in self._data.items()
+                    if not self._expired((value, created_at))]
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+
+class EmbeddingCache:
+    """질의 임베딩 캐시 (키: 모델명 + 접두사 + 정규화된 질의)
+
+    `path`를 지정하면 `.npz` 파일로 저장/복원하여 빠른 질문처럼 반복되는 질의의
+    임베딩이 재시작 후에도 유지됩니다. 저장은 `persist_every`번의 신규 항목마다,
+    그리고 프로세스 종료 시 수행됩니다.
+    """
+
+    def __init__(self, model_name: str, max_size: int = 100, ttl: Optional[float] = 3600,
+                 path: Optional[str] = None, persist_every: int = 20):
+        """
+        Args:
+            model_name: 임베딩 모델 이름 (다른 모델의 벡터와 섞이지 않도록 키에 포함)
+            max_size: 최대 항목 수
+            ttl: 만료 시간 (초)
+            path: 영속화 파일 경로 (None이면 메모리 전용)
+            persist_every: 자동 저장 주기 (신규 항목 수)
+        """
+        self.model_name = model_name
+        self.path = path
+        self.persist_every = persist_every
+        self.cache = TTLCache(max_size=max_size, ttl=ttl)
+        self._unsaved = 0
+        self._save_lock = threading.Lock()
+
+        if path:
+            self.load()
+            atexit.register(self.save)
+
+    def _key(self, text: str, prefix: str) -> Tuple[str, str, str]:
+        return (self.model_name, prefix, normalize_query(text))
+
+    def get_or_compute(self, text: str, prefix: str,
+                       compute: Callable[[str], np.ndarray]) -> np.ndarray:
+        """
+        캐시된 임베딩 반환, 없으면 계산 후 저장
+
+        Args:
+            text: 원문 질의
+            prefix: E5 접두사 ("query: " 등)
+            compute: 정규화된 전체 입력(접두사 포함)을 임베딩하는 함수
+        """
+        key = self._key(text, prefix)
+        vector = self.cache.get(key)
+        if vector is not None:
+            return vector
+
+        vector = compute(prefix + key[2])
+        self.cache.set(key, vector)
+        if self.path:
+            self._unsaved += 1
+            if self._unsaved >= self.persist_every:
+                self.save()
+        return vector
+
+    def stats(self) -> Dict[str, Any]:
+        return self.cache.stats()
+
+    def save(self):
+        """캐시를 파일로 저장 (임시 파일에 쓴 뒤 교체)"""
+        if not self.path:
+            return
+        with self._save_lock:
+            entries = [(key, value, created_at) for key, value, created_at in self.cache.items()
+                       if key[0] == self.model_name]
+            if not entries:
+                return
+            tmp_path = f"{self.path}.tmp-{os.getpid()}.npz"
+            try:
+                np.savez(
+                    tmp_path,
+                    prefixes=np.asarray([key[1] for key, _, _ in entries]),
+                    texts=np.asarray([key[2] for key, _, _ in entries]),
+                    vectors=np.vstack([value for _, value, _ in entries]),
+                    created_at=np.asarray([created_at for _, _, created_at in entries]),
+                    model_name=np.asarray(self.model_name)
+                )
+                os.replace(tmp_path, self.path)
+                self._unsaved = 0
+            except OSError as e:
+                logger.warning(f"임베딩 캐시 저장 실패: {e}")
+
+    def load(self):
+        """파일에서 캐시 복원 (모델이 다르거나 만료된 항목은 무시)"""
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with np.load(self.path, allow_pickle=False) as data:
+                if str(data["model_name"]) != self.model_name:
+                    logger.info("임베딩 캐시 파일의 모델이 달라 무시합니다.")
+                    return
+                for prefix, text, vector, created_at in zip(
+                        data["prefixes"], data["texts"], data["vectors"], data["created_at"]):
+                    entry_key = (self.model_name, str(prefix), str(text))
+                    self.cache.set(entry_key, np.array(vector), created_at=float(created_at))
+            logger.info(f"임베딩 캐시 {len(self.cache)}개 항목 복원: {self.path}")
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"임베딩 캐시 로드 실패: {e}")
+
+
+class SQLiteCache:
+    """여러 워커 프로세스가 공유하는 SQLite 기반 영속 캐시 계층 (JSON 값)"""
+
+    def __init__(self, path: str, max_size: int = 1000, ttl: Optional[float] = 3600):
+        """
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            max_size: 최대 항목 수 (초과 시 오래된 항목부터 삭제)
+            ttl: 만료 시간 (초)
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "version TEXT, created_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS cache_created_at ON cache(created_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간 공유할 수 없으므로 스레드별로 유지
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        row = self._connect().execute(
+            "SELECT value, created_at FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        if self.ttl is not None and time.time() - row[1] > self.ttl:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+            return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, version: Optional[str] = None):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, version, created_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), version, time.time())
+            )
+            conn.execute(
+                "DELETE FROM cache WHERE key IN (SELECT key FROM cache "
+                "ORDER BY created_at DESC LIMIT -1 OFFSET ?)", (self.max_size,)
+            )
+
+    def invalidate(self, keep_version: Optional[str] = None) -> int:
+        """keep_version이 아닌 항목 삭제 (None이면 전체 삭제), 삭제 수 반환"""
+        with self._connect() as conn:
+            if keep_version is None:
+                cursor = conn.execute("DELETE FROM cache")
+            else:
+                cursor = conn.execute(
+                    "DELETE FROM cache WHERE version IS NULL OR version != ?", (keep_version,)
+                )
+            return cursor.rowcount
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+
+
+class AnswerCache:
+    """rag_query 전체 결과 캐시
+
+    키는 정규화된 질의, 검색 가중치, final_top_k, GPT 모델, 코퍼스 버전(인덱스 지문)으로
+    구성됩니다. 프로세스 내 LRU+TTL 계층 앞단에서 먼저 조회하고, `db_path`를 지정하면
+    여러 워커가 공유하는 SQLite 계층을 추가로 사용합니다.
+    """
+
+    def __init__(self, max_size: int = 100, ttl: Optional[float] = 3600,
+                 db_path: Optional[str] = None, db_max_size: int = 1000):
+        """
+        Args:
+            max_size: 메모리 계층 최대 항목 수
+            ttl: 만료 시간 (초)
+            db_path: SQLite 계층 파일 경로 (None이면 메모리 전용)
+            db_max_size: SQLite 계층 최대 항목 수
+        """
+        self.memory = TTLCache(max_size=max_size, ttl=ttl)
+        self.persistent = SQLiteCache(db_path, max_size=db_max_size, ttl=ttl) if db_path else None
+        self.persistent_hits = 0
+
+    @staticmethod
+    def make_key(query: str, vector_weight: float, bm25_weight: float, final_top_k: int,
+                 model: str, corpus_version: Optional[str], fusion: str = "weighted") -> str:
+        payload = json.dumps([
+            normalize_query(query),
+            round(float(vector_weight), 4),
+            round(float(bm25_weight), 4),
+            int(final_top_k),
+            model,
+            corpus_version or "",
+            fusion
+        ], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        result = self.memory.get(key)
+        if result is not None:
+            return result
+        if self.persistent is not None:
+            try:
+                result = self.persistent.get(key)
+            except sqlite3.Error as e:
+                logger.warning(f"답변 캐시(SQLite) 조회 실패: {e}")
+                return None
+            if result is not None:
+                self.persistent_hits += 1
+                self.memory.set(key, result)
+        return result
+
+    def set(self, key: str, result: Dict[str, Any], corpus_version: Optional[str] = None):
+        self.memory.set(key, result)
+        if self.persistent is not None:
+            try:
+                self.persistent.set(key, result, version=corpus_version)
+            except sqlite3.Error as e:
+                logger.warning(f"답변 캐시(SQLite) 저장 실패: {e}")
+
+    def invalidate(self, keep_version: Optional[str] = None):
+        """
+        캐시 무효화 (인덱스 변경 시 호출)
+
+        Args:
+            keep_version: 유지할 코퍼스 버전 (None이면 전체 삭제)
+        """
+        self.memory.clear()
+        if self.persistent is not None:
+            removed = self.persistent.invalidate(keep_version)
+            logger.info(f"답변 캐시 무효화: SQLite {removed}개 항목 삭제")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = self.memory.stats()
+        stats["persistent_hits"] = self.persistent_hits
+        if self.persistent is not None:
+            stats["persistent_size"] = len(self.persistent)
+        return stats
+
+
+class SemanticCache:
+    """질의 임베딩 유사도 기반 답변 캐시 (표현만 다른 같은 질문 재사용)
+
+    지난 질의의 정규화된 임베딩을 float16 행렬(max_size × 차원)에 모아 두고, 새 질의
+    임베딩과의 내적(코사인 유사도)을 한 번에 계산해 가장 가까운 항목이 `threshold`
+    이상이면 그 결과를 돌려줍니다. 검색 설정/모델/코퍼스 버전이 다른 항목은 `scope`로
+    구분해 비교하지 않습니다. 가득 차면 가장 오래 사용되지 않은 항목을 덮어씁니다.
+    """
+
+    def __init__(self, max_size: int = 500, threshold: float = 0.95, ttl: Optional[float] = 3600,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            max_size: 최대 항목 수 (행렬 행 수)
+            threshold: 적중으로 볼 최소 코사인 유사도
+            ttl: 만료 시간 (초, None이면 만료 없음)
+            clock: 현재 시각 함수 (테스트용 주입)
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        self.clock = clock
+        self._vectors: Optional[np.ndarray] = None  # 첫 항목의 차원으로 생성
+        self._scopes = np.zeros(max_size, dtype=np.int64)
+        self._used = np.zeros(max_size, dtype=np.int64)  # LRU 순번 (0: 빈 칸)
+        self._created = np.zeros(max_size, dtype=np.float64)
+        self._queries: list = [None] * max_size
+        self._results: list = [None] * max_size
+        self._size = 0  # 사용한 적 있는 행 수 (이후 행은 비교하지 않음)
+        self._tick = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _scope_id(scope: str) -> int:
+        return int.from_bytes(hashlib.blake2b(scope.encode("utf-8"), digest_size=7).digest(), "big")
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._used[:self._size]))
+
+    def _touch(self, slot: int):
+        self._tick += 1
+        self._used[slot] = self._tick
+
+    def _clear_slot(self, slot: int):
+        self._used[slot] = 0
+        self._queries[slot] = None
+        self._results[slot] = None
+
+    def lookup(self, vector: np.ndarray, scope: str) -> Optional[Tuple[Any, float, str]]:
+        """
+        가장 가까운 지난 질의의 결과 조회
+
+        Args:
+            vector: 정규화된 질의 임베딩
+            scope: 비교 범위 (검색 설정/모델/코퍼스 버전 등, 같은 값끼리만 비교)
+
+        Returns:
+            (결과, 유사도, 캐시된 질의) - threshold 미만이면 None
+        """
+        with self._lock:
+            best = None
+            if self._vectors is not None and self._size:
+                n = self._size
+                candidates = (self._used[:n] > 0) & (self._scopes[:n] == self._scope_id(scope))
+                if self.ttl is not None and candidates.any():
+                    expired = candidates & (self.clock() - self._created[:n] > self.ttl)
+                    for slot in np.flatnonzero(expired):
+                        self._clear_slot(slot)
+                        self.expirations += 1
+                    candidates &= ~expired
+                if candidates.any():
+                    # float16 그대로 곱하고 float32로 누적 (행렬 전체를 변환하지 않음)
+                    similarities = np.einsum("ij,j->i", self._vectors[:n],
+                                             vector.astype(np.float16), dtype=np.float32)
+                    similarities[~candidates] = -np.inf
+                    slot = int(np.argmax(similarities))
+                    if similarities[slot] >= self.threshold:
+                        best = (self._results[slot], float(similarities[slot]), self._queries[slot])
+                        self._touch(slot)
+            if best is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            return best
+
+    def add(self, vector: np.ndarray, scope: str, query: str, result: Any):
+        """결과 저장 (같은 범위에 같은 질의가 있으면 교체, 가득 차면 LRU 항목 제거)"""
+        query = normalize_query(query)
+        scope_id = self._scope_id(scope)
+        with self._lock:
+            if self._vectors is None:
+                self._vectors = np.zeros((self.max_size, len(vector)), dtype=np.float16)
+            n = self._size
+            same = [slot for slot in np.flatnonzero((self._used[:n] > 0) & (self._scopes[:n] == scope_id))
+                    if self._queries[slot] == query]
+            if same:
+                slot = same[0]
+            elif n < self.max_size:
+                slot = n
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._used))
+                if self._used[slot]:
+                    self.evictions += 1
+            self._vectors[slot] = vector
+            self._scopes[slot] = scope_id
+            self._created[slot] = self.clock()
+            self._queries[slot] = query
+            self._results[slot] = result
+            self._touch(slot)
+
+    def clear(self):
+        with self._lock:
+            self._used[:] = 0
+            self._queries = [None] * self.max_size
+            self._results = [None] * self.max_size
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "max_size": self.max_size,
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / total if total else 0.0,
+            "memory_bytes": 0 if self._vectors is None else int(self._vectors.nbytes)
+        }
@@ -0,0 +1,166 @@
+"""
+마크다운 문서 청킹
+
+문서를 제목(#) 단위 섹션으로 나눈 뒤, 각 섹션을 토큰 수 상한이 있는 슬라이딩
+윈도우(문단/문장 단위, 앞 청크와 일부 겹침)로 분할합니다. 청크 본문 앞에는 제목
+경로("회사 소개 > 연혁")를 붙여 검색과 답변 생성 모두에서 문맥을 유지합니다.
+"""
+
+import re
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# 문서 맨 앞 YAML front matter
+_FRONT_MATTER = re.compile(r'\A\s*---\n.*?\n---[ \t]*\n?', re.DOTALL)
+_HEADING = re.compile(r'^(#{1,6})[ \t]+(.+?)[ \t#]*$')
+# 문단 안의 문장 경계 (마침표/물음표/느낌표 + 공백, 줄바꿈)
+_SENTENCE_END = re.compile(r'(?<=[.!?。])\s+|\n')
+# tiktoken이 없을 때의 근사 토큰: 한글 음절 1개, 그 밖의 단어 1개, 기호 1개
+_APPROX_TOKEN = re.compile(r'[가-힣]|[^\W가-힣]+|[^\w\s]')
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # 미설치 또는 인코딩 파일을 받을 수 없는 환경
+    _ENCODING = None
+
+
+def count_tokens(text: str) -> int:
+    """GPT 토큰 수 (tiktoken이 없으면 근사값)"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def content_hash(text: str) -> str:
+    """문서 내용 해시 (청크 ID에 포함되어 내용이 바뀌면 인덱스 지문도 바뀜)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+def chunk_id(filename: str, index: int, digest: Optional[str] = None) -> str:
+    """청크 ID (벡터 ID와 문서 저장소 키로 사용, 예: "연혁.md#3f2a9c01b7de#0")"""
+    if digest:
+        return f"{filename}#{digest}#{index}"
+    return f"{filename}#{index}"
+
+
+class MarkdownChunker:
+    """제목 기준 섹션 분할 + 토큰 상한 슬라이딩 윈도우 청커"""
+
+    def __init__(self, max_tokens: int = 400, overlap_tokens: int = 50):
+        """
+        Args:
+            max_tokens: 청크당 최대 토큰 수 (제목 경로 제외)
+            overlap_tokens: 이웃한 청크가 겹치는 최대 토큰 수
+        """
+        if overlap_tokens >= max_tokens:
+            raise ValueError("overlap_tokens는 max_tokens보다 작아야 합니다.")
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+
+    @property
+    def name(self) -> str:
+        """청커 식별자 (설정 변경 시 스냅샷 무효화)"""
+        return f"md-heading-{self.max_tokens}-{self.overlap_tokens}-v2"
+
+    def split(self, text: str) -> List[Dict[str, Any]]:
+        """
+        문서를 청크로 분할
+
+        Returns:
+            청크 목록 (index, heading, text, tokens)
+        """
+        chunks = []
+        for heading, body in self._sections(_FRONT_MATTER.sub('', text, count=1)):
+            prefix = f"{heading}\n" if heading else ""
+            for window in self._windows(body):
+                chunks.append({
+                    "index": len(chunks),
+                    "heading": heading,
+                    "text": prefix + window,
+                    "tokens": count_tokens(window)
+                })
+        return chunks
+
+    def _sections(self, text: str) -> List[Tuple[str, str]]:
+        """(제목 경로, 본문) 목록"""
+        sections = []
+        path: List[Tuple[int, str]] = []
+        lines: List[str] = []
+
+        def flush():
+            body = "\n".join(lines).strip()
+            if body:
+                sections.append((" > ".join(title for _, title in path), body))
+            lines.clear()
+
+        for line in text.splitlines():
+            match = _HEADING.match(line)
+            if not match:
+                lines.append(line)
+                continue
+            flush()
+            level = len(match.group(1))
+            while path and path[-1][0] >= level:
+                path.pop()
+            path.append((level, match.group(2)))
+        flush()
+        return sections
+
+    def _units(self, body: str) -> List[Tuple[str, int]]:
+        """윈도우를 구성하는 단위 (문단, 너무 길면 문장, 그래도 길면 단어 묶음)와 토큰 수"""
+        units = []
+        for paragraph in re.split(r'\n\s*\n', body):
+            paragraph = paragraph.strip()
+            if not paragraph:
+                continue
+            tokens = count_tokens(paragraph)
+            if tokens <= self.max_tokens:
+                units.append((paragraph, tokens))
+                continue
+            for sentence in _SENTENCE_END.split(paragraph):
+                sentence = sentence.strip()
+                if not sentence:
+                    continue
+                tokens = count_tokens(sentence)
+                if tokens <= self.max_tokens:
+                    units.append((sentence, tokens))
+                else:
+                    units.extend(self._split_words(sentence))
+        return units
+
+    def _split_words(self, text: str) -> List[Tuple[str, int]]:
+        """문장 하나가 상한을 넘으면 단어 단위로 자름"""
+        pieces, words, tokens = [], [], 0
+        for word in text.split():
+            word_tokens = count_tokens(word)
+            if words and tokens + word_tokens > self.max_tokens:
+                pieces.append((" ".join(words), tokens))
+                words, tokens = [], 0
+            words.append(word)
+            tokens += word_tokens
+        if words:
+            pieces.append((" ".join(words), tokens))
+        return pieces
+
+    def _windows(self, body: str) -> List[str]:
+        """단위를 상한까지 채우고, 다음 윈도우는 끝부분 overlap_tokens만큼 겹쳐 시작"""
+        units = self._units(body)
+        windows = []
+        start = 0
+        while start < len(units):
+            end, tokens = start, 0
+            while end < len(units) and (end == start or tokens + units[end][1] <= self.max_tokens):
+                tokens += units[end][1]
+                end += 1
+            # 단위 사이를 빈 줄로 구분해 컨텍스트 구성 시 문단 경계로 쓰게 함
+            windows.append("\n\n".join(unit for unit, _ in units[start:end]))
+            if end >= len(units):
+                break
+            # 겹칠 단위 수 결정 (최소 한 단위는 전진)
+            next_start, overlap = end, 0
+            while next_start - 1 > start and overlap + units[next_start - 1][1] <= self.overlap_tokens:
+                next_start -= 1
+                overlap += units[next_start][1]
+            start = next_start
+        return windows
@@ -8,6 +8,8 @@ class Config:
     # 환경변수에서 API 키를 가져오거나 직접 설정
     PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+    # OpenAI 호환 엔드포인트 (미설정 시 기본 API, 로컬 테스트 서버 지정 가능)
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
     
     # === Pinecone 설정 ===
     PINECONE_INDEX_NAME = "rag-univera-pinecone-db"
@@ -16,12 +18,33 @@ class Config:
     PINECONE_CLOUD = "aws"
     PINECONE_REGION = "us-east-1"
     
+    # === 벡터 저장소 설정 ===
+    VECTOR_STORE = os.getenv("RAG_VECTOR_STORE", "pinecone")  # pinecone, local
+    LOCAL_VECTOR_DIR = os.getenv("RAG_LOCAL_VECTOR_DIR", ".rag_vectors")
+    LOCAL_VECTOR_DTYPE = "float32"     # 로컬 벡터 저장 자료형 (float32, float16: 메모리 절반, IVF 권장)
+    LOCAL_VECTOR_METHOD = "auto"       # auto, exact, ivf, hnsw(hnswlib 필요)
+    LOCAL_VECTOR_EXACT_MAX = 50000     # auto일 때 정확 검색을 사용할 최대 벡터 수
+    LOCAL_VECTOR_NPROBE = 8            # IVF 검색 클러스터 수
+    LOCAL_VECTOR_HNSW_EF = 64          # HNSW 검색 후보 수
+    
     # === 문서 경로 설정 ===
-    # Pinecone 기반으로 변경되어 로컬 문서 경로 불필요
-    # FOLDER_PATH = None  # 더 이상 사용하지 않음
+    # 검색은 벡터 저장소 기반이며, 로컬 문서 폴더는 수집(ingest.py)에만 사용
+    DATABASE_PATH = os.getenv("RAG_DATABASE_PATH")
+    
+    # === 문서 수집 설정 ===
+    INGEST_BATCH_SIZE = 32             # 임베딩 배치 크기
+    INGEST_WORKERS = 1                 # 임베딩 프로세스 수
+    INGEST_UPSERT_BATCH_SIZE = 100     # 업서트 요청당 벡터 수 (Pinecone 권장 최대 100)
+    INGEST_UPSERT_CONCURRENCY = 4      # 동시 업서트 요청 수
+    INGEST_MANIFEST_PATH = os.getenv("RAG_INGEST_MANIFEST", ".rag_ingest_manifest.json")
     
     # === 모델 설정 ===
     EMBEDDING_MODEL = "intfloat/multilingual-e5-base"
+    EMBEDDING_BACKEND = os.getenv("RAG_EMBEDDING_BACKEND", "torch")  # torch, torch-int8, onnx
+    EMBEDDING_THREADS = int(os.getenv("RAG_EMBEDDING_THREADS", "0"))  # 추론 스레드 수 (0: 기본값)
+    EMBEDDING_ONNX_PATH = os.getenv("RAG_EMBEDDING_ONNX_PATH")  # embedding_backend.py로 변환한 폴더
+    EMBEDDING_ONNX_FILE = os.getenv("RAG_EMBEDDING_ONNX_FILE")  # 예: onnx/model_qint8_avx2.onnx
+    EMBEDDING_MIN_COSINE = 0.99       # fp32 대비 허용 최소 코사인 일치도 (벤치마크 검증)
     GPT_MODEL = "gpt-4o-mini"
     MAX_TOKENS = 1000
     TEMPERATURE = 0.1
@@ -33,6 +56,56 @@ class Config:
     FINAL_TOP_K = 5           # 최종 선정 개수
     VECTOR_WEIGHT = 0.6       # 벡터 검색 가중치
     BM25_WEIGHT = 0.4         # BM25 검색 가중치
+    FUSION_METHOD = os.getenv("RAG_FUSION_METHOD", "weighted")  # weighted, rrf, zscore, combmnz
+    FUSION_RRF_K = 60         # RRF 순위 상수
+    
+    # === 청킹 설정 ===
+    CHUNK_MAX_TOKENS = 400       # 청크당 최대 토큰 수 (제목 경로 제외)
+    CHUNK_OVERLAP_TOKENS = 50    # 이웃 청크 간 겹침 토큰 수
+    CHUNKS_PER_DOCUMENT = 2      # 답변 컨텍스트에 넣을 문서당 최대 청크 수
+    
+    # === 컨텍스트 설정 ===
+    CONTEXT_TOKEN_BUDGET = 3000      # GPT 컨텍스트 최대 토큰 수 (점수 비율로 문서에 배분)
+    CONTEXT_DEDUP_THRESHOLD = 0.85   # 문단 중복 판정 자카드 유사도
+    
+    # === 토크나이저 설정 ===
+    TOKENIZER_MODE = os.getenv("RAG_TOKENIZER_MODE", "whitespace")  # whitespace, ngram, morph(kiwipiepy)
+    TOKENIZER_WORKERS = 0              # BM25 구축 시 토크나이징 프로세스 수 (0: CPU 수)
+    TOKENIZER_PARALLEL_MIN_DOCS = 2000 # 이 문서 수 이상일 때만 프로세스 풀 사용
+    
+    # === 동시 검색 설정 ===
+    CONCURRENT_RETRIEVAL = True   # 벡터/BM25 검색 동시 실행
+    RETRIEVAL_WORKERS = 8         # 검색 스레드 풀 크기 (세션 간 공유)
+    VECTOR_SEARCH_TIMEOUT = 5.0   # 벡터 검색 제한 시간 (초)
+    BM25_SEARCH_TIMEOUT = 2.0     # BM25 검색 제한 시간 (초)
+    
+    # === 코퍼스 로딩 설정 ===
+    CORPUS_PAGE_SIZE = 100        # 벡터 ID 나열 페이지 크기 (Pinecone 최대 100)
+    CORPUS_FETCH_BATCH_SIZE = 100 # 메타데이터 조회 배치 크기
+    DOCUMENT_COMPRESSION_LEVEL = 1  # 문서 본문 zlib 압축 레벨 (0: 압축 안 함)
+    
+    # === 스냅샷 설정 ===
+    ENABLE_SNAPSHOT = True    # 코퍼스/BM25 디스크 스냅샷 사용 여부
+    SNAPSHOT_DIR = os.getenv("RAG_SNAPSHOT_DIR", ".rag_snapshot")
+    
+    # === 일괄 처리 설정 ===
+    BATCH_CONCURRENCY = 8     # Pinecone/OpenAI 동시 요청 수
+    BATCH_MAX_RETRIES = 5     # 요청별 최대 재시도 (429/5xx/시간 초과)
+    BATCH_EMBED_SIZE = 64     # 임베딩 배치 크기
+    
+    # === 비동기 엔진 설정 ===
+    ASYNC_LLM_CONCURRENCY = 32      # OpenAI 동시 요청 상한 (엔진 전역, 요청 한도 보호)
+    ASYNC_VECTOR_CONCURRENCY = 64   # Pinecone 동시 질의 상한
+    HTTP_MAX_CONNECTIONS = 100      # 서비스별 HTTP 연결 풀 최대 연결 수
+    HTTP_MAX_KEEPALIVE = 32         # 재사용을 위해 유지할 유휴 연결 수
+    HTTP_TIMEOUT = 30.0             # 요청 제한 시간 (초)
+    # Pinecone 데이터 플레인 호스트 (미설정 시 describe_index로 조회)
+    PINECONE_INDEX_HOST = os.getenv("PINECONE_INDEX_HOST")
+    
+    # === API 서버 설정 ===
+    API_HOST = os.getenv("RAG_API_HOST", "0.0.0.0")
+    API_PORT = int(os.getenv("RAG_API_PORT", "8000"))
+    API_WORKERS = int(os.getenv("RAG_API_WORKERS", "1"))   # 워커 프로세스 수
     
     # === UI 설정 ===
     PAGE_TITLE = "유니베라 RAG 챗봇"
@@ -59,9 +132,37 @@ class Config:
     LOG_LEVEL = "INFO"
     LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
     
+    # === 지표 설정 ===
+    METRICS_PORT = int(os.getenv("RAG_METRICS_PORT", "0"))   # /metrics HTTP 포트 (0: 사용 안 함)
+    METRICS_FILE = os.getenv("RAG_METRICS_FILE")              # Prometheus 텍스트 파일 경로 (textfile collector)
+    METRICS_FILE_INTERVAL = 10.0      # 지표 파일 최소 갱신 간격 (초)
+    SHOW_TIMINGS = False              # 답변마다 단계별 소요 시간 표시 (화면에서 변경 가능)
+    
     # === 캐시 설정 ===
     CACHE_TTL = 3600  # 1시간 (초)
     MAX_CACHE_SIZE = 100
+    # 질의 임베딩 캐시 영속화 파일 (.npz, 미설정 시 메모리 전용)
+    EMBEDDING_CACHE_PATH = os.getenv("RAG_EMBEDDING_CACHE_PATH")
+    # 답변 캐시 SQLite 파일 (워커 프로세스 간 공유, 미설정 시 메모리 전용)
+    ANSWER_CACHE_DB_PATH = os.getenv("RAG_ANSWER_CACHE_DB")
+    # 처리 중인 동일 질의(질의/가중치/모델/코퍼스 버전이 같은 요청)를 한 번만 계산
+    SINGLE_FLIGHT = os.getenv("RAG_SINGLE_FLIGHT", "true").lower() == "true"
+    # 의미 캐시: 지난 질의와 임베딩 유사도가 임계값 이상이면 캐시된 답변 사용
+    # (임계값은 운영 임베딩 모델로 benchmarks.semantic_cache_eval을 돌려 오적중률을 확인한 뒤 조정)
+    SEMANTIC_CACHE_ENABLED = os.getenv("RAG_SEMANTIC_CACHE", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = float(os.getenv("RAG_SEMANTIC_CACHE_THRESHOLD", "0.95"))
+    SEMANTIC_CACHE_SIZE = 500  # float16 × 768차원 기준 약 0.8MB
+    
+    # === 빠른 질문 설정 ===
+    # 빠른 질문 답변을 미리 계산해 두고 백그라운드에서 갱신
+    QUICK_ANSWERS_ENABLED = os.getenv("RAG_QUICK_ANSWERS", "true").lower() == "true"
+    QUICK_ANSWER_TTL = float(os.getenv("RAG_QUICK_ANSWER_TTL", "21600"))  # 6시간 (초)
+    QUICK_ANSWER_REFRESH_INTERVAL = float(os.getenv("RAG_QUICK_ANSWER_REFRESH_INTERVAL", "300"))  # 초
+    # 갱신 주기마다 벡터 저장소 변경을 확인해 코퍼스 재구축 (벡터 수가 바뀐 경우에만 ID 전체 나열,
+    # 꺼 두면 코퍼스 버전은 다른 곳에서 refresh_corpus를 호출할 때만 바뀜)
+    QUICK_ANSWER_CHECK_CORPUS = os.getenv("RAG_QUICK_ANSWER_CHECK_CORPUS", "false").lower() == "true"
+    # 사이드바에 표시할 빠른 질문 수 (get_quick_questions 앞에서부터)
+    SIDEBAR_QUICK_QUESTIONS = 6
     
     # === 보안 설정 ===
     ENABLE_API_KEY_VALIDATION = True
@@ -101,6 +202,7 @@ class Config:
         """모델 설정 반환"""
         return {
             "embedding_model": cls.EMBEDDING_MODEL,
+            "embedding_backend": cls.EMBEDDING_BACKEND,
             "gpt_model": cls.GPT_MODEL,
             "max_tokens": cls.MAX_TOKENS,
             "temperature": cls.TEMPERATURE,
@@ -115,7 +217,8 @@ class Config:
             "bm25_top_k": cls.BM25_TOP_K,
             "final_top_k": cls.FINAL_TOP_K,
             "vector_weight": cls.VECTOR_WEIGHT,
-            "bm25_weight": cls.BM25_WEIGHT
+            "bm25_weight": cls.BM25_WEIGHT,
+            "fusion_method": cls.FUSION_METHOD
         }
     
     @classmethod
@@ -143,7 +246,7 @@ class Config:
     def get_quick_questions(cls) -> list:
         """빠른 질문 목록 반환"""
         return [
-            "유니베라의 미션과 비전은 무엇인가요?",
+            "유니베라의 미션과 비전은?",
             "주요 제품들을 알려주세요",
             "회사 역사를 설명해주세요",
             "브랜드 전략은 어떻게 되나요?",
@@ -155,6 +258,11 @@ class Config:
             "미래 계획은 무엇인가요?"
         ]
     
+    @classmethod
+    def get_sidebar_quick_questions(cls) -> list:
+        """사이드바에 표시하는 빠른 질문 (미리 계산하는 질문도 이 목록)"""
+        return cls.get_quick_questions()[:cls.SIDEBAR_QUICK_QUESTIONS]
+    
     @classmethod
     def get_system_prompts(cls) -> dict:
         """시스템 프롬프트 반환"""
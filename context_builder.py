@@ -0,0 +1,138 @@
+"""
+토큰 예산 기반 GPT 컨텍스트 구성
+
+검색 결과를 순위대로 보면서 남은 예산을 하이브리드 점수 비율로 나눠 주고, 각 문서는
+문단 경계에서 잘라 배정량 안에 넣습니다. 배정량을 다 쓰지 않은 문서의 몫은 다음
+문서로 넘어갑니다. 이미 넣은 문단과 거의 같은 문단(청크 겹침, 여러 문서에 복사된
+공지 등)은 건너뜁니다.
+"""
+
+import re
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+from chunking import count_tokens
+
+logger = logging.getLogger(__name__)
+
+_FRONT_MATTER = re.compile(r'---.*?---', re.DOTALL)
+_PARAGRAPH = re.compile(r'\n\s*\n')
+_WORD = re.compile(r'\w+')
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class ContextBuilder:
+    """검색 결과 → 토큰 예산 안의 컨텍스트 문자열"""
+
+    def __init__(self, token_budget: int = 3000, dedup_threshold: float = 0.85):
+        """
+        Args:
+            token_budget: 컨텍스트 전체 최대 토큰 수 (문서 제목 줄 포함)
+            dedup_threshold: 단어 집합 자카드 유사도가 이 값 이상이면 중복 문단으로 간주
+        """
+        self.token_budget = token_budget
+        self.dedup_threshold = dedup_threshold
+
+    @staticmethod
+    def _header(filename: str) -> str:
+        return f"## 문서: {filename}\n"
+
+    def build(self, search_results: List[Dict[str, Any]],
+              stats: Optional[Dict[str, Any]] = None) -> str:
+        """
+        컨텍스트 구성
+
+        Args:
+            search_results: hybrid_search 결과 (순위순)
+            stats: 예산, 사용/원본 토큰 수, 절약한 토큰 수, 제거한 중복/잘린 문단 수를
+                기록할 dict (선택)
+
+        Returns:
+            GPT 입력용 컨텍스트
+        """
+        if stats is None:
+            stats = {}
+        weights = [max(float(result.get('hybrid_score', 0.0)), 0.0) + 1e-3 for result in search_results]
+        remaining_weight = sum(weights)
+        remaining = self.token_budget
+        seen: List[Set[str]] = []
+        parts = []
+        original_tokens = duplicates = trimmed = 0
+
+        for result, weight in zip(search_results, weights):
+            header = self._header(result['filename'])
+            header_tokens = count_tokens(header)
+            paragraphs = [p.strip() for p in _PARAGRAPH.split(_FRONT_MATTER.sub('', result['content']))]
+            paragraphs = [(p, count_tokens(p)) for p in paragraphs if p]
+            original_tokens += header_tokens + sum(tokens for _, tokens in paragraphs)
+
+            # 남은 예산을 남은 문서들의 점수 비율로 배정
+            share = remaining * weight / remaining_weight if remaining_weight > 0 else 0
+            remaining_weight -= weight
+            allowance = share - header_tokens
+
+            taken = []
+            for i, (paragraph, tokens) in enumerate(paragraphs):
+                words = set(_WORD.findall(paragraph.lower()))
+                if any(_jaccard(words, other) >= self.dedup_threshold for other in seen):
+                    duplicates += 1
+                    continue
+                if tokens > allowance:
+                    trimmed += len(paragraphs) - i
+                    # 첫 문단이 배정량보다 길면 줄/단어 단위로라도 앞부분을 넣음
+                    if not taken:
+                        paragraph, tokens = self._trim_lines(paragraph, allowance)
+                        if paragraph:
+                            taken.append(paragraph)
+                            seen.append(words)
+                            allowance -= tokens
+                    break
+                taken.append(paragraph)
+                seen.append(words)
+                allowance -= tokens
+
+            if taken:
+                part = header + "\n\n".join(taken) + "\n"
+                remaining -= share - allowance
+                parts.append(part)
+
+        context = "\n".join(parts)
+        used = count_tokens(context)
+        stats.update({
+            'budget': self.token_budget,
+            'documents': len(parts),
+            'context_tokens': used,
+            'original_tokens': original_tokens,
+            'tokens_saved': max(original_tokens - used, 0),
+            'duplicates_removed': duplicates,
+            'paragraphs_trimmed': trimmed
+        })
+        logger.info(f"컨텍스트 {used}/{self.token_budget} 토큰 (원본 {original_tokens}, "
+                    f"절약 {stats['tokens_saved']}, 중복 제거 {duplicates}, 잘린 문단 {trimmed})")
+        return context
+
+    @staticmethod
+    def _trim_lines(paragraph: str, allowance: float) -> tuple:
+        """배정량 안에 들어가는 앞쪽 줄만 남김 (첫 줄도 길면 단어 단위)"""
+        lines, tokens = [], 0
+        for line in paragraph.split("\n"):
+            line_tokens = count_tokens(line)
+            if tokens + line_tokens > allowance:
+                if not lines:
+                    words = []
+                    for word in line.split():
+                        word_tokens = count_tokens(word)
+                        if tokens + word_tokens > allowance:
+                            break
+                        words.append(word)
+                        tokens += word_tokens
+                    lines.append(" ".join(words))
+                break
+            lines.append(line)
+            tokens += line_tokens
+        return "\n".join(lines).strip(), tokens
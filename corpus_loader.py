@@ -0,0 +1,167 @@
+import time
+import hashlib
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _get(obj: Any, key: str, default: Any = None) -> Any:
+    """dict 응답과 Pinecone 응답 객체를 모두 지원하는 필드 접근"""
+    if isinstance(obj, dict):
+        return obj.get(key, default)
+    return getattr(obj, key, default)
+
+
+def _update_digest(digest, vector_id: str):
+    """지문 해시에 벡터 ID 반영"""
+    digest.update(vector_id.encode("utf-8"))
+    digest.update(b"\n")
+
+
+class CorpusLoader:
+    """Pinecone 인덱스 전체를 페이지 단위로 스트리밍하는 코퍼스 로더
+
+    벡터 ID를 페이지 단위로 나열(`index.list`)하고, 메타데이터는 크기가 제한된
+    배치로 가져옵니다(`index.fetch`). 한 번에 메모리에 올라가는 메타데이터는
+    최대 `fetch_batch_size`개이므로 10만 개 이상의 청크도 처리할 수 있습니다.
+    `list`/`fetch`/`describe_index_stats`만 구현하면 로컬 가짜 인덱스로도 동작합니다.
+    """
+
+    def __init__(self, index, page_size: int = 100, fetch_batch_size: int = 100,
+                 namespace: Optional[str] = None,
+                 progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 progress_interval: float = 2.0):
+        """
+        Args:
+            index: Pinecone Index (또는 동일한 인터페이스의 객체)
+            page_size: ID 나열 페이지 크기
+            fetch_batch_size: 메타데이터 조회 배치 크기
+            namespace: Pinecone 네임스페이스
+            progress_callback: 진행 상황 콜백 (통계 dict 전달)
+            progress_interval: 기본 진행 로그 출력 간격 (초)
+        """
+        self.index = index
+        self.page_size = page_size
+        self.fetch_batch_size = fetch_batch_size
+        self.namespace = namespace
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval
+
+    def _namespace_kwargs(self) -> Dict[str, Any]:
+        return {"namespace": self.namespace} if self.namespace else {}
+
+    def total_vector_count(self) -> int:
+        """인덱스의 전체 벡터 수"""
+        stats = self.index.describe_index_stats()
+        if self.namespace:
+            namespaces = _get(stats, "namespaces", {}) or {}
+            return int(_get(namespaces.get(self.namespace, {}), "vector_count", 0))
+        return int(_get(stats, "total_vector_count", 0))
+
+    def iter_id_pages(self) -> Iterator[List[str]]:
+        """벡터 ID를 페이지 단위로 반환"""
+        for page in self.index.list(limit=self.page_size, **self._namespace_kwargs()):
+            if page:
+                yield list(page)
+
+    def iter_id_batches(self) -> Iterator[List[str]]:
+        """ID 페이지를 fetch_batch_size 크기의 배치로 재구성"""
+        batch: List[str] = []
+        for page in self.iter_id_pages():
+            for vector_id in page:
+                batch.append(vector_id)
+                if len(batch) >= self.fetch_batch_size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
+
+    def fetch_metadata(self, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """ID 배치의 메타데이터 조회"""
+        response = self.index.fetch(ids=ids, **self._namespace_kwargs())
+        vectors = _get(response, "vectors", {}) or {}
+        return {vector_id: (_get(vector, "metadata", {}) or {})
+                for vector_id, vector in vectors.items()}
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(벡터 ID, 메타데이터) 스트림"""
+        for batch in self.iter_id_batches():
+            metadata = self.fetch_metadata(batch)
+            # fetch 응답 순서는 보장되지 않으므로 나열 순서를 유지
+            for vector_id in batch:
+                if vector_id in metadata:
+                    yield vector_id, metadata[vector_id]
+
+    def fingerprint(self) -> str:
+        """
+        인덱스 지문 (벡터 수 + 나열된 ID 목록의 해시)
+
+        메타데이터를 가져오지 않고 ID만 나열하므로 전체 로드보다 훨씬 저렴합니다
+        (프로세스/워커 시작마다 스냅샷 유효성 확인에 쓰임). 내용 변경은 수집
+        파이프라인이 문서 내용 해시를 벡터 ID에 넣어(chunking.chunk_id) 반영합니다.
+        load()가 계산하는 지문과 같습니다.
+        """
+        digest = hashlib.sha256()
+        count = 0
+        for page in self.iter_id_pages():
+            for vector_id in page:
+                _update_digest(digest, vector_id)
+                count += 1
+        return f"{count}-{digest.hexdigest()[:16]}"
+
+    def load(self, add_record: Callable[[str, Dict[str, Any]], bool]) -> Dict[str, Any]:
+        """
+        전체 코퍼스를 스트리밍하며 문서 저장소를 점진적으로 구축
+
+        Args:
+            add_record: (벡터 ID, 메타데이터)를 받아 저장 여부를 반환하는 함수
+
+        Returns:
+            로드 통계 (처리 레코드 수, 저장 문서 수, 소요 시간, 처리량, 인덱스 지문)
+        """
+        total = self.total_vector_count()
+        stats = {
+            "total_vectors": total,
+            "records": 0,
+            "added": 0,
+            "skipped": 0,
+            "elapsed": 0.0,
+            "records_per_sec": 0.0,
+            "fingerprint": None
+        }
+        if total == 0:
+            return stats
+
+        start = time.perf_counter()
+        last_report = start
+        digest = hashlib.sha256()
+        for vector_id, metadata in self.iter_records():
+            _update_digest(digest, vector_id)
+            stats["records"] += 1
+            if add_record(vector_id, metadata):
+                stats["added"] += 1
+            else:
+                stats["skipped"] += 1
+
+            now = time.perf_counter()
+            if now - last_report >= self.progress_interval:
+                last_report = now
+                self._report(stats, now - start)
+
+        stats["fingerprint"] = f"{stats['records']}-{digest.hexdigest()[:16]}"
+        self._report(stats, time.perf_counter() - start, final=True)
+        return stats
+
+    def _report(self, stats: Dict[str, Any], elapsed: float, final: bool = False):
+        stats["elapsed"] = elapsed
+        stats["records_per_sec"] = stats["records"] / elapsed if elapsed > 0 else 0.0
+        if self.progress_callback:
+            self.progress_callback(dict(stats))
+        else:
+            prefix = "코퍼스 로딩 완료" if final else "코퍼스 로딩 중"
+            logger.info(
+                f"{prefix} {stats['records']}/{stats['total_vectors']} "
+                f"(저장 {stats['added']}, 중복 {stats['skipped']}) - "
+                f"{stats['records_per_sec']:.0f}개/초"
+            )
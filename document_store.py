@@ -0,0 +1,131 @@
+import sys
+import zlib
+from array import array
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class DocumentStore:
+    """키 → 문서 ID 사전과 연속 버퍼로 구성된 문서 저장소
+
+    키(파일명 또는 청크 ID)와 상위 문서 파일명은 intern하여 한 번만 보관하고, 본문은
+    항목별로 (선택적으로 zlib 압축된) UTF-8 바이트를 하나의 연속 버퍼에 이어 붙여
+    오프셋 배열로 구분합니다. 추가, 중복 검사, 키로 본문 조회가 모두 O(1)이며,
+    상위 문서별 청크 목록도 함께 유지합니다. 스냅샷에서 열면 버퍼와 오프셋을
+    메모리 맵으로 공유합니다(이 경우 읽기 전용).
+    """
+
+    def __init__(self, compression_level: int = 1):
+        """
+        Args:
+            compression_level: 본문 zlib 압축 레벨 (0이면 압축하지 않음)
+        """
+        self.compression_level = compression_level
+        self.keys: List[str] = []
+        self.parents: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._children: Dict[str, List[int]] = {}
+        self._buffer = bytearray()
+        self._offsets = array("q", [0])
+        self._read_only = False
+
+    @classmethod
+    def from_buffers(cls, keys: List[str], buffer, offsets: np.ndarray,
+                     compression_level: int, parents: Optional[List[str]] = None) -> "DocumentStore":
+        """저장된 버퍼/오프셋(메모리 맵 가능)으로 읽기 전용 저장소 생성"""
+        store = cls(compression_level=compression_level)
+        store.keys = [sys.intern(key) for key in keys]
+        store.parents = [sys.intern(parent) for parent in parents] if parents else list(store.keys)
+        store._ids = {key: i for i, key in enumerate(store.keys)}
+        for i, parent in enumerate(store.parents):
+            store._children.setdefault(parent, []).append(i)
+        store._buffer = buffer
+        store._offsets = offsets
+        store._read_only = True
+        return store
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._ids
+
+    def add(self, key: str, text: str, parent: Optional[str] = None) -> bool:
+        """
+        문서 또는 청크 추가 (이미 있는 키이면 False)
+
+        Args:
+            key: 파일명 또는 청크 ID
+            text: 본문
+            parent: 청크가 속한 문서 파일명 (None이면 key 자신)
+        """
+        if self._read_only:
+            raise RuntimeError("스냅샷에서 연 문서 저장소는 수정할 수 없습니다.")
+        if key in self._ids:
+            return False
+
+        key = sys.intern(key)
+        parent = key if parent is None else sys.intern(parent)
+        data = text.encode("utf-8")
+        if self.compression_level:
+            data = zlib.compress(data, self.compression_level)
+        doc_id = len(self.keys)
+        self._ids[key] = doc_id
+        self.keys.append(key)
+        self.parents.append(parent)
+        self._children.setdefault(parent, []).append(doc_id)
+        self._buffer += data
+        self._offsets.append(len(self._buffer))
+        return True
+
+    def id_of(self, key: str) -> Optional[int]:
+        return self._ids.get(key)
+
+    def parent_of(self, key: str) -> str:
+        """청크가 속한 문서 파일명 (저장소에 없는 키는 그 자체를 파일명으로 간주)"""
+        doc_id = self._ids.get(key)
+        return key if doc_id is None else self.parents[doc_id]
+
+    def children(self, parent: str) -> List[int]:
+        """문서에 속한 청크 ID 목록 (추가 순서)"""
+        return self._children.get(parent, [])
+
+    @property
+    def parent_count(self) -> int:
+        """상위 문서 수"""
+        return len(self._children)
+
+    def text(self, doc_id: int) -> str:
+        """문서 ID로 본문 조회"""
+        start, end = int(self._offsets[doc_id]), int(self._offsets[doc_id + 1])
+        data = bytes(self._buffer[start:end])
+        if self.compression_level:
+            data = zlib.decompress(data)
+        return data.decode("utf-8")
+
+    def get(self, key: str, default: str = "") -> str:
+        """키로 본문 조회"""
+        doc_id = self._ids.get(key)
+        return default if doc_id is None else self.text(doc_id)
+
+    def texts(self) -> Iterator[str]:
+        """저장 순서대로 본문 반환"""
+        for doc_id in range(len(self)):
+            yield self.text(doc_id)
+
+    @property
+    def buffer(self) -> memoryview:
+        return memoryview(self._buffer)
+
+    @property
+    def offsets(self) -> np.ndarray:
+        return np.asarray(self._offsets, dtype=np.int64)
+
+    def memory_bytes(self) -> int:
+        """본문 버퍼 + 오프셋 + 키/사전이 차지하는 대략적인 메모리"""
+        names = sum(sys.getsizeof(key) for key in self.keys)
+        names += sum(sys.getsizeof(parent) for parent in self._children if parent not in self._ids)
+        return (len(self._buffer) + len(self._offsets) * 8 + names
+                + sys.getsizeof(self.keys) + sys.getsizeof(self.parents) + sys.getsizeof(self._ids)
+                + sys.getsizeof(self._children) + sum(sys.getsizeof(ids) for ids in self._children.values()))
@@ -0,0 +1,169 @@
+"""
+E5 임베딩 추론 백엔드 (GPU 없는 서버용)
+
+모든 백엔드는 SentenceTransformer 객체를 돌려주므로 encode/멀티 프로세스 풀 등
+기존 호출 코드를 그대로 사용할 수 있습니다.
+    torch        PyTorch fp32 (기본, 기준 임베딩)
+    torch-int8   Linear 층을 int8로 동적 양자화한 PyTorch (추가 의존성 없음)
+    onnx         ONNX Runtime (onnxruntime, optimum 필요, 미설치 시 torch로 대체)
+
+양자화/ONNX 임베딩은 fp32와 조금 다르므로 check_agreement로 코사인 일치도를 확인한 뒤
+사용하세요 (python -m benchmarks.embedding_bench).
+"""
+
+import os
+import logging
+import argparse
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+BACKENDS = ("torch", "torch-int8", "onnx")
+
+
+def model_id(model_name: str, backend: str, onnx_file: Optional[str] = None) -> str:
+    """임베딩 캐시 키에 쓰는 모델 식별자 (백엔드가 바뀌면 캐시된 벡터를 재사용하지 않음)"""
+    if backend == "torch":
+        return model_name
+    if backend == "onnx" and onnx_file:
+        return f"{model_name}:{backend}:{onnx_file}"
+    return f"{model_name}:{backend}"
+
+
+def _set_torch_threads(threads: int):
+    import torch
+
+    if threads > 0:
+        torch.set_num_threads(threads)
+    logger.info(f"PyTorch 추론 스레드: {torch.get_num_threads()}개")
+
+
+def _load_onnx(model_name: str, threads: int, onnx_path: Optional[str], onnx_file: Optional[str]):
+    import onnxruntime
+    from sentence_transformers import SentenceTransformer
+
+    session_options = onnxruntime.SessionOptions()
+    if threads > 0:
+        session_options.intra_op_num_threads = threads
+    # 질의 하나를 처리하는 동안 연산자 간 병렬화는 이득이 없음
+    session_options.inter_op_num_threads = 1
+    session_options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+
+    model_kwargs: Dict[str, Any] = {"provider": "CPUExecutionProvider", "session_options": session_options}
+    if onnx_file:
+        model_kwargs["file_name"] = onnx_file
+    return SentenceTransformer(onnx_path or model_name, device="cpu", backend="onnx",
+                               model_kwargs=model_kwargs)
+
+
+def create_embedding_model(model_name: str, backend: str = "torch", threads: int = 0,
+                           onnx_path: Optional[str] = None, onnx_file: Optional[str] = None):
+    """
+    설정된 백엔드로 임베딩 모델 로드
+
+    Args:
+        model_name: Hugging Face 모델 이름
+        backend: torch, torch-int8, onnx 중 하나
+        threads: 추론 스레드 수 (0: 라이브러리 기본값)
+        onnx_path: ONNX 모델 폴더 (export_onnx 결과, 없으면 model_name에서 받거나 변환)
+        onnx_file: 폴더 안의 ONNX 파일 (예: "onnx/model_qint8_avx2.onnx")
+
+    Returns:
+        SentenceTransformer
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend not in BACKENDS:
+        raise ValueError(f"지원하지 않는 임베딩 백엔드입니다: {backend}")
+
+    if backend == "onnx":
+        try:
+            model = _load_onnx(model_name, threads, onnx_path, onnx_file)
+            logger.info(f"ONNX Runtime 임베딩 모델 로드 완료 ({onnx_file or 'model.onnx'})")
+            return model
+        except (ImportError, TypeError) as e:
+            # onnxruntime/optimum 미설치 또는 backend 인자를 모르는 구버전 sentence-transformers
+            logger.warning(f"ONNX 백엔드를 사용할 수 없어 PyTorch fp32로 대체합니다: {e}")
+            backend = "torch"
+
+    _set_torch_threads(threads)
+    model = SentenceTransformer(model_name, device="cpu")
+    if backend == "torch-int8":
+        import torch
+
+        torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        logger.info("임베딩 모델 Linear 층을 int8로 동적 양자화했습니다.")
+    return model
+
+
+def check_agreement(reference, candidate, texts: Optional[List[str]] = None, threshold: float = 0.99,
+                    batch_size: int = 32) -> Dict[str, Any]:
+    """
+    두 모델 임베딩의 코사인 일치도
+
+    Args:
+        reference: 기준 모델 (fp32) 또는 미리 계산한 정규화 임베딩 배열
+        candidate: 비교할 모델 또는 정규화 임베딩 배열
+        texts: 모델을 넘긴 경우 비교에 쓸 텍스트 ("query: "/"passage: " 접두사 포함)
+        threshold: 통과 기준 최소 코사인 유사도
+
+    Returns:
+        평균/최소 코사인, 기준 미달 텍스트 수, 통과 여부
+    """
+    def vectors(model):
+        if isinstance(model, np.ndarray):
+            return model
+        return model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+
+    cosines = np.sum(vectors(reference) * vectors(candidate), axis=1)
+    return {
+        "texts": len(cosines),
+        "mean_cosine": float(cosines.mean()),
+        "min_cosine": float(cosines.min()),
+        "below_threshold": int((cosines < threshold).sum()),
+        "threshold": threshold,
+        "passed": bool(cosines.min() >= threshold)
+    }
+
+
+def export_onnx(model_name: str, output_dir: str, quantize: Optional[str] = None) -> str:
+    """
+    모델을 ONNX로 변환해 저장 (선택적으로 int8 동적 양자화 파일도 생성)
+
+    Args:
+        quantize: 양자화 대상 CPU 명령어 (arm64, avx2, avx512, avx512_vnni)
+
+    Returns:
+        Config.EMBEDDING_ONNX_FILE에 지정할 파일 경로 (output_dir 기준)
+    """
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    model = SentenceTransformer(model_name, device="cpu", backend="onnx")
+    model.save_pretrained(output_dir)
+    if not quantize:
+        return "onnx/model.onnx"
+    export_dynamic_quantized_onnx_model(model, quantize, output_dir)
+    return f"onnx/model_qint8_{quantize}.onnx"
+
+
+def main():
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="임베딩 모델 ONNX 변환")
+    parser.add_argument("output", help="저장할 폴더 (Config.EMBEDDING_ONNX_PATH)")
+    parser.add_argument("--model", default=Config.EMBEDDING_MODEL)
+    parser.add_argument("--quantize", choices=["arm64", "avx2", "avx512", "avx512_vnni"],
+                        help="int8 동적 양자화 파일도 생성")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+    onnx_file = export_onnx(args.model, args.output, args.quantize)
+    print(f"✅ {os.path.join(args.output, onnx_file)}")
+    print(f"RAG_EMBEDDING_BACKEND=onnx RAG_EMBEDDING_ONNX_PATH={args.output} "
+          f"RAG_EMBEDDING_ONNX_FILE={onnx_file}")
+
+
+if __name__ == "__main__":
+    main()
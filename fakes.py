@@ -0,0 +1,436 @@
+"""
+테스트 및 벤치마크용 로컬 대역 (외부 서비스 없이 RAG 파이프라인 실행)
+"""
+
+import json
+import time
+import zlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+
+class FakePineconeIndex:
+    """Pinecone Index 인터페이스를 흉내 내는 인메모리 인덱스
+
+    `upsert`, `describe_index_stats`, `list`, `fetch`, `query`를 지원하며
+    응답은 실제 클라이언트처럼 dict 형태(`matches`, `vectors`)로 반환합니다.
+    """
+
+    def __init__(self, dimension: int = 768, query_delay: float = 0.0):
+        """
+        Args:
+            dimension: 벡터 차원
+            query_delay: query 호출마다 추가할 지연 (초, 네트워크 왕복 흉내)
+        """
+        self.dimension = dimension
+        self.query_delay = query_delay
+        self._lock = threading.Lock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._values: List[np.ndarray] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._matrix: Optional[np.ndarray] = None
+
+    def upsert(self, vectors: List[Any], namespace: Optional[str] = None) -> Dict[str, int]:
+        """(id, values, metadata) 튜플 또는 dict 목록 저장"""
+        with self._lock:
+            for vector in vectors:
+                if isinstance(vector, dict):
+                    vector_id, values, metadata = vector["id"], vector["values"], vector.get("metadata", {})
+                else:
+                    vector_id, values, metadata = vector
+                values = np.asarray(values, dtype=np.float32)
+                if vector_id in self._positions:
+                    position = self._positions[vector_id]
+                    self._values[position] = values
+                    self._metadata[position] = dict(metadata)
+                else:
+                    self._positions[vector_id] = len(self._ids)
+                    self._ids.append(vector_id)
+                    self._values.append(values)
+                    self._metadata.append(dict(metadata))
+            self._matrix = None
+        return {"upserted_count": len(vectors)}
+
+    def describe_index_stats(self) -> Dict[str, Any]:
+        return {
+            "dimension": self.dimension,
+            "total_vector_count": len(self._ids),
+            "namespaces": {"": {"vector_count": len(self._ids)}}
+        }
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100,
+             namespace: Optional[str] = None) -> Iterator[List[str]]:
+        """ID를 limit 크기 페이지로 반환 (Pinecone `Index.list`와 동일한 제너레이터)"""
+        page: List[str] = []
+        for vector_id in list(self._ids):
+            if prefix and not vector_id.startswith(prefix):
+                continue
+            page.append(vector_id)
+            if len(page) >= limit:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def fetch(self, ids: List[str], namespace: Optional[str] = None) -> Dict[str, Any]:
+        vectors = {}
+        for vector_id in ids:
+            position = self._positions.get(vector_id)
+            if position is not None:
+                vectors[vector_id] = {
+                    "id": vector_id,
+                    "values": self._values[position].tolist(),
+                    "metadata": self._metadata[position]
+                }
+        return {"vectors": vectors, "namespace": namespace or ""}
+
+    def query(self, vector: List[float], top_k: int = 10, include_metadata: bool = False,
+              include_values: bool = False, namespace: Optional[str] = None, **kwargs) -> Dict[str, Any]:
+        """코사인 유사도 기반 정확 검색"""
+        if self.query_delay:
+            time.sleep(self.query_delay)
+        with self._lock:
+            if self._matrix is None and self._values:
+                matrix = np.vstack(self._values)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._matrix = matrix / np.maximum(norms, 1e-12)
+            matrix = self._matrix
+        if matrix is None:
+            return {"matches": [], "namespace": namespace or ""}
+
+        query = np.asarray(vector, dtype=np.float32)
+        query_norm = np.linalg.norm(query)
+        scores = matrix @ (query / query_norm) if query_norm > 0 else np.zeros(len(matrix), dtype=np.float32)
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        matches = []
+        for position in top:
+            match = {"id": self._ids[position], "score": float(scores[position])}
+            if include_metadata:
+                match["metadata"] = self._metadata[position]
+            if include_values:
+                match["values"] = self._values[position].tolist()
+            matches.append(match)
+        return {"matches": matches, "namespace": namespace or ""}
+
+    def delete(self, ids: List[str], namespace: Optional[str] = None):
+        with self._lock:
+            remove = set(ids) & set(self._positions)
+            if not remove:
+                return
+            keep = [i for i, vector_id in enumerate(self._ids) if vector_id not in remove]
+            self._ids = [self._ids[i] for i in keep]
+            self._values = [self._values[i] for i in keep]
+            self._metadata = [self._metadata[i] for i in keep]
+            self._positions = {vector_id: i for i, vector_id in enumerate(self._ids)}
+            self._matrix = None
+
+    def persist(self):
+        """VectorStore 인터페이스 호환 (메모리 전용이라 저장할 것이 없음)"""
+
+
+class FakeEmbeddingModel:
+    """SentenceTransformer 인터페이스를 흉내 내는 결정적 임베딩 모델
+
+    단어와 단어의 글자 bi-gram을 해시 공간에 더한 뒤 정규화합니다. 조사가 붙은 단어
+    ("유니베라의")도 원형과 bi-gram을 공유하므로 공백 분리 BM25와 다르게 동작하는
+    의미 검색의 대역으로 쓸 수 있습니다.
+    """
+
+    _PREFIXES = ("query: ", "passage: ")
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _vector(self, text: str) -> np.ndarray:
+        for prefix in self._PREFIXES:
+            if text.startswith(prefix):
+                text = text[len(prefix):]
+                break
+        features = []
+        for word in text.lower().split():
+            features.append(word)
+            features.extend(word[i:i + 2] for i in range(len(word) - 1))
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        if features:
+            buckets = [zlib.crc32(feature.encode("utf-8")) % self.dimension for feature in features]
+            np.add.at(vector, buckets, 1.0)
+        return vector
+
+    def encode(self, sentences, batch_size: int = 32, normalize_embeddings: bool = False, **kwargs):
+        single = isinstance(sentences, str)
+        matrix = np.vstack([self._vector(text) for text in ([sentences] if single else sentences)])
+        if normalize_embeddings:
+            matrix /= np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+        return matrix[0] if single else matrix
+
+
+def build_fake_rag_system(documents: Dict[str, str], openai_base_url: Optional[str] = None,
+                          dimension: int = 256):
+    """
+    외부 서비스 없이 동작하는 RAGSystem 생성
+
+    문서는 실제 색인 경로(index_document: 청킹 → 배치 임베딩 → 업서트)로 FakePineconeIndex에
+    올리고, 코퍼스/BM25는 처음 검색할 때 벡터 저장소에서 구축됩니다. 디스크 스냅샷은
+    사용하지 않습니다.
+
+    Args:
+        documents: 파일명 → 마크다운 본문
+        openai_base_url: 답변 생성에 쓸 OpenAI 호환 서버 (예: FakeOpenAIServer.base_url)
+    """
+    import openai
+    from rag_system import RAGSystem
+
+    system = RAGSystem(pinecone_api_key="fake", pinecone_index_name="fake", openai_api_key="fake",
+                       enable_snapshot=False)
+    system.model = FakeEmbeddingModel(dimension)
+    system.vector_store = FakePineconeIndex(dimension)
+    system.openai_client = openai.OpenAI(api_key="fake", base_url=openai_base_url, max_retries=0)
+    for filename, text in documents.items():
+        system.index_document(filename, text)
+    return system
+
+
+class _LocalServer(ThreadingHTTPServer):
+    """동시 연결 수백 개를 받을 수 있도록 대기열을 늘린 로컬 서버"""
+
+    daemon_threads = True
+    request_queue_size = 512
+
+
+class FakeOpenAIServer:
+    """OpenAI Chat Completions API를 흉내 내는 로컬 HTTP 서버
+
+    `/v1/chat/completions`에 대해 일반 응답과 SSE 스트리밍 응답(`stream=True`,
+    `stream_options.include_usage` 지원)을 반환합니다. 첫 토큰 지연과 토큰 간 지연을
+    조절할 수 있어 실제 클라이언트(`openai.OpenAI(base_url=server.base_url)`)로
+    스트리밍과 TTFT를 검증할 수 있습니다.
+
+        with FakeOpenAIServer(reply="유니베라는 ...") as server:
+            client = openai.OpenAI(api_key="test", base_url=server.base_url)
+    """
+
+    def __init__(self, reply: Optional[str] = None, first_token_delay: float = 0.05,
+                 token_delay: float = 0.005, host: str = "127.0.0.1", port: int = 0,
+                 reply_fn: Optional[Callable[[List[Dict[str, Any]]], str]] = None,
+                 rate_limit_every: int = 0):
+        """
+        Args:
+            reply: 고정 응답 문자열 (None이면 질문 길이를 담은 기본 응답)
+            first_token_delay: 첫 토큰까지 지연 (초)
+            token_delay: 토큰 간 지연 (초)
+            host: 바인딩 주소
+            port: 포트 (0이면 임의 포트)
+            reply_fn: 메시지 목록으로 응답을 만드는 함수 (reply보다 우선)
+            rate_limit_every: N번째 요청마다 429(Retry-After) 응답 (0이면 비활성)
+        """
+        self.reply = reply
+        self.reply_fn = reply_fn
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+        self.rate_limit_every = rate_limit_every
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+        self._server = _LocalServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "FakeOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _reply_for(self, messages: List[Dict[str, Any]]) -> str:
+        if self.reply_fn is not None:
+            return self.reply_fn(messages)
+        if self.reply is not None:
+            return self.reply
+        question = messages[-1]["content"] if messages else ""
+        return f"테스트 답변입니다. 질문 길이는 {len(question)}자입니다. 출처: 테스트 문서"
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send_json(self, status: int, body: Dict[str, Any]):
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": "not found"}})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                    limited = fake.rate_limit_every and fake.requests % fake.rate_limit_every == 0
+                    if limited:
+                        fake.rate_limited += 1
+                if limited:
+                    data = json.dumps({"error": {"message": "Rate limit reached", "type": "requests",
+                                                 "code": "rate_limit_exceeded"}}).encode("utf-8")
+                    self.send_response(429)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(data)))
+                    self.send_header("Retry-After", "0.05")
+                    self.end_headers()
+                    self.wfile.write(data)
+                    return
+
+                messages = request.get("messages", [])
+                reply = fake._reply_for(messages)
+                tokens = reply.split(" ")
+                usage = {
+                    "prompt_tokens": sum(len(str(m.get("content", "")).split()) for m in messages),
+                    "completion_tokens": len(tokens),
+                }
+                usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+                base = {"id": f"chatcmpl-fake{fake.requests}", "created": int(time.time()),
+                        "model": request.get("model", "gpt-4o-mini")}
+
+                time.sleep(fake.first_token_delay)
+                if not request.get("stream"):
+                    time.sleep(fake.token_delay * len(tokens))
+                    self._send_json(200, {**base, "object": "chat.completion", "choices": [{
+                        "index": 0, "message": {"role": "assistant", "content": reply},
+                        "finish_reason": "stop"}], "usage": usage})
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Cache-Control", "no-cache")
+                self.send_header("Connection", "close")
+                self.end_headers()
+
+                def send(payload: Dict[str, Any]):
+                    self.wfile.write(b"data: " + json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n\n")
+                    self.wfile.flush()
+
+                chunk = {**base, "object": "chat.completion.chunk"}
+                try:
+                    for i, token in enumerate(tokens):
+                        if i:
+                            time.sleep(fake.token_delay)
+                        content = token if i == 0 else " " + token
+                        delta = {"content": content, "role": "assistant"} if i == 0 else {"content": content}
+                        send({**chunk, "choices": [{"index": 0, "delta": delta, "finish_reason": None}]})
+                    send({**chunk, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+                    if (request.get("stream_options") or {}).get("include_usage"):
+                        send({**chunk, "choices": [], "usage": usage})
+                    self.wfile.write(b"data: [DONE]\n\n")
+                    self.wfile.flush()
+                except (BrokenPipeError, ConnectionResetError):
+                    # 클라이언트가 스트림을 중간에 닫음
+                    pass
+                self.close_connection = True
+
+        return Handler
+
+
+class FakePineconeServer:
+    """Pinecone 데이터 플레인 REST API(`POST /query`)를 흉내 내는 로컬 HTTP 서버
+
+    검색은 주어진 FakePineconeIndex로 처리하고, 연결 재사용을 확인할 수 있도록
+    요청 수와 새로 맺은 연결 수를 셉니다.
+
+        with FakePineconeServer(index) as server:
+            engine = AsyncRAGEngine(rag_system, pinecone_host=server.base_url)
+    """
+
+    def __init__(self, index: FakePineconeIndex, host: str = "127.0.0.1", port: int = 0):
+        self.index = index
+        self.requests = 0
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._server = _LocalServer((host, port), self._make_handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakePineconeServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakePineconeServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _make_handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with fake._lock:
+                    fake.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                with fake._lock:
+                    fake.requests += 1
+                if self.path.rstrip("/") != "/query":
+                    status, body = 404, {"error": {"message": "not found"}}
+                else:
+                    status, body = 200, fake.index.query(
+                        request.get("vector", []), top_k=request.get("topK", 10),
+                        include_metadata=request.get("includeMetadata", False),
+                        include_values=request.get("includeValues", False)
+                    )
+                data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
@@ -0,0 +1,111 @@
+"""
+하이브리드 검색 결과 결합 전략
+
+검색기(벡터, BM25)마다 후보 ID 배열과 점수 배열을 받아 하나의 순위로 결합합니다.
+모든 전략은 검색기 × 후보 점수 행렬에서 numpy로 한 번에 계산하고, 동점은 후보 ID
+순으로 정렬하므로 실행할 때마다 같은 순위를 돌려줍니다.
+    weighted  검색기별 min-max 정규화 후 가중합 (기존 방식)
+    rrf       Reciprocal Rank Fusion: 가중치 / (k + 순위) 합, 점수 분포와 무관
+    zscore    검색기별 표준 점수를 로지스틱 함수로 0~1에 대응시킨 뒤 가중합
+    combmnz   min-max 정규화 점수의 가중합 × 후보를 찾은 검색기 수
+
+min-max 정규화는 검색기가 후보를 1~2개만 돌려주면 점수가 모두 1.0(또는 1.0과 0.0)이
+되어 그 검색기의 약한 일치가 과대평가됩니다. rrf와 zscore는 이 경우에도 안정적입니다.
+"""
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+METHODS = ("weighted", "rrf", "zscore", "combmnz")
+RRF_K = 60
+
+Ranking = Tuple[Sequence[str], Sequence[float]]
+
+
+def candidate_matrix(rankings: Sequence[Ranking]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    검색기별 결과를 하나의 점수 행렬로 정렬
+
+    Args:
+        rankings: 검색기별 (후보 ID 배열, 점수 배열)
+
+    Returns:
+        (ID 순으로 정렬된 후보 배열, 검색기 × 후보 점수 행렬 - 찾지 못한 후보는 NaN)
+    """
+    ids = [np.asarray(list(candidate_ids), dtype=str) for candidate_ids, _ in rankings]
+    candidates, inverse = np.unique(np.concatenate(ids) if ids else np.empty(0, dtype=str),
+                                    return_inverse=True)
+    scores = np.full((len(rankings), len(candidates)), np.nan)
+    offset = 0
+    for row, (_, values) in enumerate(rankings):
+        count = len(ids[row])
+        scores[row, inverse[offset:offset + count]] = np.asarray(values, dtype=np.float64)
+        offset += count
+    return candidates, scores
+
+
+def _minmax(scores: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """검색기별 0~1 정규화 (모든 점수가 같으면 1.0, 찾지 못한 후보는 0.0)"""
+    low = np.where(present, scores, np.inf).min(axis=1, keepdims=True)
+    high = np.where(present, scores, -np.inf).max(axis=1, keepdims=True)
+    spread = high - low
+    with np.errstate(invalid="ignore"):
+        normalized = np.where(spread > 0, (scores - low) / np.where(spread > 0, spread, 1.0), 1.0)
+    return np.where(present, normalized, 0.0)
+
+
+def _zscore(scores: np.ndarray, present: np.ndarray) -> np.ndarray:
+    """검색기별 표준 점수의 로지스틱 값 (점수가 하나뿐이거나 모두 같으면 0.5, 찾지 못한 후보는 0.0)"""
+    counts = np.maximum(present.sum(axis=1, keepdims=True), 1)
+    filled = np.where(present, scores, 0.0)
+    mean = filled.sum(axis=1, keepdims=True) / counts
+    deviation = np.where(present, filled - mean, 0.0)
+    std = np.sqrt((deviation ** 2).sum(axis=1, keepdims=True) / counts)
+    z = deviation / np.where(std > 0, std, 1.0)
+    return np.where(present, 1.0 / (1.0 + np.exp(-z)), 0.0)
+
+
+def _reciprocal_ranks(scores: np.ndarray, present: np.ndarray, k: int) -> np.ndarray:
+    """검색기별 1 / (k + 순위) (순위는 1부터, 동점은 후보 ID 순)"""
+    order = np.argsort(np.where(present, -scores, np.inf), axis=1, kind="stable")
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, scores.shape[1] + 1)[None, :], axis=1)
+    return np.where(present, 1.0 / (k + ranks), 0.0)
+
+
+def fuse(rankings: Sequence[Ranking], weights: Sequence[float], method: str = "weighted",
+         top_k: Optional[int] = None, rrf_k: int = RRF_K) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    검색기별 결과를 결합해 점수 내림차순으로 정렬
+
+    Args:
+        rankings: 검색기별 (후보 ID 배열, 점수 배열)
+        weights: 검색기별 가중치 (rankings와 같은 순서)
+        method: METHODS 중 하나
+        top_k: 반환할 최대 후보 수 (None이면 전체)
+        rrf_k: RRF 순위 상수 (클수록 하위 순위와의 점수 차이가 작아짐)
+
+    Returns:
+        (후보 ID 배열, 결합 점수 배열)
+    """
+    if method not in METHODS:
+        raise ValueError(f"지원하지 않는 결합 방식입니다: {method}")
+    candidates, scores = candidate_matrix(rankings)
+    if len(candidates) == 0:
+        return candidates, np.empty(0)
+
+    present = ~np.isnan(scores)
+    weight_column = np.asarray(weights, dtype=np.float64)[:, None]
+    if method == "rrf":
+        fused = (weight_column * _reciprocal_ranks(scores, present, rrf_k)).sum(axis=0)
+    elif method == "zscore":
+        fused = (weight_column * _zscore(scores, present)).sum(axis=0)
+    else:
+        fused = (weight_column * _minmax(scores, present)).sum(axis=0)
+        if method == "combmnz":
+            fused = fused * present.sum(axis=0)
+
+    # 후보가 ID 순이므로 안정 정렬이면 동점은 ID 순
+    order = np.argsort(-fused, kind="stable")[:top_k]
+    return candidates[order], fused[order]
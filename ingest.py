@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+마크다운 폴더 → 벡터 저장소 증분 수집
+
+    python ingest.py /path/to/documents --batch-size 64 --workers 2
+
+문서마다 front matter를 읽고 청크로 나눈 뒤 passage 임베딩을 배치로 계산하여
+벡터 저장소(Config.VECTOR_STORE)에 제한된 크기의 배치로 업서트합니다. 파일별 내용
+해시를 manifest에 기록하므로 다시 실행하면 바뀐 파일만 임베딩하고, 바뀌거나 삭제된
+파일의 이전 청크는 새 청크를 올린 뒤 삭제합니다.
+"""
+
+import os
+import re
+import json
+import time
+import logging
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from config import Config
+from chunking import MarkdownChunker, chunk_id, content_hash
+from batch_query import with_backoff
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_VERSION = 1
+_FRONT_MATTER = re.compile(r'\A\s*---\n(.*?)\n---[ \t]*\n?', re.DOTALL)
+
+
+def parse_front_matter(text: str) -> Tuple[Dict[str, str], str]:
+    """
+    YAML front matter의 단순 `key: value` 항목과 본문 분리
+
+    Returns:
+        (메타데이터, front matter를 제외한 본문)
+    """
+    match = _FRONT_MATTER.match(text)
+    if not match:
+        return {}, text
+    metadata = {}
+    for line in match.group(1).splitlines():
+        key, sep, value = line.partition(":")
+        if sep and key.strip() and not line.startswith((" ", "\t", "-")):
+            metadata[key.strip()] = value.strip().strip("'\"")
+    return metadata, text[match.end():]
+
+
+def scan_documents(root: str) -> Dict[str, str]:
+    """폴더의 마크다운 파일 (상대 경로 → 절대 경로, 경로 순)"""
+    documents = {}
+    for directory, _, files in os.walk(root):
+        for name in files:
+            if name.lower().endswith((".md", ".markdown")):
+                path = os.path.join(directory, name)
+                documents[os.path.relpath(path, root).replace(os.sep, "/")] = path
+    return dict(sorted(documents.items()))
+
+
+class Ingester:
+    """마크다운 문서를 청크 단위 벡터로 증분 수집"""
+
+    def __init__(self, vector_store, model, chunker: MarkdownChunker, manifest_path: str,
+                 batch_size: int = 32, workers: int = 1, upsert_batch_size: int = 100,
+                 upsert_concurrency: int = 4, encode_group_size: int = 512):
+        """
+        Args:
+            vector_store: 업서트 대상 (VectorStore 또는 Pinecone Index)
+            model: SentenceTransformer 모델
+            chunker: 문서 청커
+            manifest_path: 파일별 내용 해시/청크 ID 기록 경로
+            batch_size: 임베딩 배치 크기
+            workers: 임베딩 프로세스 수 (1이면 현재 프로세스)
+            upsert_batch_size: 업서트 요청당 벡터 수
+            upsert_concurrency: 동시에 진행할 업서트 요청 수
+            encode_group_size: 한 번에 임베딩할 청크 수 (메모리 상한)
+        """
+        self.vector_store = vector_store
+        self.model = model
+        self.chunker = chunker
+        self.manifest_path = manifest_path
+        self.batch_size = batch_size
+        self.workers = workers
+        self.upsert_batch_size = upsert_batch_size
+        self.upsert_concurrency = upsert_concurrency
+        self.encode_group_size = encode_group_size
+        self._pool = None
+
+    # === manifest ===
+
+    def _signature(self) -> Dict[str, str]:
+        """임베딩/청킹 설정 (바뀌면 전체 재수집)"""
+        return {"model": Config.EMBEDDING_MODEL, "chunker": self.chunker.name}
+
+    def load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {"version": MANIFEST_VERSION, **self._signature(), "files": {}}
+        if manifest.get("version") != MANIFEST_VERSION or any(
+                manifest.get(key) != value for key, value in self._signature().items()):
+            logger.info("임베딩 모델 또는 청킹 설정이 바뀌어 전체 문서를 다시 수집합니다.")
+            return {"version": MANIFEST_VERSION, **self._signature(), "files": manifest.get("files", {}),
+                    "stale": True}
+        return manifest
+
+    def save_manifest(self, manifest: Dict[str, Any]):
+        manifest = {key: value for key, value in manifest.items() if key != "stale"}
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.manifest_path)
+
+    # === 임베딩 ===
+
+    def _encode(self, texts: List[str]):
+        prefixed = ["passage: " + text for text in texts]
+        if self.workers > 1:
+            if self._pool is None:
+                self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.workers)
+            return self.model.encode_multi_process(
+                prefixed, self._pool, batch_size=self.batch_size, normalize_embeddings=True)
+        return self.model.encode(prefixed, batch_size=self.batch_size, normalize_embeddings=True)
+
+    def close(self):
+        if self._pool is not None:
+            self.model.stop_multi_process_pool(self._pool)
+            self._pool = None
+
+    # === 수집 ===
+
+    def _records(self, filename: str, text: str) -> Tuple[str, List[Tuple[str, str, Dict[str, Any]]]]:
+        """파일 → (내용 해시, [(청크 ID, 청크 본문, 메타데이터)])"""
+        digest = content_hash(text)
+        front_matter, _ = parse_front_matter(text)
+        extra = {f"doc_{key}": value for key, value in front_matter.items() if value}
+        records = []
+        for chunk in self.chunker.split(text):
+            records.append((chunk_id(filename, chunk['index'], digest), chunk['text'], {
+                **extra,
+                'filename': filename,
+                'chunk_index': chunk['index'],
+                'heading': chunk['heading'],
+                'content_hash': digest,
+                'text': chunk['text']
+            }))
+        return digest, records
+
+    def _upsert(self, pool: ThreadPoolExecutor, records: List[Tuple[str, list, Dict[str, Any]]],
+                stats: Dict[str, Any]):
+        """제한된 크기 배치로 나눠 업서트 (동시 요청 수 제한, 재시도 포함)"""
+        futures = [
+            pool.submit(with_backoff, lambda batch=records[i:i + self.upsert_batch_size]:
+                        self.vector_store.upsert(vectors=batch),
+                        Config.BATCH_MAX_RETRIES, 0.5, 30.0, stats)
+            for i in range(0, len(records), self.upsert_batch_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def _flush(self, group: List[Tuple[str, str, list]], manifest: Dict[str, Any],
+               pool: ThreadPoolExecutor, stats: Dict[str, Any]):
+        """모아 둔 파일들의 청크를 임베딩/업서트하고 이전 청크를 삭제"""
+        texts = [text for _, _, records in group for _, text, _ in records]
+        if texts:
+            start = time.perf_counter()
+            vectors = self._encode(texts)
+            stats["encode_s"] += time.perf_counter() - start
+            stats["embeddings"] += len(texts)
+
+            upserts, i = [], 0
+            for _, _, records in group:
+                for vector_id, _, metadata in records:
+                    upserts.append((vector_id, vectors[i].tolist(), metadata))
+                    i += 1
+            start = time.perf_counter()
+            self._upsert(pool, upserts, stats)
+            stats["upsert_s"] += time.perf_counter() - start
+
+        # 새 청크가 모두 올라간 뒤 이전 청크 삭제 (검색 공백 없음)
+        stale = []
+        for filename, digest, records in group:
+            new_ids = [vector_id for vector_id, _, _ in records]
+            current = set(new_ids)
+            previous = manifest["files"].get(filename, {}).get("chunk_ids", [])
+            stale.extend(vector_id for vector_id in previous if vector_id not in current)
+            manifest["files"][filename] = {
+                "hash": digest,
+                "chunk_ids": new_ids,
+                "ingested_at": datetime.now().isoformat()
+            }
+        self._delete(stale, stats)
+        self.save_manifest(manifest)
+
+    def _delete(self, ids: List[str], stats: Dict[str, Any]):
+        for i in range(0, len(ids), self.upsert_batch_size):
+            batch = ids[i:i + self.upsert_batch_size]
+            with_backoff(lambda: self.vector_store.delete(ids=batch),
+                         Config.BATCH_MAX_RETRIES, 0.5, 30.0, stats)
+            stats["deleted_chunks"] += len(batch)
+
+    def run(self, root: str, full: bool = False, prune: bool = True,
+            prune_unknown: bool = False, dry_run: bool = False) -> Dict[str, Any]:
+        """
+        폴더 수집
+
+        Args:
+            root: 마크다운 폴더
+            full: 내용 해시와 무관하게 모든 파일 재수집
+            prune: 폴더에서 사라진 파일의 청크 삭제
+            prune_unknown: manifest에 없는 벡터(이전 방식으로 올린 문서 단위 벡터 등) 삭제
+            dry_run: 변경 대상만 계산하고 업로드하지 않음
+
+        Returns:
+            수집 통계 (파일/청크 수, 소요 시간, 초당 문서/임베딩 수)
+        """
+        start = time.perf_counter()
+        manifest = self.load_manifest()
+        full = full or manifest.get("stale", False)
+        documents = scan_documents(root)
+        stats = {"files": len(documents), "changed": 0, "unchanged": 0, "removed": 0,
+                 "chunks": 0, "embeddings": 0, "deleted_chunks": 0, "retries": 0, "rate_limited": 0,
+                 "encode_s": 0.0, "upsert_s": 0.0}
+
+        removed = [filename for filename in manifest["files"] if filename not in documents]
+        group: List[Tuple[str, str, list]] = []
+        group_chunks = 0
+        with ThreadPoolExecutor(max_workers=self.upsert_concurrency, thread_name_prefix="upsert") as pool:
+            for filename, path in documents.items():
+                with open(path, encoding="utf-8") as f:
+                    text = f.read()
+                digest = content_hash(text)
+                if not full and manifest["files"].get(filename, {}).get("hash") == digest:
+                    stats["unchanged"] += 1
+                    continue
+
+                stats["changed"] += 1
+                _, records = self._records(filename, text)
+                stats["chunks"] += len(records)
+                if dry_run:
+                    logger.info(f"변경: {filename} ({len(records)}개 청크)")
+                    continue
+                group.append((filename, digest, records))
+                group_chunks += len(records)
+                if group_chunks >= self.encode_group_size:
+                    self._flush(group, manifest, pool, stats)
+                    group, group_chunks = [], 0
+                    self._report(stats, start)
+
+            if group and not dry_run:
+                self._flush(group, manifest, pool, stats)
+
+        if prune and removed and not dry_run:
+            ids = [vector_id for filename in removed for vector_id in manifest["files"][filename]["chunk_ids"]]
+            self._delete(ids, stats)
+            for filename in removed:
+                del manifest["files"][filename]
+            self.save_manifest(manifest)
+        stats["removed"] = len(removed)
+
+        if prune_unknown and not dry_run:
+            known = {vector_id for entry in manifest["files"].values() for vector_id in entry["chunk_ids"]}
+            unknown = [vector_id for page in self.vector_store.list(limit=100)
+                       for vector_id in page if vector_id not in known]
+            self._delete(unknown, stats)
+
+        if not dry_run:
+            self.vector_store.persist()
+        self._report(stats, start, final=True)
+        return stats
+
+    @staticmethod
+    def _report(stats: Dict[str, Any], start: float, final: bool = False):
+        elapsed = time.perf_counter() - start
+        stats["elapsed_s"] = elapsed
+        stats["docs_per_sec"] = stats["changed"] / elapsed if elapsed > 0 else 0.0
+        stats["embeddings_per_sec"] = stats["embeddings"] / stats["encode_s"] if stats["encode_s"] > 0 else 0.0
+        prefix = "수집 완료" if final else "수집 중"
+        logger.info(f"{prefix}: 변경 {stats['changed']}/{stats['files']}개 파일, {stats['embeddings']}개 임베딩 - "
+                    f"{stats['docs_per_sec']:.1f}문서/초, {stats['embeddings_per_sec']:.1f}임베딩/초")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="마크다운 문서 증분 수집")
+    parser.add_argument("path", nargs="?", default=Config.DATABASE_PATH, help="마크다운 폴더 (기본: RAG_DATABASE_PATH)")
+    parser.add_argument("--batch-size", type=int, default=Config.INGEST_BATCH_SIZE, help="임베딩 배치 크기")
+    parser.add_argument("--workers", type=int, default=Config.INGEST_WORKERS, help="임베딩 프로세스 수")
+    parser.add_argument("--upsert-batch-size", type=int, default=Config.INGEST_UPSERT_BATCH_SIZE)
+    parser.add_argument("--upsert-concurrency", type=int, default=Config.INGEST_UPSERT_CONCURRENCY)
+    parser.add_argument("--manifest", default=Config.INGEST_MANIFEST_PATH, help="수집 manifest 경로")
+    parser.add_argument("--full", action="store_true", help="모든 파일 재수집")
+    parser.add_argument("--no-prune", action="store_true", help="사라진 파일의 청크를 삭제하지 않음")
+    parser.add_argument("--prune-unknown", action="store_true",
+                        help="manifest에 없는 벡터 삭제 (문서 단위 벡터에서 청크 벡터로 전환 시)")
+    parser.add_argument("--dry-run", action="store_true", help="변경 대상만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+    if not args.path or not os.path.isdir(args.path):
+        parser.error("마크다운 폴더를 지정하거나 RAG_DATABASE_PATH를 설정하세요.")
+
+    from embedding_backend import create_embedding_model
+    from vector_store import create_vector_store
+
+    vector_store = create_vector_store(Config.VECTOR_STORE, Config.PINECONE_API_KEY, Config.PINECONE_INDEX_NAME)
+    ingester = Ingester(
+        vector_store,
+        create_embedding_model(Config.EMBEDDING_MODEL, backend=Config.EMBEDDING_BACKEND,
+                               threads=Config.EMBEDDING_THREADS, onnx_path=Config.EMBEDDING_ONNX_PATH,
+                               onnx_file=Config.EMBEDDING_ONNX_FILE),
+        MarkdownChunker(Config.CHUNK_MAX_TOKENS, Config.CHUNK_OVERLAP_TOKENS),
+        manifest_path=args.manifest,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        upsert_batch_size=args.upsert_batch_size,
+        upsert_concurrency=args.upsert_concurrency
+    )
+    try:
+        stats = ingester.run(args.path, full=args.full, prune=not args.no_prune,
+                             prune_unknown=args.prune_unknown, dry_run=args.dry_run)
+    finally:
+        ingester.close()
+    print(f"✅ 변경 {stats['changed']}개 / 유지 {stats['unchanged']}개 / 삭제 {stats['removed']}개 파일, "
+          f"{stats['embeddings']}개 임베딩 - {stats['elapsed_s']:.1f}초, "
+          f"{stats['docs_per_sec']:.1f}문서/초, {stats['embeddings_per_sec']:.1f}임베딩/초")
+
+
+if __name__ == "__main__":
+    main()
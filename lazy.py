@@ -0,0 +1,99 @@
+"""
+지연 초기화 구성 요소
+
+E5 모델, 벡터 저장소 연결, 코퍼스/BM25처럼 만드는 데 수 초가 걸리는 구성 요소를 처음
+사용할 때 또는 백그라운드 스레드에서 생성합니다. 상태(pending, loading, ready,
+failed)와 소요 시간을 UI에 보여 줄 수 있고, 실패한 구성 요소는 다음 사용 시 다시
+시도합니다.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class LazyComponent:
+    """처음 get() 호출 또는 start()로 한 번만 생성되는 값"""
+
+    def __init__(self, name: str, factory: Optional[Callable[[], Any]] = None, value: Any = None):
+        """
+        Args:
+            name: 구성 요소 이름 (로그와 UI 표시용)
+            factory: 값을 만드는 함수 (인자 없음)
+            value: factory 없이 이미 준비된 값
+        """
+        self.name = name
+        self._factory = factory
+        self._value = value
+        self._lock = threading.Lock()
+        self._thread_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.state = READY if factory is None else PENDING
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def get(self) -> Any:
+        """값 반환 (아직 없으면 생성, 다른 스레드가 생성 중이면 완료까지 대기)"""
+        if self.state == READY:
+            return self._value
+        with self._lock:
+            if self.state != READY:
+                self._load()
+        return self._value
+
+    def _load(self):
+        self.state = LOADING
+        self.error = None
+        self.started_at = time.perf_counter()
+        logger.info(f"{self.name} 로딩 시작")
+        try:
+            self._value = self._factory()
+        except Exception as e:
+            self.state = FAILED
+            self.error = str(e)
+            logger.error(f"{self.name} 로딩 실패: {e}")
+            raise
+        self.load_seconds = time.perf_counter() - self.started_at
+        self.state = READY
+        logger.info(f"{self.name} 로딩 완료 ({self.load_seconds:.1f}초)")
+
+    def start(self) -> threading.Thread:
+        """백그라운드 스레드에서 생성 시작 (이미 진행 중이면 기존 스레드 반환)"""
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                def _run():
+                    try:
+                        self.get()
+                    except Exception:
+                        pass  # 상태와 오류 메시지는 _load에서 기록
+
+                self._thread = threading.Thread(target=_run, name=f"load-{self.name}", daemon=True)
+                self._thread.start()
+            return self._thread
+
+    def set(self, value: Any):
+        """값을 직접 지정 (준비된 값으로 교체, 생성 중이면 생성이 끝난 뒤 교체)"""
+        with self._lock:
+            self._value = value
+            self.state = READY
+            self.error = None
+
+    def status(self) -> Dict[str, Any]:
+        """UI 표시용 상태"""
+        elapsed = self.load_seconds
+        if self.state == LOADING and self.started_at is not None:
+            elapsed = time.perf_counter() - self.started_at
+        return {"state": self.state, "seconds": elapsed, "error": self.error}
@@ -0,0 +1,278 @@
+"""
+RAG 파이프라인 지연 시간/카운터 지표와 요청별 추적
+
+    with trace.span("embedding"):
+        vector = model.encode(...)
+
+요청마다 Trace를 만들어 단계(span)별 시작 시각과 소요 시간을 기록하고, 같은 값을
+프로세스 전역 레지스트리의 단계별 히스토그램(rag_stage_seconds)에도 넣습니다.
+레지스트리는 캐시 적중, 오류, 토큰 사용량 카운터를 함께 보관하며 Prometheus 텍스트
+형식으로 내보냅니다 (HTTP 엔드포인트 또는 node_exporter textfile용 파일).
+"""
+
+import os
+import time
+import uuid
+import bisect
+import logging
+import threading
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# 히스토그램 버킷 상한 (초): BM25(수 ms)부터 GPT 생성(수십 초)까지
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, value in pairs)
+    return "{" + ",".join(f'{key}="{value}"' for (key, _), value in zip(pairs, escaped)) + "}"
+
+
+class Histogram:
+    """누적 버킷(Prometheus 내보내기)과 최근 샘플 창(p50/p95/p99)을 함께 유지"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS, window: int = 2048):
+        self.buckets = buckets
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.recent = deque(maxlen=window)
+
+    def observe(self, value: float):
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.recent.append(value)
+
+    def summary(self) -> Dict[str, float]:
+        """최근 창 기준 백분위 (밀리초)"""
+        if not self.recent:
+            return {"count": self.count}
+        values = np.asarray(self.recent, dtype=np.float64) * 1000
+        p50, p95, p99 = np.percentile(values, [50, 95, 99])
+        return {
+            "count": self.count,
+            "mean_ms": self.sum / self.count * 1000,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99)
+        }
+
+
+class MetricsRegistry:
+    """프로세스 전역 카운터/히스토그램 (스레드 안전)"""
+
+    def __init__(self, window: int = 2048):
+        self.window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+        self._help: Dict[str, str] = {}
+        self._collectors: List[Callable[[], Dict[str, Tuple[Dict[str, Any], float]]]] = []
+        self._last_write = 0.0
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    def inc(self, name: str, value: float = 1.0, **labels):
+        """카운터 증가"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        """히스토그램에 값(초) 기록"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(window=self.window)
+            histogram.observe(value)
+
+    def add_collector(self, collector: Callable[[], List[Tuple[str, Dict[str, Any], float]]]):
+        """내보낼 때마다 호출해 게이지 값을 수집하는 함수 등록 (캐시 크기/적중 수 등)"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def remove_collector(self, collector: Callable[[], List[Tuple[str, Dict[str, Any], float]]]):
+        """add_collector로 등록한 함수 제거 (등록한 객체를 닫을 때 호출, 없으면 무시)"""
+        with self._lock:
+            if collector in self._collectors:
+                self._collectors.remove(collector)
+
+    def counter(self, name: str, **labels) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0.0)
+
+    def summary(self, name: str = "rag_stage_seconds", label: str = "stage") -> Dict[str, Dict[str, float]]:
+        """히스토그램 라벨별 백분위 요약 (예: 단계별 p50/p95/p99)"""
+        with self._lock:
+            return {dict(key).get(label, ""): histogram.summary()
+                    for key, histogram in self._histograms.get(name, {}).items()}
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 노출 형식"""
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {value:g}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + (float("inf"),), histogram.bucket_counts):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                        lines.append(f"{name}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {histogram.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+            collectors = list(self._collectors)
+
+        # 같은 이름/라벨의 게이지는 나중에 등록된 수집 함수 값 하나만 내보냄 (중복 시계열 방지)
+        gauges: Dict[str, Dict[Labels, float]] = {}
+        for collector in collectors:
+            try:
+                for name, labels, value in collector():
+                    gauges.setdefault(name, {})[_labels(labels)] = value
+            except Exception as e:
+                logger.warning(f"지표 수집 실패: {e}")
+        for name, series in sorted(gauges.items()):
+            lines.append(f"# HELP {name} {self._help.get(name, name)}")
+            lines.append(f"# TYPE {name} gauge")
+            for key, value in sorted(series.items()):
+                lines.append(f"{name}{_format_labels(key)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_file(self, path: str, min_interval: float = 0.0):
+        """텍스트 파일로 내보내기 (min_interval초 이내 재호출은 무시, 임시 파일에 쓴 뒤 교체)"""
+        now = time.monotonic()
+        if now - self._last_write < min_interval:
+            return
+        self._last_write = now
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"지표 파일 저장 실패: {e}")
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe("rag_stage_seconds", "RAG 파이프라인 단계별 소요 시간 (초)")
+REGISTRY.describe("rag_requests_total", "RAG 질의 수")
+REGISTRY.describe("rag_cache_hits_total", "캐시 적중 수")
+REGISTRY.describe("rag_errors_total", "단계별 오류 수")
+REGISTRY.describe("rag_timeouts_total", "검색기 제한 시간 초과 수")
+REGISTRY.describe("rag_tokens_total", "GPT 토큰 사용량")
+REGISTRY.describe("rag_cache_size", "캐시 항목 수")
+REGISTRY.describe("rag_cache_object_hits", "캐시 적중 수 (캐시 객체 기준)")
+REGISTRY.describe("rag_cache_object_misses", "캐시 미스 수 (캐시 객체 기준)")
+REGISTRY.describe("rag_cache_object_evictions", "캐시 용량 초과로 제거된 항목 수")
+
+
+class Trace:
+    """요청 하나의 단계별 span 기록 (검색 스레드에서 동시에 기록 가능)"""
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.trace_id = uuid.uuid4().hex[:16]
+        self.registry = registry
+        self.start = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """단계 소요 시간 기록 (예외가 나면 오류 카운터 증가 후 다시 발생)"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(name, start, time.perf_counter() - start, error)
+
+    def record(self, name: str, start: float, duration: float, error: Optional[str] = None):
+        """이미 측정한 구간 기록 (start는 time.perf_counter 값)"""
+        span = {"name": name, "start_ms": (start - self.start) * 1000, "duration_ms": duration * 1000}
+        if error:
+            span["error"] = error
+            self.registry.inc("rag_errors_total", stage=name, type=error)
+        with self._lock:
+            self.spans.append(span)
+        self.registry.observe("rag_stage_seconds", duration, stage=name)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span["start_ms"])
+        return {"trace_id": self.trace_id, "spans": spans}
+
+
+@contextmanager
+def span(trace: Optional[Trace], name: str) -> Iterator[None]:
+    """trace가 없어도(단독 호출) 단계 히스토그램에는 기록"""
+    with (trace if trace is not None else Trace()).span(name):
+        yield
+
+
+# === 내보내기 ===
+_server: Optional[ThreadingHTTPServer] = None
+_server_lock = threading.Lock()
+
+
+def start_http_server(port: int, host: str = "0.0.0.0",
+                      registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """/metrics 텍스트 엔드포인트를 데몬 스레드로 시작 (프로세스당 한 번)"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_error(404)
+                    return
+                body = registry.to_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        _server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=_server.serve_forever, name="metrics-http", daemon=True).start()
+        logger.info(f"지표 엔드포인트: http://{host}:{port}/metrics")
+        return _server
@@ -0,0 +1,217 @@
+"""
+빠른 질문 답변 미리 계산
+
+사이드바 빠른 질문(Config.get_sidebar_quick_questions)은 미리 알려진 고정 질문이므로, 시작할 때 모든 질문의
+검색 결과와 답변을 계산해 두고 버튼을 누르면 바로 돌려줍니다. 백그라운드 스레드가 주기적으로
+코퍼스 버전 변경과 만료(TTL)를 확인해 해당 답변을 다시 계산합니다.
+
+    quick = get_shared_quick_answers(rag_system)
+    result = quick.get(question, vector_weight=0.6, bm25_weight=0.4)  # 없으면 None → rag_query
+
+미리 계산한 답변은 기본 검색 설정(Config.VECTOR_WEIGHT 등)으로 만든 것이므로, 요청 설정이
+다르면 None을 반환합니다. 만료된 답변은 다시 계산되는 동안 그대로 제공하고, 코퍼스 버전이
+바뀐 답변은 제공하지 않습니다.
+"""
+
+import time
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+
+from config import Config
+from cache import normalize_query
+from metrics import REGISTRY, Trace
+from rag_system import ANSWER_ERROR_MESSAGE, RAGSystem
+
+logger = logging.getLogger(__name__)
+
+REGISTRY.describe("rag_quick_answer_refreshes_total", "빠른 질문 답변 재계산 수")
+
+
+class QuickAnswers:
+    """빠른 질문의 답변과 검색 결과를 미리 계산해 두는 저장소"""
+
+    def __init__(self, rag_system: RAGSystem, questions: Optional[List[str]] = None,
+                 ttl: float = Config.QUICK_ANSWER_TTL,
+                 refresh_interval: float = Config.QUICK_ANSWER_REFRESH_INTERVAL):
+        """
+        Args:
+            rag_system: 답변을 계산할 RAG 시스템
+            questions: 미리 계산할 질문 (없으면 사이드바에 표시하는 Config.get_sidebar_quick_questions())
+            ttl: 답변 유효 시간 (초)
+            refresh_interval: 백그라운드 확인 주기 (초)
+        """
+        self.rag = rag_system
+        self.questions = list(questions or Config.get_sidebar_quick_questions())
+        self.ttl = ttl
+        self.refresh_interval = refresh_interval
+        self.options = {
+            'vector_weight': Config.VECTOR_WEIGHT,
+            'bm25_weight': Config.BM25_WEIGHT,
+            'final_top_k': Config.FINAL_TOP_K,
+            'model': Config.GPT_MODEL,
+            'fusion': Config.FUSION_METHOD
+        }
+        # 정규화된 질문 -> {'result', 'corpus_version', 'created_at'}
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def _state(self, entry: Optional[Dict[str, Any]]) -> str:
+        """답변 상태: missing, outdated(코퍼스 변경), expired(TTL 만료), fresh"""
+        if entry is None:
+            return "missing"
+        if entry['corpus_version'] != self.rag.corpus_fingerprint:
+            return "outdated"
+        if time.time() - entry['created_at'] > self.ttl:
+            return "expired"
+        return "fresh"
+
+    def _matches(self, options: Dict[str, Any]) -> bool:
+        """요청 검색 설정이 미리 계산한 설정과 같은지"""
+        for key, value in options.items():
+            if value is None:
+                continue
+            expected = self.options[key]
+            if isinstance(expected, float):
+                if abs(float(value) - expected) > 1e-6:
+                    return False
+            elif value != expected:
+                return False
+        return True
+
+    def stale_questions(self) -> List[str]:
+        """다시 계산해야 하는 질문 (없거나 코퍼스 버전이 다르거나 만료됨)"""
+        with self._lock:
+            return [question for question in self.questions
+                    if self._state(self._entries.get(normalize_query(question))) != "fresh"]
+
+    def refresh(self, force: bool = False) -> int:
+        """
+        오래된 답변 다시 계산 (동시에 한 번만 실행)
+
+        Args:
+            force: 모든 질문 다시 계산
+
+        Returns:
+            새로 계산한 답변 수
+        """
+        with self._refresh_lock:
+            questions = self.questions if force else self.stale_questions()
+            refreshed = 0
+            for question in questions:
+                if self._stop.is_set():
+                    break
+                self.rag.wait_for_corpus()
+                version = self.rag.corpus_fingerprint
+                try:
+                    result = self.rag.rag_query(question, use_cache=False, **self.options)
+                except Exception as e:
+                    logger.warning(f"빠른 질문 답변 계산 실패 ({question}): {e}")
+                    continue
+                if result['answer'] == ANSWER_ERROR_MESSAGE:
+                    logger.warning(f"빠른 질문 답변 생성 실패, 기존 답변 유지: {question}")
+                    continue
+                with self._lock:
+                    self._entries[normalize_query(question)] = {
+                        'result': result, 'corpus_version': version, 'created_at': time.time()
+                    }
+                refreshed += 1
+            self.refreshes += refreshed
+            if refreshed:
+                REGISTRY.inc("rag_quick_answer_refreshes_total", refreshed)
+                logger.info(f"빠른 질문 답변 {refreshed}개 계산 완료")
+            return refreshed
+
+    def get(self, question: str, **options) -> Optional[Dict[str, Any]]:
+        """
+        미리 계산한 답변 반환 (rag_query 결과 형식, 'precomputed': True)
+
+        Args:
+            question: 질문
+            options: rag_query 검색 설정 (vector_weight, bm25_weight, final_top_k, model, fusion)
+
+        Returns:
+            답변 결과 (미리 계산한 질문/설정이 아니거나 코퍼스가 바뀌었으면 None)
+        """
+        trace = Trace()
+        start = trace.start
+        with self._lock:
+            entry = self._entries.get(normalize_query(question))
+            state = self._state(entry)
+        if state != "fresh":
+            # 다음 확인 주기를 기다리지 않고 바로 다시 계산
+            self._wake.set()
+        if state in ("missing", "outdated") or not self._matches(options):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        REGISTRY.inc("rag_cache_hits_total", cache="quick")
+        total = RAGSystem._finish_trace(trace, start)
+        return {**entry['result'], 'query': question, 'cached': True, 'precomputed': True,
+                'timings': {'total': total}, 'trace': trace.to_dict()}
+
+    def _run(self):
+        while not self._stop.is_set():
+            if Config.QUICK_ANSWER_CHECK_CORPUS and self.rag.corpus_fingerprint is not None:
+                try:
+                    # 벡터 수가 바뀐 경우에만 ID 전체를 나열해 지문 비교
+                    self.rag.refresh_corpus(check_count_first=True)
+                except Exception as e:
+                    logger.warning(f"코퍼스 변경 확인 실패: {e}")
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"빠른 질문 답변 갱신 실패: {e}")
+            self._wake.wait(self.refresh_interval)
+            self._wake.clear()
+
+    def start(self) -> threading.Thread:
+        """백그라운드 계산/갱신 스레드 시작 (중복 호출 시 기존 스레드 반환)"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="quick-answers", daemon=True)
+                self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """백그라운드 스레드 종료 (진행 중인 질문 계산은 마침)"""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            states = [self._state(self._entries.get(normalize_query(question))) for question in self.questions]
+        return {
+            'questions': len(self.questions),
+            'fresh': states.count("fresh"),
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes
+        }
+
+
+# 프로세스당 하나 (Streamlit 세션이 공유)
+_shared_quick_answers: Optional[QuickAnswers] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_quick_answers(rag_system: RAGSystem) -> QuickAnswers:
+    """프로세스 전역 빠른 질문 저장소 반환 (최초 호출 시 생성하고 백그라운드 계산 시작)"""
+    global _shared_quick_answers
+    if _shared_quick_answers is None:
+        with _shared_lock:
+            if _shared_quick_answers is None:
+                _shared_quick_answers = QuickAnswers(rag_system)
+                _shared_quick_answers.start()
+    return _shared_quick_answers
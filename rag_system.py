@@ -1,172 +1,550 @@
 import os
-import re
 import numpy as np
-from sentence_transformers import SentenceTransformer
-from pinecone import Pinecone
-from rank_bm25 import BM25Okapi
-import openai
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 
+from config import Config
+from corpus_loader import CorpusLoader
+from bm25_index import BM25Index
+from document_store import DocumentStore
+from tokenizer import Tokenizer, tokenize_many
+from chunking import MarkdownChunker, chunk_id, content_hash
+from context_builder import ContextBuilder
+from fusion import fuse
+from vector_store import create_vector_store
+from embedding_backend import create_embedding_model, model_id
+from lazy import LazyComponent
+from metrics import REGISTRY, Trace, span, start_http_server
+from singleflight import SingleFlight
+import snapshot
+import batch_query
+from cache import AnswerCache, EmbeddingCache, SemanticCache
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 답변 생성 실패 시 반환 메시지 (캐시하지 않음)
+ANSWER_ERROR_MESSAGE = "죄송합니다. 답변 생성 중 오류가 발생했습니다."
+
 class RAGSystem:
-    """유니베라 RAG 시스템 클래스"""
+    """유니베라 RAG 시스템 클래스
+
+    인스턴스는 읽기 전용 인덱스(E5 모델, 벡터 저장소, BM25)만 보관하므로
+    여러 세션/스레드에서 동시에 공유할 수 있습니다. 채팅 기록과 가중치 같은
+    세션별 상태는 호출 측(Streamlit 세션)에서 관리합니다.
+    """
     
-    def __init__(self, pinecone_api_key: str, pinecone_index_name: str, openai_api_key: str):
+    def __init__(self, pinecone_api_key: str, pinecone_index_name: str, openai_api_key: str,
+                 enable_snapshot: Optional[bool] = None):
         """
         RAG 시스템 초기화
         
+        OpenAI 클라이언트, E5 모델, 벡터 저장소, 코퍼스/BM25는 처음 사용할 때 또는
+        start_loading()이 띄운 백그라운드 스레드에서 생성되므로 생성자는 바로 반환됩니다.
+        
         Args:
             pinecone_api_key: Pinecone API 키
             pinecone_index_name: Pinecone 인덱스 이름
             openai_api_key: OpenAI API 키
+            enable_snapshot: 코퍼스/BM25 디스크 스냅샷 사용 여부 (없으면 Config.ENABLE_SNAPSHOT)
         """
-        # OpenAI 클라이언트 초기화
-        logger.info("OpenAI 클라이언트 초기화 중...")
-        self.openai_client = openai.OpenAI(api_key=openai_api_key)
+        self.enable_snapshot = Config.ENABLE_SNAPSHOT if enable_snapshot is None else enable_snapshot
+        
+        # OpenAI 클라이언트 (openai 패키지 import만 1초 가까이 걸려 지연 생성)
+        self._openai_client = LazyComponent(
+            "OpenAI 클라이언트", lambda: self._create_openai_client(openai_api_key)
+        )
+        
+        # E5 벡터 모델 (Config.EMBEDDING_BACKEND)
+        self._model = LazyComponent("E5 모델", lambda: create_embedding_model(
+            Config.EMBEDDING_MODEL,
+            backend=Config.EMBEDDING_BACKEND,
+            threads=Config.EMBEDDING_THREADS,
+            onnx_path=Config.EMBEDDING_ONNX_PATH,
+            onnx_file=Config.EMBEDDING_ONNX_FILE
+        ))
+        # HF fast tokenizer는 스레드 간 동시 호출을 지원하지 않으므로 인코딩을 직렬화
+        self._encode_lock = threading.Lock()
+        
+        # 질의 임베딩 캐시 (LRU + TTL)
+        self.embedding_cache = EmbeddingCache(
+            model_name=model_id(Config.EMBEDDING_MODEL, Config.EMBEDDING_BACKEND, Config.EMBEDDING_ONNX_FILE),
+            max_size=Config.MAX_CACHE_SIZE,
+            ttl=Config.CACHE_TTL,
+            path=Config.EMBEDDING_CACHE_PATH
+        )
+        
+        # rag_query 결과 캐시 (메모리 + 선택적 SQLite 공유 계층)
+        self.answer_cache = AnswerCache(
+            max_size=Config.MAX_CACHE_SIZE,
+            ttl=Config.CACHE_TTL,
+            db_path=Config.ANSWER_CACHE_DB_PATH
+        )
+        # 표현만 다른 같은 질문용 의미 캐시 (질의 임베딩 유사도, 설정 시 사용)
+        self.semantic_cache = SemanticCache(
+            max_size=Config.SEMANTIC_CACHE_SIZE,
+            threshold=Config.SEMANTIC_CACHE_THRESHOLD,
+            ttl=Config.CACHE_TTL
+        )
+        self._refresh_lock = threading.Lock()
+        # 처리 중인 동일 rag_query 병합 (빠른 질문 동시 클릭 등)
+        self._inflight = SingleFlight("rag_query")
+        # 캐시 크기/적중 수는 지표를 내보낼 때 게이지로 수집
+        REGISTRY.add_collector(self._cache_gauges)
+        
+        # 벡터 검색(네트워크 대기)과 BM25(CPU)를 겹쳐 실행하기 위한 스레드 풀
+        self._retrieval_pool = ThreadPoolExecutor(
+            max_workers=Config.RETRIEVAL_WORKERS,
+            thread_name_prefix="retrieval"
+        )
         
-        # E5 벡터 모델 로드
-        logger.info("E5 모델 로딩 중...")
-        self.model = SentenceTransformer("intfloat/multilingual-e5-base")
+        # BM25 토크나이저 (모드 변경 시 디스크 스냅샷이 무효화됨)
+        self.tokenizer = Tokenizer(Config.TOKENIZER_MODE)
+        # 문서 청커 (벡터/BM25 모두 청크 단위로 검색하고 문서 단위로 집계)
+        self.chunker = MarkdownChunker(Config.CHUNK_MAX_TOKENS, Config.CHUNK_OVERLAP_TOKENS)
+        # GPT 컨텍스트 구성 (토큰 예산, 중복 문단 제거)
+        self.context_builder = ContextBuilder(Config.CONTEXT_TOKEN_BUDGET, Config.CONTEXT_DEDUP_THRESHOLD)
         
-        # Pinecone 연결
-        logger.info("Pinecone 연결 중...")
-        self.pc = Pinecone(api_key=pinecone_api_key)
-        self.pinecone_index = self.pc.Index(pinecone_index_name)
+        # 벡터 저장소 연결 (Config.VECTOR_STORE: Pinecone 또는 로컬 인덱스)
+        self._vector_store = LazyComponent(
+            f"벡터 저장소({Config.VECTOR_STORE})",
+            lambda: create_vector_store(Config.VECTOR_STORE, pinecone_api_key, pinecone_index_name)
+        )
         
-        # Pinecone에서 문서 정보 가져오기
-        self.documents = []
-        self.filenames = []
-        self.load_documents_from_pinecone()
+        # 코퍼스/BM25 (디스크 스냅샷이 최신이면 그대로 사용, 아니면 벡터 저장소에서 다시 구축)
+        self.store = DocumentStore(compression_level=Config.DOCUMENT_COMPRESSION_LEVEL)
+        self.bm25 = None
+        self.corpus_fingerprint = None
+        # store/bm25/corpus_fingerprint는 항상 함께 교체 (BM25 문서 번호가 store.keys 순서를 따름)
+        self._corpus_lock = threading.Lock()
+        self._corpus = LazyComponent("코퍼스/BM25", self._load_corpus)
+        self._loader: Optional[threading.Thread] = None
+        self._loader_lock = threading.Lock()
+    
+    def close(self):
+        """지표 수집 등록 해제와 검색 스레드 풀 종료 (같은 프로세스에서 시스템을 여러 번 만들 때)"""
+        REGISTRY.remove_collector(self._cache_gauges)
+        self._retrieval_pool.shutdown(wait=False)
+    
+    @staticmethod
+    def _create_openai_client(openai_api_key: str):
+        import openai
         
-        # BM25 인덱스 구축
-        self.build_bm25()
+        return openai.OpenAI(api_key=openai_api_key, base_url=Config.OPENAI_BASE_URL)
+    
+    # 지연 생성 구성 요소 (직접 대입하면 준비된 값으로 교체)
+    @property
+    def openai_client(self):
+        return self._openai_client.get()
+    
+    @openai_client.setter
+    def openai_client(self, client):
+        self._openai_client.set(client)
+    
+    @property
+    def model(self):
+        return self._model.get()
+    
+    @model.setter
+    def model(self, model):
+        self._model.set(model)
+    
+    @property
+    def vector_store(self):
+        return self._vector_store.get()
+    
+    @vector_store.setter
+    def vector_store(self, vector_store):
+        self._vector_store.set(vector_store)
+    
+    def _load_corpus(self) -> bool:
+        """스냅샷 로드 또는 벡터 저장소에서 코퍼스/BM25 구축"""
+        # 연결 실패 시 빈 코퍼스로 준비 완료 처리하지 않고 실패로 남겨 다음 사용 시 재시도
+        self._vector_store.get()
+        if not self.load_snapshot():
+            # 벡터 저장소에서 문서 정보를 가져와 BM25 인덱스 구축 (실패 시 예외)
+            self._swap_corpus(*self._build_corpus())
+            self.save_snapshot()
         
-        logger.info(f"RAG 시스템 준비 완료: {len(self.documents)}개 문서 (Pinecone 기반)")
+        logger.info(f"RAG 시스템 준비 완료: {self.store.parent_count}개 문서, "
+                    f"{len(self.store)}개 청크 ({Config.VECTOR_STORE} 기반)")
+        return True
+    
+    def _require_corpus(self):
+        """코퍼스/BM25가 아직 없으면 구축 (다른 스레드가 구축 중이면 대기)"""
+        self._corpus.get()
     
-    def load_documents_from_pinecone(self):
-        """Pinecone에서 문서 정보 로드"""
-        logger.info("Pinecone에서 문서 정보 로딩 중...")
+    def wait_for_corpus(self):
+        """
+        코퍼스/BM25가 준비될 때까지 대기 (아직 시작 전이면 호출한 스레드에서 구축)
+        
+        이 클래스 밖에서 검색 전에 코퍼스 버전(corpus_fingerprint)이 필요할 때 사용합니다.
+        구축에 실패하면 예외가 전달되고, 상태는 readiness()['corpus']에 남습니다.
+        """
+        self._require_corpus()
+    
+    def components(self) -> Dict[str, LazyComponent]:
+        """지연 생성 구성 요소"""
+        return {
+            'openai': self._openai_client,
+            'model': self._model,
+            'vector_store': self._vector_store,
+            'corpus': self._corpus
+        }
+    
+    def readiness(self) -> Dict[str, Dict[str, Any]]:
+        """구성 요소별 준비 상태 (UI 표시용, 블로킹 없음)"""
+        return {key: {'name': component.name, **component.status()}
+                for key, component in self.components().items()}
+    
+    @property
+    def is_ready(self) -> bool:
+        return all(component.ready for component in self.components().values())
+    
+    def start_loading(self, warmup: bool = True) -> threading.Thread:
+        """
+        모든 구성 요소를 백그라운드에서 생성 (중복 호출 시 기존 스레드 반환)
+        
+        모델 로딩(CPU/디스크)과 벡터 저장소 연결/코퍼스 구축(네트워크)을 서로 다른
+        스레드에서 겹쳐 실행하고, 모두 준비되면 예열합니다.
+        """
+        with self._loader_lock:
+            if self._loader is None or (not self._loader.is_alive() and not self.is_ready):
+                def _run():
+                    threads = [component.start() for component in self.components().values()]
+                    for thread in threads:
+                        thread.join()
+                    if warmup and self.is_ready:
+                        self.warmup()
+                
+                self._loader = threading.Thread(target=_run, name="rag-loader", daemon=True)
+                self._loader.start()
+        return self._loader
+    
+    def _swap_corpus(self, store: DocumentStore, bm25: Optional[BM25Index], fingerprint: Optional[str]):
+        """코퍼스, BM25 색인, 지문을 한 번에 교체"""
+        with self._corpus_lock:
+            self.store, self.bm25, self.corpus_fingerprint = store, bm25, fingerprint
+    
+    def _corpus_view(self) -> Tuple[DocumentStore, Optional[BM25Index]]:
+        """서로 맞는 (코퍼스, BM25 색인) 쌍 (검색 중 교체되어도 섞이지 않도록)"""
+        with self._corpus_lock:
+            return self.store, self.bm25
+    
+    def _build_corpus(self) -> Tuple[DocumentStore, Optional[BM25Index], Optional[str]]:
+        """벡터 저장소에서 새 (코퍼스, BM25 색인, 지문) 구축 (현재 코퍼스는 그대로, 실패 시 예외)"""
+        store, fingerprint = self.load_documents_from_pinecone()
+        return store, self.build_bm25(store), fingerprint
+    
+    def load_documents_from_pinecone(self) -> Tuple[DocumentStore, Optional[str]]:
+        """
+        벡터 저장소(Pinecone 또는 로컬)에서 전체 문서 정보를 페이지 단위로 스트리밍 로드
+        
+        새 저장소를 만들어 반환할 뿐 현재 코퍼스는 바꾸지 않습니다 (교체는 _swap_corpus).
+        
+        Returns:
+            (문서 저장소, 인덱스 지문) - 로드 중 오류는 그대로 전파
+        """
+        logger.info("벡터 저장소에서 문서 정보 로딩 중...")
+        store = DocumentStore(compression_level=Config.DOCUMENT_COMPRESSION_LEVEL)
+        
+        def add_record(vector_id: str, metadata: Dict[str, Any]) -> bool:
+            filename = metadata.get('filename')
+            if not filename:
+                return False
+            if 'chunk_index' in metadata:
+                # 청크 단위로 색인된 벡터: 벡터 ID가 곧 청크 ID
+                return store.add(vector_id, metadata.get('text', ''), parent=filename)
+            # 문서 전체가 하나의 벡터인 경우 BM25용 청크는 로컬에서 생성 (중복 파일명은 무시)
+            if store.children(filename):
+                return False
+            added = False
+            for chunk in self.chunker.split(metadata.get('text', '')):
+                added |= store.add(chunk_id(filename, chunk['index']), chunk['text'], parent=filename)
+            return added
+        
+        loader = CorpusLoader(
+            self.vector_store,
+            page_size=Config.CORPUS_PAGE_SIZE,
+            fetch_batch_size=Config.CORPUS_FETCH_BATCH_SIZE
+        )
         try:
-            # Pinecone 인덱스 통계 가져오기
-            stats = self.pinecone_index.describe_index_stats()
-            total_vectors = stats.get('total_vector_count', 0)
-            
-            if total_vectors == 0:
-                logger.warning("Pinecone 인덱스에 벡터가 없습니다.")
-                return
-            
-            # 모든 벡터의 메타데이터 가져오기 (샘플링)
-            # 실제로는 모든 벡터를 가져오는 대신 샘플링하거나 필요한 것만 가져옴
-            query_result = self.pinecone_index.query(
-                vector=[0.0] * self.model.get_sentence_embedding_dimension(),  # 더미 벡터
-                top_k=min(100, total_vectors),  # 최대 100개 또는 전체 벡터 수
-                include_metadata=True
+            stats = loader.load(add_record)
+        except Exception as e:
+            logger.error(f"벡터 저장소에서 문서 로드 실패: {e}")
+            raise
+        
+        if stats['total_vectors'] == 0:
+            logger.warning("벡터 저장소에 벡터가 없습니다.")
+        else:
+            logger.info(
+                f"벡터 저장소에서 {store.parent_count}개 문서({len(store)}개 청크) 정보 로드 완료 "
+                f"({stats['records']}개 벡터, {stats['elapsed']:.1f}초)"
             )
+        return store, stats['fingerprint']
+    
+    def load_snapshot(self) -> bool:
+        """인덱스 지문이 일치하는 디스크 스냅샷이 있으면 메모리 맵으로 로드"""
+        if not self.enable_snapshot:
+            return False
+        
+        manifest = snapshot.read_manifest(Config.SNAPSHOT_DIR)
+        if manifest is None:
+            return False
+        
+        try:
+            loader = CorpusLoader(self.vector_store, page_size=Config.CORPUS_PAGE_SIZE)
+            fingerprint = loader.fingerprint()
+            if not snapshot.is_valid(manifest, fingerprint, self.tokenizer.name, self.chunker.name):
+                logger.info("스냅샷이 현재 벡터 저장소와 일치하지 않아 다시 구축합니다.")
+                return False
             
-            for match in query_result["matches"]:
-                if 'metadata' in match and 'filename' in match['metadata']:
-                    filename = match['metadata']['filename']
-                    text = match['metadata'].get('text', '')
-                    
-                    if filename not in self.filenames:  # 중복 방지
-                        self.filenames.append(filename)
-                        self.documents.append(text)
-            
-            logger.info(f"Pinecone에서 {len(self.documents)}개 문서 정보 로드 완료")
-            
+            data = snapshot.load_snapshot(Config.SNAPSHOT_DIR)
+        except Exception as e:
+            logger.warning(f"스냅샷 로드 실패: {e}")
+            return False
+        
+        self._swap_corpus(data['store'], data['bm25'], fingerprint)
+        return True
+    
+    def save_snapshot(self):
+        """현재 코퍼스와 BM25 색인을 디스크 스냅샷으로 저장"""
+        with self._corpus_lock:
+            store, bm25, fingerprint = self.store, self.bm25, self.corpus_fingerprint
+        if not self.enable_snapshot or bm25 is None or fingerprint is None:
+            return
+        
+        try:
+            snapshot.save_snapshot(
+                Config.SNAPSHOT_DIR,
+                store=store,
+                bm25=bm25,
+                fingerprint=fingerprint,
+                tokenizer=self.tokenizer.name,
+                chunker=self.chunker.name
+            )
         except Exception as e:
-            logger.error(f"Pinecone에서 문서 로드 실패: {e}")
-            # 실패 시 빈 리스트로 초기화
-            self.documents = []
-            self.filenames = []
+            logger.warning(f"스냅샷 저장 실패: {e}")
+    
+    def _corpus_vector_count(self) -> Optional[int]:
+        """현재 코퍼스를 만들 때의 벡터 수 (지문 앞부분, 없으면 None)"""
+        fingerprint = self.corpus_fingerprint
+        if not fingerprint:
+            return None
+        return int(fingerprint.split('-', 1)[0])
+    
+    def refresh_corpus(self, check_count_first: bool = False) -> bool:
+        """
+        벡터 저장소가 변경되었으면 코퍼스와 BM25를 다시 구축하고 답변 캐시 무효화
+        
+        새 코퍼스/BM25/지문을 모두 만든 뒤 한 번에 교체하므로 재구축 중에도 기존 코퍼스로
+        검색하고, 로드 중 오류가 나면 기존 코퍼스와 캐시를 그대로 유지합니다.
+        
+        Args:
+            check_count_first: 벡터 수(describe_index_stats)가 그대로면 ID 전체 나열 없이 변경 없음으로 처리
+                (주기적 확인용, 같은 ID로 덮어쓴 변경은 놓칠 수 있음)
+        
+        Returns:
+            재구축 여부 (변경이 없거나 재구축에 실패하면 False)
+        """
+        self._require_corpus()
+        with self._refresh_lock:
+            try:
+                loader = CorpusLoader(self.vector_store, page_size=Config.CORPUS_PAGE_SIZE)
+                if check_count_first and loader.total_vector_count() == self._corpus_vector_count():
+                    return False
+                if loader.fingerprint() == self.corpus_fingerprint:
+                    return False
+                
+                logger.info("벡터 저장소 변경 감지: 코퍼스 재구축")
+                store, bm25, fingerprint = self._build_corpus()
+            except Exception as e:
+                logger.error(f"코퍼스 재구축 실패, 기존 코퍼스 유지: {e}")
+                return False
+            
+            self._swap_corpus(store, bm25, fingerprint)
+            self.save_snapshot()
+            self.answer_cache.invalidate(keep_version=fingerprint)
+            self.semantic_cache.clear()
+            return True
     
     def tokenize(self, text: str) -> List[str]:
         """BM25용 토크나이징"""
-        # 마크다운 제거
-        text = re.sub(r'---.*?---', '', text, flags=re.DOTALL)
-        text = re.sub(r'#+ ', '', text)
-        text = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-        text = re.sub(r'\*(.*?)\*', r'\1', text)
-        
-        # 토크나이징
-        tokens = text.lower().split()
-        cleaned = []
-        for token in tokens:
-            clean = re.sub(r'[^\w가-힣]', '', token)
-            if len(clean) > 1:
-                cleaned.append(clean)
-        return cleaned
-    
-    def build_bm25(self):
-        """BM25 인덱스 구축"""
-        if not self.documents:
+        return self.tokenizer.tokenize(text)
+    
+    def build_bm25(self, store: DocumentStore) -> Optional[BM25Index]:
+        """store의 청크로 BM25 인덱스 구축 (문서가 없으면 None)"""
+        if not len(store):
             logger.warning("문서가 없어 BM25 인덱스를 구축할 수 없습니다.")
-            self.bm25 = None
-            return
+            return None
             
         logger.info("BM25 인덱스 구축 중...")
-        tokenized_docs = [self.tokenize(doc) for doc in self.documents]
-        self.bm25 = BM25Okapi(tokenized_docs)
+        tokenized_docs = tokenize_many(
+            store.texts(), self.tokenizer,
+            workers=Config.TOKENIZER_WORKERS, min_parallel=Config.TOKENIZER_PARALLEL_MIN_DOCS
+        )
+        return BM25Index(tokenized_docs)
+    
+    def index_document(self, filename: str, text: str, batch_size: int = 32) -> int:
+        """
+        문서를 청크로 나누어 벡터 저장소에 청크 단위 벡터로 업서트
+        
+        벡터 ID는 내용 해시를 포함한 청크 ID이고 메타데이터에 filename, chunk_index, heading,
+        content_hash, text를 담아 load_documents_from_pinecone이 같은 청크로 BM25 색인을
+        구축하게 합니다. 폴더 단위 증분 수집은 ingest.py를 사용하세요.
+        
+        Returns:
+            업서트한 청크 수
+        """
+        chunks = self.chunker.split(text)
+        if not chunks:
+            return 0
+        
+        digest = content_hash(text)
+        vectors = self.embed_batch([chunk['text'] for chunk in chunks], batch_size=batch_size)
+        records = [
+            (chunk_id(filename, chunk['index'], digest), vector.tolist(), {
+                'filename': filename,
+                'chunk_index': chunk['index'],
+                'heading': chunk['heading'],
+                'content_hash': digest,
+                'text': chunk['text']
+            })
+            for chunk, vector in zip(chunks, vectors)
+        ]
+        # Pinecone 요청당 벡터 수 제한
+        for start in range(0, len(records), 100):
+            self.vector_store.upsert(vectors=records[start:start + 100])
+        self.vector_store.persist()
+        return len(records)
     
     def embed(self, text: str, is_query: bool = False) -> np.ndarray:
         """E5 임베딩"""
         prefix = "query: " if is_query else "passage: "
-        return self.model.encode(prefix + text, normalize_embeddings=True)
+        if is_query:
+            # 반복 질의(빠른 질문 등)는 캐시된 임베딩 재사용
+            return self.embedding_cache.get_or_compute(text, prefix, self._encode)
+        return self._encode(prefix + text)
     
-    def vector_search(self, query: str, top_k: int = 15) -> Dict[str, float]:
-        """벡터 검색"""
-        try:
-            query_vec = self.embed(query, is_query=True)
-            results = self.pinecone_index.query(
-                vector=query_vec.tolist(), 
-                top_k=top_k, 
-                include_metadata=True
+    def _encode(self, text: str) -> np.ndarray:
+        """모델 인코딩 (스레드 간 직렬화)"""
+        with self._encode_lock:
+            return self.model.encode(text, normalize_embeddings=True)
+    
+    def warmup(self):
+        """첫 요청 지연을 없애기 위한 예열 (모델 추론 경로와 BM25 경로를 한 번씩 실행)"""
+        logger.info("RAG 시스템 예열 중...")
+        self.embed("유니베라", is_query=True)
+        self.bm25_search("유니베라", top_k=1)
+        logger.info("RAG 시스템 예열 완료")
+    
+    def embed_batch(self, texts: List[str], is_query: bool = False,
+                    batch_size: int = 32) -> np.ndarray:
+        """여러 텍스트를 한 번의 encode 호출로 임베딩 (행 단위 정규화)"""
+        prefix = "query: " if is_query else "passage: "
+        with self._encode_lock:
+            return self.model.encode(
+                [prefix + text for text in texts],
+                batch_size=batch_size,
+                normalize_embeddings=True
             )
+    
+    def vector_search(self, query: str, top_k: int = 15,
+                      query_vector: Optional[np.ndarray] = None,
+                      raise_errors: bool = False,
+                      trace: Optional[Trace] = None) -> Dict[str, float]:
+        """
+        벡터 검색
+        
+        Args:
+            query_vector: 미리 계산된 질의 임베딩 (배치 처리용, 선택)
+            raise_errors: 오류를 빈 결과 대신 예외로 전달 (재시도 처리용)
+            trace: 'embedding', 'vector_query' 구간을 기록할 요청 추적 (선택)
+        """
+        try:
+            query_vec = query_vector
+            if query_vec is None:
+                with span(trace, 'embedding'):
+                    query_vec = self.embed(query, is_query=True)
+            with span(trace, 'vector_query'):
+                results = self.vector_store.query(
+                    vector=query_vec.tolist(), 
+                    top_k=top_k, 
+                    include_metadata=True
+                )
             
-            vector_results = {}
-            for match in results["matches"]:
-                filename = match['metadata']['filename']
-                score = float(match['score'])
-                vector_results[filename] = score
-            
-            return vector_results
+            return self.match_scores(results)
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"벡터 검색 오류: {e}")
             return {}
     
-    def bm25_search(self, query: str, top_k: int = 10) -> Dict[str, float]:
-        """BM25 검색"""
-        if self.bm25 is None:
+    @staticmethod
+    def match_scores(results: Dict[str, Any]) -> Dict[str, float]:
+        """벡터 저장소 query 응답을 검색 키별 점수로 변환"""
+        vector_results = {}
+        for match in results["matches"]:
+            metadata = match['metadata']
+            # 청크 벡터는 청크 ID, 문서 전체 벡터는 파일명으로 기록
+            key = match['id'] if 'chunk_index' in metadata else metadata['filename']
+            vector_results[key] = float(match['score'])
+        return vector_results
+    
+    def bm25_search(self, query: str, top_k: int = 10,
+                    trace: Optional[Trace] = None,
+                    corpus: Optional[Tuple[DocumentStore, Optional[BM25Index]]] = None) -> Dict[str, float]:
+        """
+        BM25 검색
+        
+        Args:
+            trace: 'bm25' 구간을 기록할 요청 추적 (선택)
+            corpus: 사용할 (코퍼스, BM25 색인) 쌍 (없으면 현재 코퍼스, 결과 집계와 같은 쌍을 쓰기 위함)
+        """
+        self._require_corpus()
+        store, bm25 = corpus or self._corpus_view()
+        if bm25 is None:
             logger.warning("BM25 인덱스가 없어 키워드 검색을 수행할 수 없습니다.")
             return {}
             
         try:
-            tokenized_query = self.tokenize(query)
-            if not tokenized_query:
-                return {}
-            
-            scores = self.bm25.get_scores(tokenized_query)
-            
-            # 상위 top_k개만 선택
-            doc_scores = [(i, score) for i, score in enumerate(scores)]
-            doc_scores.sort(key=lambda x: x[1], reverse=True)
+            with span(trace, 'bm25'):
+                tokenized_query = self.tokenize(query)
+                if not tokenized_query:
+                    return {}
+                
+                # 질의 단어의 포스팅만 점수화하고 상위 top_k개를 부분 선택 (양수 점수만 반환)
+                doc_ids, scores = bm25.top_k(tokenized_query, top_k)
             
             bm25_results = {}
-            for i, score in doc_scores[:top_k]:
-                if score > 0:
-                    filename = self.filenames[i]
-                    bm25_results[filename] = float(score)
+            for i, score in zip(doc_ids.tolist(), scores.tolist()):
+                bm25_results[store.keys[i]] = score
             
             return bm25_results
         except Exception as e:
             logger.error(f"BM25 검색 오류: {e}")
             return {}
     
+    def bm25_search_batch(self, queries: List[str], top_k: int = 10) -> List[Dict[str, float]]:
+        """여러 질의의 BM25 검색을 (질의 × 문서) 점수 행렬로 한 번에 수행"""
+        self._require_corpus()
+        store, bm25 = self._corpus_view()
+        if bm25 is None:
+            return [{} for _ in queries]
+        
+        tokenized = [self.tokenize(query) for query in queries]
+        batch_results = []
+        for doc_ids, scores in bm25.top_k_batch(tokenized, top_k):
+            batch_results.append({
+                store.keys[i]: score for i, score in zip(doc_ids.tolist(), scores.tolist())
+            })
+        return batch_results
+    
     def normalize_scores(self, scores_dict: Dict[str, float]) -> Dict[str, float]:
         """점수 0-1 정규화"""
         if not scores_dict:
@@ -184,81 +562,212 @@ class RAGSystem:
         
         return normalized
     
+    @staticmethod
+    def _timed(fn, *args, **kwargs):
+        """함수 실행 결과와 소요 시간(초) 반환"""
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        return result, time.perf_counter() - start
+    
+    def _retrieve_concurrently(self, query: str, vector_top_k: int, bm25_top_k: int,
+                               timings: Dict[str, float], trace: Optional[Trace] = None,
+                               corpus: Optional[Tuple[DocumentStore, Optional[BM25Index]]] = None):
+        """
+        벡터 검색과 BM25 검색을 동시에 실행하고 제한 시간 내 도착한 결과만 병합
+        
+        한 검색기가 제한 시간을 넘기거나 오류를 내면 빈 결과로 처리하여 다른 검색기 결과만으로
+        진행하고, timings에 '{검색기}_timeout' 또는 '{검색기}_error'를 기록합니다.
+        """
+        start = time.perf_counter()
+        futures = {
+            'vector': (self._retrieval_pool.submit(self._timed, self.vector_search, query,
+                                                   top_k=vector_top_k, raise_errors=True, trace=trace),
+                       Config.VECTOR_SEARCH_TIMEOUT),
+            'bm25': (self._retrieval_pool.submit(self._timed, self.bm25_search, query,
+                                                 top_k=bm25_top_k, trace=trace, corpus=corpus),
+                     Config.BM25_SEARCH_TIMEOUT)
+        }
+        
+        results = {}
+        for name, (future, timeout) in futures.items():
+            remaining = max(0.0, timeout - (time.perf_counter() - start))
+            try:
+                results[name], timings[f'{name}_search'] = future.result(timeout=remaining)
+            except FutureTimeoutError:
+                logger.warning(f"{name} 검색 시간 초과 ({timeout}초): 다른 검색 결과로 진행합니다.")
+                timings[f'{name}_timeout'] = timeout
+                REGISTRY.inc("rag_timeouts_total", retriever=name)
+                results[name] = {}
+            except Exception as e:
+                logger.error(f"{name} 검색 오류: {e}")
+                timings[f'{name}_error'] = time.perf_counter() - start
+                results[name] = {}
+        
+        return results['vector'], results['bm25']
+    
+    @staticmethod
+    def _retrieval_degraded(timings: Dict[str, float]) -> bool:
+        """검색기 하나가 시간 초과나 오류로 빠진 결과인지 (이런 답변은 캐시에 저장하지 않음)"""
+        return any(f'{name}_{kind}' in timings for name in ('vector', 'bm25') for kind in ('timeout', 'error'))
+    
     def hybrid_search(self, query: str, vector_top_k: int = 15, 
                      bm25_top_k: int = 10, vector_weight: float = 0.6, 
-                     bm25_weight: float = 0.4, final_top_k: int = 5) -> List[Dict[str, Any]]:
-        """하이브리드 검색 실행"""
+                     bm25_weight: float = 0.4, final_top_k: int = 5,
+                     timings: Optional[Dict[str, float]] = None,
+                     trace: Optional[Trace] = None,
+                     fusion: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        하이브리드 검색 실행
+        
+        Args:
+            fusion: 결과 결합 방식 (weighted, rrf, zscore, combmnz, 없으면 Config.FUSION_METHOD)
+            timings: 단계별 소요 시간(초)을 기록할 dict (선택)
+            trace: 단계별 구간(embedding, vector_query, bm25, retrieval, fusion)을 기록할
+                요청 추적 (선택, 없어도 단계별 히스토그램에는 기록)
+        """
         logger.info(f"검색어: '{query}'")
         logger.info(f"가중치: 벡터({vector_weight}) + BM25({bm25_weight})")
+        if timings is None:
+            timings = {}
+        # 결과 집계에 문서 저장소가 필요하므로 검색 전에 코퍼스 준비
+        self._require_corpus()
+        # 질의 도중 refresh_corpus로 교체되어도 BM25 결과와 집계가 같은 코퍼스를 보도록 한 번만 읽음
+        corpus = self._corpus_view()
+        search_start = time.perf_counter()
         
         # 1. 개별 검색 수행
-        vector_results = self.vector_search(query, top_k=vector_top_k)
-        bm25_results = self.bm25_search(query, top_k=bm25_top_k)
+        if Config.CONCURRENT_RETRIEVAL:
+            vector_results, bm25_results = self._retrieve_concurrently(
+                query, vector_top_k, bm25_top_k, timings, trace, corpus
+            )
+        else:
+            try:
+                vector_results, timings['vector_search'] = self._timed(
+                    self.vector_search, query, top_k=vector_top_k, raise_errors=True, trace=trace)
+            except Exception as e:
+                logger.error(f"vector 검색 오류: {e}")
+                timings['vector_error'] = time.perf_counter() - search_start
+                vector_results = {}
+            bm25_results, timings['bm25_search'] = self._timed(
+                self.bm25_search, query, top_k=bm25_top_k, trace=trace, corpus=corpus)
+        timings['retrieval'] = time.perf_counter() - search_start
+        fusion_start = time.perf_counter()
         
         logger.info(f"벡터 검색: {len(vector_results)}개 / BM25 검색: {len(bm25_results)}개")
         
-        # 2. 점수 정규화
-        vector_norm = self.normalize_scores(vector_results)
-        bm25_norm = self.normalize_scores(bm25_results)
+        results = self.fuse_results(vector_results, bm25_results, vector_weight, bm25_weight, final_top_k,
+                                    fusion=fusion, store=corpus[0])
+        
+        timings['fusion'] = time.perf_counter() - fusion_start
+        if trace is None:
+            trace = Trace()
+        trace.record('retrieval', search_start, timings['retrieval'])
+        trace.record('fusion', fusion_start, timings['fusion'])
+        logger.info("검색 단계별 시간: " + ", ".join(f"{k}={v * 1000:.1f}ms" for k, v in timings.items()))
+        return results
+    
+    def fuse_results(self, vector_results: Dict[str, float], bm25_results: Dict[str, float],
+                     vector_weight: float = 0.6, bm25_weight: float = 0.4,
+                     final_top_k: int = 5, fusion: Optional[str] = None,
+                     store: Optional[DocumentStore] = None) -> List[Dict[str, Any]]:
+        """
+        청크 단위 벡터/BM25 검색 결과를 문서 단위로 집계하여 결합
+        
+        문서 점수는 검색기별로 그 문서에 속한 청크 점수의 최댓값이며, 결과의 content에는
+        문서 전체 대신 점수가 높은 청크(최대 Config.CHUNKS_PER_DOCUMENT개)만 담습니다.
         
-        # 3. 모든 후보 문서 수집
-        all_files = set(vector_norm.keys()) | set(bm25_norm.keys())
+        Args:
+            fusion: 결합 방식 (fusion.METHODS 중 하나, 없으면 Config.FUSION_METHOD)
+            store: 검색에 쓴 문서 저장소 (없으면 현재 코퍼스)
+        """
+        if store is None:
+            store = self._corpus_view()[0]
         
-        # 4. 하이브리드 점수 계산
-        hybrid_scores = {}
-        for filename in all_files:
-            vector_score = vector_norm.get(filename, 0.0)
-            bm25_score = bm25_norm.get(filename, 0.0)
-            
-            hybrid_score = (vector_weight * vector_score) + (bm25_weight * bm25_score)
-            hybrid_scores[filename] = hybrid_score
+        # 1. 청크 점수를 문서 단위로 집계 (최댓값)
+        vector_docs = self._rollup(store, vector_results)
+        bm25_docs = self._rollup(store, bm25_results)
+        
+        # 2. 검색기별 후보 배열을 결합해 상위 문서 선택 (동점은 파일명 순)
+        filenames, hybrid_scores = fuse(
+            [(list(vector_docs), list(vector_docs.values())), (list(bm25_docs), list(bm25_docs.values()))],
+            [vector_weight, bm25_weight], method=fusion or Config.FUSION_METHOD, top_k=final_top_k,
+            rrf_k=Config.FUSION_RRF_K
+        )
+        sorted_results = zip(filenames.tolist(), hybrid_scores.tolist())
         
-        # 5. 상위 결과 정렬
-        sorted_results = sorted(hybrid_scores.items(), key=lambda x: x[1], reverse=True)[:final_top_k]
+        # 3. 문서 안에서 청크를 고르기 위한 청크 단위 점수 (결합 방식과 무관하게 0-1 정규화)
+        vector_chunks = self.normalize_scores(vector_results)
+        bm25_chunks = self.normalize_scores(bm25_results)
         
-        # 6. 결과 포맷팅 (전체 문서 내용 포함)
+        # 4. 결과 포맷팅 (문서별 상위 청크만 포함)
         results = []
         for rank, (filename, hybrid_score) in enumerate(sorted_results, 1):
-            # 전체 문서 내용 찾기
-            full_content = ""
-            for i, fname in enumerate(self.filenames):
-                if fname == filename:
-                    full_content = self.documents[i]
-                    break
+            chunks = self._best_chunks(store, filename, vector_chunks, bm25_chunks, vector_weight, bm25_weight)
             
             results.append({
                 'rank': rank,
                 'filename': filename,
                 'hybrid_score': hybrid_score,
-                'vector_score': vector_results.get(filename, 0.0),
-                'bm25_score': bm25_results.get(filename, 0.0),
-                'content': full_content
+                'vector_score': vector_docs.get(filename, 0.0),
+                'bm25_score': bm25_docs.get(filename, 0.0),
+                'content': "\n\n".join(store.text(doc_id) for doc_id, _, _ in chunks),
+                'chunks': [{'chunk_id': key, 'score': score} for _, key, score in chunks]
             })
         
         return results
     
-    def create_context(self, search_results: List[Dict[str, Any]]) -> str:
-        """검색 결과를 GPT 입력용 컨텍스트로 변환"""
-        context_parts = []
-        for result in search_results:
-            # 마크다운 메타데이터 제거하고 본문만 추출
-            content = result['content']
-            # YAML front matter 제거
-            content = re.sub(r'---.*?---', '', content, flags=re.DOTALL).strip()
-            
-            context_parts.append(f"## 문서: {result['filename']}\n{content}\n")
+    @staticmethod
+    def _rollup(store: DocumentStore, chunk_scores: Dict[str, float]) -> Dict[str, float]:
+        """청크 ID별 점수를 상위 문서 파일명별 최댓값으로 집계"""
+        doc_scores: Dict[str, float] = {}
+        for key, score in chunk_scores.items():
+            filename = store.parent_of(key)
+            if score > doc_scores.get(filename, float('-inf')):
+                doc_scores[filename] = score
+        return doc_scores
+    
+    @staticmethod
+    def _best_chunks(store: DocumentStore, filename: str, vector_chunks: Dict[str, float], bm25_chunks: Dict[str, float],
+                     vector_weight: float, bm25_weight: float) -> List[tuple]:
+        """
+        문서에서 점수가 높은 청크를 골라 문서 내 순서대로 (청크 번호, 청크 ID, 점수) 반환
         
-        return "\n".join(context_parts)
+        청크 단위 점수가 없는 문서(문서 전체 벡터만 일치)는 앞쪽 청크를 사용합니다.
+        """
+        # 문서 전체 벡터 점수는 그 문서의 모든 청크에 적용
+        doc_vector = vector_chunks.get(filename, 0.0)
+        scored = []
+        for doc_id in store.children(filename):
+            key = store.keys[doc_id]
+            score = (vector_weight * max(vector_chunks.get(key, 0.0), doc_vector)
+                     + bm25_weight * bm25_chunks.get(key, 0.0))
+            scored.append((score, doc_id, key))
+        
+        # 점수 내림차순, 동점이면 문서 앞쪽 청크 우선 (일치한 청크가 있으면 0점 청크 제외)
+        scored.sort(key=lambda x: (-x[0], x[1]))
+        if scored and scored[0][0] > 0:
+            scored = [item for item in scored if item[0] > 0]
+        selected = sorted(scored[:Config.CHUNKS_PER_DOCUMENT], key=lambda x: x[1])
+        return [(doc_id, key, score) for score, doc_id, key in selected]
     
-    def generate_answer(self, query: str, search_results: List[Dict[str, Any]], 
-                       model: str = "gpt-4o-mini", max_tokens: int = 1000) -> str:
-        """GPT-4o-mini로 답변 생성"""
-        try:
-            # 검색 결과를 컨텍스트로 변환
-            context = self.create_context(search_results)
-            
-            # 프롬프트 구성
-            system_prompt = """당신은 유니베라 회사에 대한 전문 어시스턴트입니다. 
+    def create_context(self, search_results: List[Dict[str, Any]],
+                       stats: Optional[Dict[str, Any]] = None) -> str:
+        """
+        검색 결과를 GPT 입력용 컨텍스트로 변환 (Config.CONTEXT_TOKEN_BUDGET 이내)
+        
+        Args:
+            stats: 사용/절약한 프롬프트 토큰 수 등을 기록할 dict (선택)
+        """
+        return self.context_builder.build(search_results, stats=stats)
+    
+    def build_messages(self, query: str, search_results: List[Dict[str, Any]],
+                       context_stats: Optional[Dict[str, Any]] = None) -> List[Dict[str, str]]:
+        """GPT 요청 메시지 구성"""
+        # 검색 결과를 컨텍스트로 변환
+        context = self.create_context(search_results, stats=context_stats)
+        
+        # 프롬프트 구성
+        system_prompt = """당신은 유니베라 회사에 대한 전문 어시스턴트입니다. 
 주어진 문서들을 바탕으로 사용자의 질문에 정확하고 유용한 답변을 제공하세요.
 
 답변 작성 가이드라인:
@@ -268,8 +777,8 @@ class RAGSystem:
 4. 문서에 없는 내용은 추측하지 마세요
 5. 한국어로 자연스럽게 답변하세요
 6. 답변을 구조화하여 가독성을 높이세요"""
-            
-            user_prompt = f"""다음 문서들을 참고하여 질문에 답변해주세요.
+        
+        user_prompt = f"""다음 문서들을 참고하여 질문에 답변해주세요.
 
 질문: {query}
 
@@ -277,59 +786,431 @@ class RAGSystem:
 {context}
 
 위 문서들을 바탕으로 질문에 대해 정확하고 상세한 답변을 제공해주세요."""
+        
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+    
+    @staticmethod
+    def _usage_dict(usage) -> Optional[Dict[str, int]]:
+        """OpenAI usage 객체를 dict로 변환"""
+        if usage is None:
+            return None
+        return {
+            'prompt_tokens': usage.prompt_tokens,
+            'completion_tokens': usage.completion_tokens,
+            'total_tokens': usage.total_tokens
+        }
+    
+    def generate_answer(self, query: str, search_results: List[Dict[str, Any]], 
+                       model: str = "gpt-4o-mini", max_tokens: int = 1000,
+                       usage: Optional[Dict[str, int]] = None,
+                       raise_errors: bool = False,
+                       context_stats: Optional[Dict[str, Any]] = None,
+                       trace: Optional[Trace] = None, client=None) -> str:
+        """
+        GPT-4o-mini로 답변 생성
+        
+        Args:
+            usage: 토큰 사용량을 기록할 dict (선택)
+            raise_errors: 오류를 안내 문구 대신 예외로 전달 (재시도 처리용)
+            context_stats: 컨텍스트 토큰 예산 사용량을 기록할 dict (선택)
+            trace: 'context', 'llm' 구간을 기록할 요청 추적 (선택)
+            client: 사용할 OpenAI 클라이언트 (없으면 self.openai_client)
+        """
+        try:
+            with span(trace, 'context'):
+                messages = self.build_messages(query, search_results, context_stats=context_stats)
             
             logger.info("GPT-4o-mini 답변 생성 중...")
-            response = self.openai_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.1,  # 일관된 답변을 위해 낮은 temperature
-                top_p=0.9
-            )
+            with span(trace, 'llm'):
+                response = (client or self.openai_client).chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    max_tokens=max_tokens,
+                    temperature=0.1,  # 일관된 답변을 위해 낮은 temperature
+                    top_p=0.9
+                )
             
             answer = response.choices[0].message.content
             
             # 토큰 사용량 정보
-            usage = response.usage
-            logger.info(f"토큰 사용량 - 입력: {usage.prompt_tokens}, 출력: {usage.completion_tokens}, 총: {usage.total_tokens}")
+            token_usage = self._usage_dict(response.usage)
+            logger.info(f"토큰 사용량 - 입력: {token_usage['prompt_tokens']}, 출력: {token_usage['completion_tokens']}, 총: {token_usage['total_tokens']}")
+            self._record_tokens(token_usage)
+            if usage is not None:
+                usage.update(token_usage)
             
             return answer
             
         except Exception as e:
+            if raise_errors:
+                raise
             logger.error(f"GPT 답변 생성 오류: {e}")
-            return "죄송합니다. 답변 생성 중 오류가 발생했습니다."
+            return ANSWER_ERROR_MESSAGE
+    
+    def generate_answer_stream(self, query: str, search_results: List[Dict[str, Any]],
+                               model: str = "gpt-4o-mini", max_tokens: int = 1000,
+                               stats: Optional[Dict[str, Any]] = None,
+                               trace: Optional[Trace] = None) -> Iterator[str]:
+        """
+        GPT 답변을 토큰 단위로 스트리밍 생성
+        
+        Args:
+            stats: 완료 후 'usage', 'ttft'(첫 토큰까지 초), 'error', 'context'(컨텍스트 토큰 통계)를
+                기록할 dict (선택)
+            trace: 'context', 'llm_first_token', 'llm' 구간을 기록할 요청 추적 (선택)
+        
+        Yields:
+            답변 텍스트 조각
+        """
+        if stats is None:
+            stats = {}
+        stats['error'] = False
+        start = time.perf_counter()
+        received = False
+        
+        try:
+            stats['context'] = {}
+            with span(trace, 'context'):
+                messages = self.build_messages(query, search_results, context_stats=stats['context'])
+            
+            logger.info("GPT-4o-mini 답변 스트리밍 생성 중...")
+            llm_start = time.perf_counter()
+            stream = self.openai_client.chat.completions.create(
+                model=model,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=0.1,
+                top_p=0.9,
+                stream=True,
+                stream_options={"include_usage": True}
+            )
+            
+            for chunk in stream:
+                # 마지막 청크는 choices 없이 usage만 포함
+                if chunk.usage is not None:
+                    stats['usage'] = self._usage_dict(chunk.usage)
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if delta:
+                    if not received:
+                        received = True
+                        stats['ttft'] = time.perf_counter() - start
+                        if trace is not None:
+                            trace.record('llm_first_token', llm_start, time.perf_counter() - llm_start)
+                    yield delta
+            
+            if trace is not None:
+                trace.record('llm', llm_start, time.perf_counter() - llm_start)
+            if stats.get('usage'):
+                usage = stats['usage']
+                logger.info(f"토큰 사용량 - 입력: {usage['prompt_tokens']}, 출력: {usage['completion_tokens']}, 총: {usage['total_tokens']}")
+                self._record_tokens(usage)
+                
+        except Exception as e:
+            logger.error(f"GPT 답변 스트리밍 오류: {e}")
+            REGISTRY.inc("rag_errors_total", stage='llm', type=type(e).__name__)
+            stats['error'] = True
+            if not received:
+                yield ANSWER_ERROR_MESSAGE
+    
+    @staticmethod
+    def _record_tokens(usage: Dict[str, int]):
+        REGISTRY.inc("rag_tokens_total", usage['prompt_tokens'], type="prompt")
+        REGISTRY.inc("rag_tokens_total", usage['completion_tokens'], type="completion")
+    
+    @staticmethod
+    def _finish_trace(trace: Trace, start: float) -> float:
+        """요청 전체 구간을 기록하고 (설정 시) 지표 파일 갱신, 전체 소요 시간(초) 반환"""
+        total = time.perf_counter() - start
+        trace.record('total', start, total)
+        if Config.METRICS_FILE:
+            REGISTRY.write_file(Config.METRICS_FILE, min_interval=Config.METRICS_FILE_INTERVAL)
+        return total
+    
+    def _cache_gauges(self) -> List[tuple]:
+        """지표 내보내기용 캐시 게이지 (이름, 라벨, 값)"""
+        gauges = []
+        for name, cache in (('embedding', self.embedding_cache), ('answer', self.answer_cache),
+                            ('semantic', self.semantic_cache)):
+            stats = cache.stats()
+            gauges.append(("rag_cache_size", {'cache': name}, stats.get('size', 0)))
+            # 카운터 rag_cache_hits_total(= rag_cache_hits 계열)과 이름이 겹치지 않도록 object 접두어
+            for key in ('hits', 'misses', 'evictions'):
+                gauges.append((f"rag_cache_object_{key}", {'cache': name}, stats.get(key, 0)))
+        return gauges
+    
+    @staticmethod
+    def _coalesced_result(result: Dict[str, Any], query: str, trace: Trace,
+                          start: float) -> Dict[str, Any]:
+        """다른 요청의 계산 결과를 이 요청의 결과로 변환 (timings/trace에는 기다린 시간만 기록)"""
+        total = RAGSystem._finish_trace(trace, start)
+        return {**result, 'query': query, 'coalesced': True,
+                'timings': {'total': total}, 'trace': trace.to_dict()}
+    
+    def _answer_cache_key(self, query: str, vector_weight: float, bm25_weight: float,
+                          final_top_k: int, model: str, fusion: str) -> str:
+        # 키에 코퍼스 버전이 들어가므로 코퍼스가 준비된 뒤 계산
+        self._require_corpus()
+        return AnswerCache.make_key(
+            query, vector_weight, bm25_weight, final_top_k, model, self.corpus_fingerprint, fusion
+        )
+    
+    def _answer_cache_keys(self, query: str, vector_weight: float, bm25_weight: float,
+                           final_top_k: int, model: str, fusion: str) -> Tuple[str, str]:
+        """(답변 캐시 키, 의미 캐시 범위) - 범위는 질의를 뺀 나머지 설정과 코퍼스 버전"""
+        return (self._answer_cache_key(query, vector_weight, bm25_weight, final_top_k, model, fusion),
+                self._answer_cache_key("", vector_weight, bm25_weight, final_top_k, model, fusion))
+    
+    def _lookup_answer(self, query: str, keys: Tuple[str, str], trace: Trace) -> Optional[Dict[str, Any]]:
+        """캐시된 답변 조회: 같은 질의, 없으면 (설정 시) 유사도가 임계값 이상인 지난 질의"""
+        cache_key, scope = keys
+        with span(trace, 'answer_cache'):
+            cached = self.answer_cache.get(cache_key)
+        if cached is not None:
+            logger.info("답변 캐시 적중")
+            REGISTRY.inc("rag_cache_hits_total", cache="answer")
+            return cached
+        if not Config.SEMANTIC_CACHE_ENABLED:
+            return None
+        
+        # 질의 임베딩은 임베딩 캐시에 남으므로 캐시를 못 찾아도 검색에서 다시 계산하지 않음
+        with span(trace, 'semantic_cache'):
+            match = self.semantic_cache.lookup(self.embed(query, is_query=True), scope)
+        if match is None:
+            return None
+        cached, similarity, matched_query = match
+        logger.info(f"의미 캐시 적중 (유사도 {similarity:.3f}): '{matched_query}'")
+        REGISTRY.inc("rag_cache_hits_total", cache="semantic")
+        return {**cached, 'semantic_match': {'query': matched_query, 'similarity': similarity}}
+    
+    def _store_answer(self, query: str, keys: Tuple[str, str], result: Dict[str, Any]):
+        """답변 캐시와 (설정 시) 의미 캐시에 결과 저장"""
+        cache_key, scope = keys
+        self.answer_cache.set(cache_key, result, corpus_version=self.corpus_fingerprint)
+        if Config.SEMANTIC_CACHE_ENABLED:
+            self.semantic_cache.add(self.embed(query, is_query=True), scope, query, result)
     
     def rag_query(self, query: str, vector_weight: float = 0.6, 
-                  bm25_weight: float = 0.4, final_top_k: int = 5) -> Dict[str, Any]:
-        """전체 RAG 파이프라인 실행"""
+                  bm25_weight: float = 0.4, final_top_k: int = 5,
+                  model: str = "gpt-4o-mini", use_cache: bool = True,
+                  fusion: Optional[str] = None) -> Dict[str, Any]:
+        """
+        전체 RAG 파이프라인 실행
+        
+        결과의 'trace'에는 단계별 구간(시작 시각, 소요 시간)이 담기고, 같은 값이 지표
+        레지스트리의 단계별 히스토그램에 기록됩니다. fusion은 hybrid_search와 같습니다.
+        """
         logger.info(f"RAG 질의응답: '{query}'")
+        trace = Trace()
+        start = trace.start
+        timings = {}
+        REGISTRY.inc("rag_requests_total", mode="query")
+        
+        # 0. 동일 질의/가중치/코퍼스 버전의 결과가 캐시되어 있으면 재사용
+        fusion = fusion or Config.FUSION_METHOD
+        keys = self._answer_cache_keys(query, vector_weight, bm25_weight, final_top_k, model, fusion)
+        if use_cache:
+            cached = self._lookup_answer(query, keys, trace)
+            if cached is not None:
+                timings['total'] = self._finish_trace(trace, start)
+                return {**cached, 'query': query, 'cached': True,
+                        'timings': timings, 'trace': trace.to_dict()}
+        
+        # 1~2. 검색과 답변 생성 (같은 질의가 처리 중이면 새로 계산하지 않고 그 결과를 함께 받음)
+        def compute() -> Dict[str, Any]:
+            # 1. 하이브리드 검색
+            search_results = self.hybrid_search(
+                query=query,
+                vector_weight=vector_weight,
+                bm25_weight=bm25_weight,
+                final_top_k=final_top_k,
+                timings=timings,
+                trace=trace,
+                fusion=fusion
+            )
+        
+            # 2. GPT 답변 생성
+            usage = {}
+            context_stats = {}
+            answer, timings['generation'] = self._timed(
+                self.generate_answer, query, search_results, model=model, usage=usage,
+                context_stats=context_stats, trace=trace
+            )
+            timings['total'] = self._finish_trace(trace, start)
+        
+            result = {
+                'query': query,
+                'search_results': search_results,
+                'answer': answer,
+                'usage': usage or None,
+                'context': context_stats or None,
+                'timestamp': datetime.now().isoformat(),
+                'cached': False,
+                'timings': timings,
+                'trace': trace.to_dict()
+            }
+        
+            # 검색기 하나가 빠진 결과는 CACHE_TTL 동안 굳어지지 않도록 저장하지 않음
+            if use_cache and answer != ANSWER_ERROR_MESSAGE and not self._retrieval_degraded(timings):
+                self._store_answer(query, keys, result)
+        
+            return result
+        
+        if not Config.SINGLE_FLIGHT:
+            return compute()
+        result, shared = self._inflight.do(keys[0], compute)
+        if shared:
+            logger.info("처리 중인 동일 질의 결과 공유")
+            return self._coalesced_result(result, query, trace, start)
+        return result
+    
+    def rag_query_stream(self, query: str, vector_weight: float = 0.6,
+                         bm25_weight: float = 0.4, final_top_k: int = 5,
+                         model: str = "gpt-4o-mini", use_cache: bool = True,
+                         fusion: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        전체 RAG 파이프라인을 스트리밍으로 실행
+        
+        Yields:
+            {'type': 'search_results', 'search_results': [...]} - 검색 완료 시 1회
+            {'type': 'delta', 'content': str} - 답변 텍스트 조각
+            {'type': 'done', 'result': dict} - rag_query와 같은 형식의 최종 결과
+              (timings['ttft']: 질의 시작부터 첫 토큰까지 초)
+        """
+        logger.info(f"RAG 스트리밍 질의응답: '{query}'")
+        trace = Trace()
+        start = trace.start
+        timings = {}
+        REGISTRY.inc("rag_requests_total", mode="stream")
+        
+        fusion = fusion or Config.FUSION_METHOD
+        keys = self._answer_cache_keys(query, vector_weight, bm25_weight, final_top_k, model, fusion)
+        if use_cache:
+            cached = self._lookup_answer(query, keys, trace)
+            if cached is not None:
+                yield {'type': 'search_results', 'search_results': cached['search_results']}
+                timings['ttft'] = time.perf_counter() - start
+                yield {'type': 'delta', 'content': cached['answer']}
+                timings['total'] = self._finish_trace(trace, start)
+                yield {'type': 'done', 'result': {**cached, 'query': query, 'cached': True,
+                                                  'timings': timings, 'trace': trace.to_dict()}}
+                return
         
-        # 1. 하이브리드 검색
         search_results = self.hybrid_search(
             query=query,
             vector_weight=vector_weight,
             bm25_weight=bm25_weight,
-            final_top_k=final_top_k
+            final_top_k=final_top_k,
+            timings=timings,
+            trace=trace,
+            fusion=fusion
         )
+        yield {'type': 'search_results', 'search_results': search_results}
         
-        # 2. GPT 답변 생성
-        answer = self.generate_answer(query, search_results)
+        stats = {}
+        parts = []
+        generation_start = time.perf_counter()
+        for delta in self.generate_answer_stream(query, search_results, model=model, stats=stats, trace=trace):
+            if not parts:
+                timings['ttft'] = time.perf_counter() - start
+                trace.record('ttft', start, timings['ttft'])
+                logger.info(f"첫 토큰까지 {timings['ttft'] * 1000:.0f}ms")
+            parts.append(delta)
+            yield {'type': 'delta', 'content': delta}
+        timings['generation'] = time.perf_counter() - generation_start
+        timings['total'] = self._finish_trace(trace, start)
         
-        return {
+        result = {
             'query': query,
             'search_results': search_results,
-            'answer': answer,
-            'timestamp': datetime.now().isoformat()
+            'answer': "".join(parts),
+            'usage': stats.get('usage'),
+            'context': stats.get('context') or None,
+            'timestamp': datetime.now().isoformat(),
+            'cached': False,
+            'timings': timings,
+            'trace': trace.to_dict()
         }
+        
+        if use_cache and not stats['error'] and not self._retrieval_degraded(timings):
+            self._store_answer(query, keys, result)
+        
+        yield {'type': 'done', 'result': result}
+    
+    def rag_query_batch(self, queries: List[str], output_path: Optional[str] = None,
+                        **kwargs) -> Dict[str, Any]:
+        """
+        여러 질문을 일괄 처리 (배치 임베딩, BM25 행렬 점수화, 제한된 동시 요청)
+        
+        결과는 완료 순서대로 output_path(JSONL)에 기록되며, 처리 통계(초당 질문 수 포함)를
+        반환합니다. 세부 옵션은 batch_query.rag_query_batch를 참고하세요.
+        """
+        return batch_query.rag_query_batch(self, queries, output_path=output_path, **kwargs)
     
     def get_system_info(self) -> Dict[str, Any]:
-        """시스템 정보 반환"""
+        """시스템 정보 반환 (준비되지 않은 구성 요소는 기다리지 않고 비워 둠)"""
         return {
-            'total_documents': len(self.documents),
-            'model_name': 'intfloat/multilingual-e5-base',
-            'embedding_dimension': self.model.get_sentence_embedding_dimension(),
-            'pinecone_index': self.pinecone_index.describe_index_stats()
+            'ready': self.is_ready,
+            'components': self.readiness(),
+            'total_documents': self.store.parent_count,
+            'total_chunks': len(self.store),
+            'model_name': Config.EMBEDDING_MODEL,
+            'embedding_backend': Config.EMBEDDING_BACKEND,
+            'embedding_dimension': (self.model.get_sentence_embedding_dimension()
+                                    if self._model.ready else None),
+            'embedding_cache': self.embedding_cache.stats(),
+            'answer_cache': self.answer_cache.stats(),
+            'semantic_cache': self.semantic_cache.stats(),
+            'coalescing': self._inflight.stats(),
+            'corpus_version': self.corpus_fingerprint,
+            'latency': REGISTRY.summary(),
+            'vector_store': self.vector_store.describe_index_stats() if self._vector_store.ready else {}
         }
+
+
+# === 프로세스 공유 인스턴스 ===
+# Streamlit 세션마다 모델/인덱스를 새로 만들지 않도록 프로세스당 하나의 RAGSystem을 공유
+_shared_system: Optional[RAGSystem] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_rag_system(pinecone_api_key: str, pinecone_index_name: str,
+                          openai_api_key: str, warmup: bool = True) -> RAGSystem:
+    """
+    프로세스 전역 RAG 시스템 반환 (최초 호출 시 생성)
+    
+    동시에 여러 스레드가 호출해도 인스턴스는 한 번만 생성됩니다. 생성 자체는 바로
+    끝나고, 무거운 구성 요소는 처음 사용할 때 또는 백그라운드 로딩으로 준비됩니다
+    (준비 상태는 readiness()로 확인).
+    
+    Args:
+        pinecone_api_key: Pinecone API 키
+        pinecone_index_name: Pinecone 인덱스 이름
+        openai_api_key: OpenAI API 키
+        warmup: 생성 직후 백그라운드 로딩과 예열 시작 여부
+    """
+    global _shared_system
+    if _shared_system is None:
+        with _shared_lock:
+            if _shared_system is None:
+                if Config.METRICS_PORT:
+                    start_http_server(Config.METRICS_PORT)
+                _shared_system = RAGSystem(
+                    pinecone_api_key=pinecone_api_key,
+                    pinecone_index_name=pinecone_index_name,
+                    openai_api_key=openai_api_key
+                )
+    if warmup:
+        _shared_system.start_loading()
+    return _shared_system
+
+
+def start_background_warmup(pinecone_api_key: str, pinecone_index_name: str,
+                            openai_api_key: str) -> threading.Thread:
+    """공유 RAG 시스템 구성 요소를 백그라운드 스레드에서 미리 생성 (중복 호출 시 기존 스레드 반환)"""
+    system = get_shared_rag_system(pinecone_api_key, pinecone_index_name, openai_api_key, warmup=False)
+    return system.start_loading()
@@ -6,22 +6,67 @@
 import subprocess
 import sys
 import os
+import argparse
+import importlib.util
+import importlib.metadata
 from pathlib import Path
 
+# (import 이름, 배포 패키지 이름)
+REQUIRED_PACKAGES = [
+    ("streamlit", "streamlit"),
+    ("sentence_transformers", "sentence-transformers"),
+    ("pinecone", "pinecone"),
+    ("openai", "openai"),
+    ("rank_bm25", "rank-bm25"),
+]
+
 def check_requirements():
-    """필수 요구사항 확인"""
-    try:
-        import streamlit
-        import sentence_transformers
-        import pinecone
-        import openai
-        import rank_bm25
-        print("✅ 모든 필수 패키지가 설치되어 있습니다.")
-        return True
-    except ImportError as e:
-        print(f"❌ 필수 패키지가 누락되었습니다: {e}")
+    """필수 요구사항 확인 (패키지를 import하지 않고 설치 여부와 버전만 확인)"""
+    missing = []
+    versions = []
+    for module, distribution in REQUIRED_PACKAGES:
+        if importlib.util.find_spec(module) is None:
+            missing.append(distribution)
+            continue
+        try:
+            versions.append(f"{distribution} {importlib.metadata.version(distribution)}")
+        except importlib.metadata.PackageNotFoundError:
+            # 다른 배포 이름으로 설치된 경우 (예: pinecone-client)
+            versions.append(distribution)
+    
+    if missing:
+        print(f"❌ 필수 패키지가 누락되었습니다: {', '.join(missing)}")
         print("다음 명령어로 설치하세요: pip install -r requirements.txt")
         return False
+    print(f"✅ 모든 필수 패키지가 설치되어 있습니다. ({', '.join(versions)})")
+    return True
+
+def profile_imports(module: str = "app", top: int = 15):
+    """
+    앱 실행 경로의 import 시간 측정 (python -X importtime)
+    
+    새 인터프리터에서 module을 import하고 누적 시간이 긴 상위 패키지를 출력합니다.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((int(cumulative_us), int(self_us), depth, name.strip()))
+    
+    if result.returncode != 0:
+        print(f"❌ {module} import 실패:\n{result.stderr.splitlines()[-1] if result.stderr else ''}")
+    total = sum(cumulative for cumulative, _, depth, _ in rows if depth == 0)
+    print(f"⏱️  import {module}: {total / 1e6:.2f}초 (최상위 import 누적)")
+    # 최상위와 그 바로 아래 import 중 누적 시간이 긴 순서
+    for cumulative, self_us, depth, name in sorted(
+            (row for row in rows if row[2] <= 1), reverse=True)[:top]:
+        print(f"  {cumulative / 1000:>9.1f}ms (자체 {self_us / 1000:>7.1f}ms)  {'  ' * depth}{name}")
 
 def check_config():
     """설정 파일 확인"""
@@ -44,6 +89,15 @@ def check_config():
 
 def main():
     """메인 실행 함수"""
+    parser = argparse.ArgumentParser(description="유니베라 RAG 챗봇 실행")
+    parser.add_argument("--profile-imports", action="store_true",
+                        help="앱 실행 경로의 import 시간만 측정하고 종료")
+    args = parser.parse_args()
+    
+    if args.profile_imports:
+        profile_imports()
+        return
+    
     print("🌿 유니베라 RAG 챗봇 시작 중...")
     print("=" * 50)
     
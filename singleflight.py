@@ -0,0 +1,113 @@
+"""
+동일 요청 병합 (single-flight)
+
+같은 키의 요청이 처리 중일 때 새로 들어온 요청은 계산을 다시 하지 않고 진행 중인 계산의
+결과를 함께 받습니다. 빠른 질문 버튼처럼 여러 사용자가 몇 초 안에 같은 질문을 보내면
+임베딩, 벡터 검색, GPT 호출이 한 번만 실행됩니다.
+
+    result, shared = flight.do(key, lambda: compute(query))
+
+병합으로 아낀 호출 수는 rag_coalesced_total 카운터와 stats()로 확인합니다.
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from metrics import REGISTRY
+
+REGISTRY.describe("rag_coalesced_total", "진행 중인 동일 요청에 합쳐져 생략된 계산 수")
+REGISTRY.describe("rag_singleflight_leaders_total", "실제로 실행된 계산 수")
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "waiters")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """스레드용 동일 요청 병합 (Streamlit 세션 스레드 간 공유)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        key의 계산이 진행 중이면 그 결과를 기다리고, 아니면 fn을 실행
+
+        Returns:
+            (결과, 다른 요청의 결과를 받았는지 여부) - 진행 중인 계산이 예외로 끝나면
+            기다리던 요청에도 같은 예외가 전달됩니다.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.leaders += 1
+            else:
+                call.waiters += 1
+                self.coalesced += 1
+        REGISTRY.inc("rag_singleflight_leaders_total" if leader else "rag_coalesced_total", flight=self.name)
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+        return call.result, False
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_flight = len(self._calls)
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": in_flight}
+
+
+class AsyncSingleFlight:
+    """asyncio용 동일 요청 병합 (한 이벤트 루프 안에서 공유)
+
+    계산은 별도 태스크로 실행하므로 먼저 요청한 쪽이 취소되어도(클라이언트 연결 종료 등)
+    기다리는 다른 요청은 결과를 받습니다.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """SingleFlight.do의 asyncio 버전"""
+        task = self._tasks.get(key)
+        shared = task is not None
+        if shared:
+            self.coalesced += 1
+            REGISTRY.inc("rag_coalesced_total", flight=self.name)
+        else:
+            self.leaders += 1
+            REGISTRY.inc("rag_singleflight_leaders_total", flight=self.name)
+            task = self._tasks[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task), shared
+
+    def stats(self) -> Dict[str, int]:
+        return {"leaders": self.leaders, "coalesced": self.coalesced, "in_flight": len(self._tasks)}
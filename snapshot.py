@@ -0,0 +1,164 @@
+"""
+코퍼스 + BM25 색인 온디스크 스냅샷
+
+디렉터리 구성 (FORMAT_VERSION 4):
+    manifest.json      형식 버전, 인덱스 지문, 토크나이저, 청커, BM25 파라미터, 개수, 본문 압축 레벨
+    keys.json          청크 ID 목록 (문서 저장소 순서)
+    parents.json       청크별 상위 문서 파일명
+    texts.bin          DocumentStore 본문 버퍼 (청크별 UTF-8, 선택적 zlib 압축)
+    text_offsets.npy   본문 시작/끝 오프셋 (int64, 길이 N+1)
+    vocab.json         단어 목록 (단어 ID 순서)
+    bm25_*.npy         BM25Index 배열 (indptr, postings, term_freqs, impacts, doc_len, idf)
+
+모든 배열은 `np.load(mmap_mode="r")`로 열리므로 재시작한 프로세스나 여러 워커가
+파일 페이지를 공유하며 수 밀리초 안에 색인을 열 수 있습니다.
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from bm25_index import BM25Index
+from document_store import DocumentStore
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 4
+MANIFEST_FILE = "manifest.json"
+
+
+def _write_json(path: str, data: Any):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def save_snapshot(path: str, store: DocumentStore, bm25: BM25Index,
+                  fingerprint: str, tokenizer: str, chunker: Optional[str] = None):
+    """
+    스냅샷 저장 (임시 디렉터리에 쓴 뒤 교체하므로 읽는 중인 프로세스에 안전)
+
+    Args:
+        path: 스냅샷 디렉터리
+        store: 문서 저장소
+        bm25: 구축된 BM25 색인
+        fingerprint: Pinecone 인덱스 지문
+        tokenizer: 토크나이저 식별자 (변경 시 스냅샷 무효화)
+        chunker: 청커 식별자 (변경 시 스냅샷 무효화)
+    """
+    start = time.perf_counter()
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    _write_json(os.path.join(tmp_path, "keys.json"), store.keys)
+    _write_json(os.path.join(tmp_path, "parents.json"), store.parents)
+    with open(os.path.join(tmp_path, "texts.bin"), "wb") as f:
+        f.write(store.buffer)
+    np.save(os.path.join(tmp_path, "text_offsets.npy"), store.offsets)
+
+    vocab_terms = [None] * len(bm25.vocab)
+    for term, term_id in bm25.vocab.items():
+        vocab_terms[term_id] = term
+    _write_json(os.path.join(tmp_path, "vocab.json"), vocab_terms)
+    for field in BM25Index.ARRAY_FIELDS:
+        np.save(os.path.join(tmp_path, f"bm25_{field}.npy"), np.ascontiguousarray(getattr(bm25, field)))
+
+    # manifest는 마지막에 기록 (manifest가 있으면 나머지 파일이 완전함을 보장)
+    _write_json(os.path.join(tmp_path, MANIFEST_FILE), {
+        "format_version": FORMAT_VERSION,
+        "created_at": datetime.now().isoformat(),
+        "fingerprint": fingerprint,
+        "tokenizer": tokenizer,
+        "chunker": chunker,
+        "documents": store.parent_count,
+        "chunks": len(store),
+        "text_compression": store.compression_level,
+        "bm25": {"k1": bm25.k1, "b": bm25.b, "epsilon": bm25.epsilon, "avgdl": bm25.avgdl}
+    })
+
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    if os.path.exists(old_path):
+        # 기존 mmap을 연 프로세스는 unlink 후에도 계속 읽을 수 있음
+        shutil.rmtree(old_path, ignore_errors=True)
+    logger.info(f"스냅샷 저장 완료: {path} ({len(store)}개 청크, {time.perf_counter() - start:.2f}초)")
+
+
+def read_manifest(path: str) -> Optional[Dict[str, Any]]:
+    """스냅샷 manifest 읽기 (없거나 손상된 경우 None)"""
+    try:
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def is_valid(manifest: Optional[Dict[str, Any]], fingerprint: Optional[str], tokenizer: str,
+             chunker: Optional[str] = None) -> bool:
+    """스냅샷이 현재 인덱스/토크나이저/청커와 일치하는지 검사"""
+    return (
+        manifest is not None
+        and manifest.get("format_version") == FORMAT_VERSION
+        and manifest.get("tokenizer") == tokenizer
+        and manifest.get("chunker") == chunker
+        and fingerprint is not None
+        and manifest.get("fingerprint") == fingerprint
+    )
+
+
+def load_snapshot(path: str, mmap: bool = True) -> Dict[str, Any]:
+    """
+    스냅샷 열기
+
+    Args:
+        path: 스냅샷 디렉터리
+        mmap: 배열을 메모리 맵으로 열지 여부
+
+    Returns:
+        manifest, store(DocumentStore), bm25(BM25Index)를 담은 dict
+    """
+    start = time.perf_counter()
+    manifest = read_manifest(path)
+    if manifest is None or manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 스냅샷 형식입니다: {path}")
+
+    mmap_mode = "r" if mmap else None
+    with open(os.path.join(path, "keys.json"), encoding="utf-8") as f:
+        keys: List[str] = json.load(f)
+    with open(os.path.join(path, "parents.json"), encoding="utf-8") as f:
+        parents: List[str] = json.load(f)
+    with open(os.path.join(path, "vocab.json"), encoding="utf-8") as f:
+        vocab = {term: term_id for term_id, term in enumerate(json.load(f))}
+
+    offsets = np.load(os.path.join(path, "text_offsets.npy"), mmap_mode=mmap_mode)
+    texts_path = os.path.join(path, "texts.bin")
+    if os.path.getsize(texts_path) == 0:
+        buffer = b""
+    elif mmap:
+        buffer = np.memmap(texts_path, dtype=np.uint8, mode="r")
+    else:
+        with open(texts_path, "rb") as f:
+            buffer = f.read()
+
+    arrays = {field: np.load(os.path.join(path, f"bm25_{field}.npy"), mmap_mode=mmap_mode)
+              for field in BM25Index.ARRAY_FIELDS}
+    params = manifest["bm25"]
+    bm25 = BM25Index.from_arrays(vocab, arrays, avgdl=params["avgdl"], k1=params["k1"],
+                                 b=params["b"], epsilon=params["epsilon"])
+
+    logger.info(f"스냅샷 로드 완료: {path} ({len(keys)}개 청크, "
+                f"{(time.perf_counter() - start) * 1000:.1f}ms)")
+    return {
+        "manifest": manifest,
+        "store": DocumentStore.from_buffers(keys, buffer, offsets, manifest["text_compression"], parents),
+        "bm25": bm25
+    }
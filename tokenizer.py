@@ -0,0 +1,155 @@
+"""
+BM25용 토크나이저
+
+기본(whitespace) 모드는 기존 `RAGSystem.tokenize`와 같은 토큰을 만들지만, 미리
+컴파일한 정규식 두 번(front matter 제거, 제목 기호/문장 부호 제거)과 한 번의
+split으로 처리해 토큰마다 정규식을 다시 돌리지 않습니다.
+
+공백 분리는 "유니베라의"와 "유니베라"를 다른 단어로 보므로 한국어 조사를 다루는
+모드를 선택할 수 있습니다.
+    ngram   한글 토큰에 글자 bi-gram을 추가 (외부 의존성 없음)
+    morph   kiwipiepy 형태소 분석으로 조사/어미 제거 (미설치 시 ngram으로 대체)
+"""
+
+import os
+import re
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# front matter 등 --- 블록
+_FRONT_MATTER = re.compile(r'---.*?---', re.DOTALL)
+# 마크다운 제목 기호("## ")와 단어 문자/공백이 아닌 모든 문자 (강조 기호 포함)
+_MARKUP_AND_PUNCT = re.compile(r'#+ |[^\w\s]')
+# 한글 음절
+_HANGUL = re.compile(r'[가-힣]')
+
+# 형태소 분석 시 남길 품사 (명사, 동사/형용사 어간, 어근, 외국어, 한자, 숫자)
+_CONTENT_TAGS = ("NN", "VV", "VA", "XR", "SL", "SH", "SN")
+
+_kiwi = None
+_kiwi_lock = threading.Lock()
+
+
+def _get_kiwi():
+    """프로세스별 Kiwi 형태소 분석기 (설치되지 않았으면 None)"""
+    global _kiwi
+    if _kiwi is None:
+        with _kiwi_lock:
+            if _kiwi is None:
+                try:
+                    from kiwipiepy import Kiwi
+                except ImportError:
+                    return None
+                _kiwi = Kiwi()
+    return _kiwi
+
+
+def clean_text(text: str) -> str:
+    """front matter와 마크다운 기호/문장 부호를 제거하고 소문자로 변환"""
+    text = _FRONT_MATTER.sub('', text).lower()
+    return _MARKUP_AND_PUNCT.sub('', text)
+
+
+class Tokenizer:
+    """BM25 색인과 질의에 공통으로 쓰는 토크나이저
+
+    인스턴스는 상태가 없어 스레드 간에 공유할 수 있고, 프로세스 풀로 보낼 수 있도록
+    pickle 가능합니다.
+    """
+
+    MODES = ("whitespace", "ngram", "morph")
+
+    def __init__(self, mode: str = "whitespace", ngram: int = 2):
+        """
+        Args:
+            mode: whitespace, ngram, morph 중 하나
+            ngram: ngram 모드의 글자 n-gram 길이
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"지원하지 않는 토크나이저 모드입니다: {mode}")
+        if mode == "morph" and _get_kiwi() is None:
+            logger.warning("kiwipiepy가 설치되지 않아 ngram 토크나이저를 사용합니다.")
+            mode = "ngram"
+        self.mode = mode
+        self.ngram = ngram
+
+    @property
+    def name(self) -> str:
+        """토크나이저 식별자 (스냅샷 무효화 판단에 사용)"""
+        if self.mode == "ngram":
+            return f"hangul-{self.ngram}gram-v1"
+        if self.mode == "morph":
+            return "kiwi-morph-v1"
+        # 기존 RAGSystem.tokenize와 출력이 같으므로 식별자를 유지
+        return "regex-whitespace-v1"
+
+    def __call__(self, text: str) -> List[str]:
+        return self.tokenize(text)
+
+    def tokenize(self, text: str) -> List[str]:
+        """텍스트를 BM25 토큰 목록으로 변환"""
+        if self.mode == "morph":
+            return self._morph_tokens(text)
+        tokens = [token for token in clean_text(text).split() if len(token) > 1]
+        if self.mode == "ngram":
+            return self._add_ngrams(tokens)
+        return tokens
+
+    def _add_ngrams(self, tokens: List[str]) -> List[str]:
+        """한글이 포함된 토큰 뒤에 글자 n-gram 추가 ("유니베라의" → 유니, 니베, 베라, 라의)"""
+        n = self.ngram
+        result = []
+        for token in tokens:
+            result.append(token)
+            if len(token) > n and _HANGUL.search(token):
+                result.extend(token[i:i + n] for i in range(len(token) - n + 1))
+        return result
+
+    def _morph_tokens(self, text: str) -> List[str]:
+        """형태소 분석 후 내용어만 남김 ("유니베라의" → 유니베라)"""
+        text = _FRONT_MATTER.sub('', text)
+        tokens = []
+        for token in _get_kiwi().tokenize(text):
+            if token.tag.startswith(_CONTENT_TAGS):
+                form = token.form.lower()
+                if len(form) > 1 or token.tag.startswith("NN"):
+                    tokens.append(form)
+        return tokens
+
+
+def tokenize_many(texts: Iterable[str], tokenizer: Optional[Tokenizer] = None,
+                  workers: int = 0, min_parallel: int = 2000,
+                  chunksize: int = 256) -> List[List[str]]:
+    """
+    여러 문서를 토크나이징 (문서가 많으면 프로세스 풀로 병렬 처리)
+
+    Args:
+        texts: 문서 본문
+        tokenizer: 사용할 토크나이저 (None이면 whitespace 모드)
+        workers: 프로세스 수 (0이면 CPU 수, 1이면 순차 처리)
+        min_parallel: 병렬 처리를 시작할 최소 문서 수 (프로세스 시작/전송 비용 때문)
+        chunksize: 작업 단위 문서 수
+
+    Returns:
+        문서별 토큰 목록 (입력 순서 유지)
+    """
+    tokenizer = tokenizer or Tokenizer()
+    texts = list(texts)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) < min_parallel:
+        return [tokenizer.tokenize(text) for text in texts]
+
+    try:
+        # 워밍업/재구축 스레드에서 호출되므로 fork 대신 forkserver 사용 (다른 스레드가 잡고 있던
+        # 락이 자식 프로세스에 복사되어 교착되지 않도록)
+        context = multiprocessing.get_context("forkserver")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            return list(pool.map(tokenizer, texts, chunksize=chunksize))
+    except Exception as e:
+        logger.warning(f"병렬 토크나이징 실패, 순차 처리합니다: {e}")
+        return [tokenizer.tokenize(text) for text in texts]
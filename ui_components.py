@@ -4,6 +4,21 @@ from datetime import datetime
 from typing import List, Dict, Any
 import json
 
+from config import Config
+
+def build_assistant_message(result: Dict[str, Any]) -> Dict[str, Any]:
+    """rag_query 결과로 어시스턴트 메시지 기록 생성 (토큰 사용량/시간 포함)"""
+    return {
+        "role": "assistant",
+        "content": result["answer"],
+        "search_results": result["search_results"],
+        "search_score": f"{result['search_results'][0]['hybrid_score']:.3f}" if result["search_results"] else "N/A",
+        "usage": result.get("usage"),
+        "timings": result.get("timings"),
+        "trace": result.get("trace"),
+        "timestamp": datetime.now().isoformat()
+    }
+
 class ChatUI:
     """채팅 UI 컴포넌트 클래스"""
     
@@ -55,6 +70,18 @@ class ChatUI:
                 st.markdown("**📋 참고 문서:**")
                 for i, result in enumerate(message["search_results"][:3], 1):
                     st.markdown(f"{i}. **{result['filename']}** (점수: {result['hybrid_score']:.3f})")
+            
+            # 단계별 소요 시간 (정보 패널에서 켜고 끔)
+            if st.session_state.get("show_timings", Config.SHOW_TIMINGS) and message.get("trace"):
+                self._display_trace(message["trace"])
+    
+    @staticmethod
+    def _display_trace(trace: Dict[str, Any]):
+        """요청 추적의 단계별 소요 시간 표시 (검색 단계는 병렬로 겹칠 수 있음)"""
+        st.markdown("**⏱️ 단계별 시간:**")
+        st.caption(" · ".join(
+            f"{span['name']} {span['duration_ms']:.0f}ms" for span in trace["spans"]
+        ))
     
     def render_input_area(self):
         """입력 영역 렌더링"""
@@ -87,27 +114,33 @@ class ChatUI:
             "timestamp": datetime.now().isoformat()
         })
         
-        # AI 답변 생성
+        # AI 답변 생성 (토큰 단위 스트리밍 표시)
         if st.session_state.rag_system:
-            with st.spinner("AI가 답변을 생성하는 중..."):
-                try:
-                    # RAG 시스템으로 답변 생성
-                    result = st.session_state.rag_system.rag_query(user_input)
-                    
-                    # AI 메시지 추가
-                    st.session_state.messages.append({
-                        "role": "assistant",
-                        "content": result["answer"],
-                        "search_results": result["search_results"],
-                        "search_score": f"{result['search_results'][0]['hybrid_score']:.3f}" if result["search_results"] else "N/A",
-                        "timestamp": datetime.now().isoformat()
-                    })
-                    
-                    # 페이지 새로고침
-                    st.rerun()
-                    
-                except Exception as e:
-                    st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
+            try:
+                placeholder = st.empty()
+                placeholder.markdown("AI가 답변을 생성하는 중...")
+                result = None
+                answer = ""
+                
+                for event in st.session_state.rag_system.rag_query_stream(
+                    user_input,
+                    vector_weight=st.session_state.vector_weight,
+                    bm25_weight=st.session_state.bm25_weight
+                ):
+                    if event["type"] == "delta":
+                        answer += event["content"]
+                        placeholder.markdown(answer + "▌")
+                    elif event["type"] == "done":
+                        result = event["result"]
+                
+                # AI 메시지 추가
+                st.session_state.messages.append(build_assistant_message(result))
+                
+                # 페이지 새로고침
+                st.rerun()
+                
+            except Exception as e:
+                st.error(f"답변 생성 중 오류가 발생했습니다: {str(e)}")
         else:
             st.error("RAG 시스템이 초기화되지 않았습니다.")
     
@@ -136,7 +169,7 @@ class ChatUI:
         with col2:
             vector_weight = st.slider(
                 "검색 가중치",
-                0.0, 1.0, 0.6, 0.1,
+                0.0, 1.0, float(st.session_state.get('vector_weight', 0.6)), 0.1,
                 key="weight_slider",
                 label_visibility="collapsed"
             )
@@ -160,6 +193,8 @@ class ChatUI:
             st.session_state.bm25_weight = bm25_weight
             st.success("검색 설정이 적용되었습니다!")
         
+        st.checkbox("⏱️ 답변별 단계 시간 표시", value=Config.SHOW_TIMINGS, key="show_timings")
+        
         # 채팅 히스토리 관리
         st.markdown("### 💬 채팅 관리")
         if st.button("채팅 초기화", type="secondary", use_container_width=True):
@@ -243,7 +278,14 @@ class SidebarUI:
             try:
                 system_info = st.session_state.rag_system.get_system_info()
                 st.info(f"📚 문서: {system_info['total_documents']}개")
-                st.info(f"🔍 벡터: {system_info['pinecone_index'].get('total_vector_count', 0)}개")
+                st.info(f"🔍 벡터: {system_info['vector_store'].get('total_vector_count', 0)}개")
+                # 구성 요소별 로딩 시간 (지연/백그라운드 초기화)
+                st.caption(" · ".join(
+                    f"{component['name']} {component['seconds']:.1f}초"
+                    if component['state'] == "ready" and component['seconds'] is not None
+                    else f"{component['name']} {component['state']}"
+                    for component in system_info['components'].values()
+                ))
             except:
                 st.warning("⚠️ 시스템 정보 로드 중...")
         else:
@@ -253,14 +295,7 @@ class SidebarUI:
         """빠른 질문 버튼들 렌더링"""
         st.markdown("### ⚡ 빠른 질문")
         
-        quick_questions = [
-            "유니베라의 미션과 비전은?",
-            "주요 제품들을 알려주세요",
-            "회사 역사를 설명해주세요",
-            "브랜드 전략은 어떻게 되나요?",
-            "ESG 경영 현황은?",
-            "글로벌 진출 현황은?"
-        ]
+        quick_questions = Config.get_sidebar_quick_questions()
         
         for question in quick_questions:
             if st.button(question, use_container_width=True, key=f"quick_{question}"):
@@ -271,18 +306,21 @@ class SidebarUI:
                     "timestamp": datetime.now().isoformat()
                 })
                 
-                # AI 답변 생성
+                # AI 답변 생성 (미리 계산한 답변이 있으면 바로 사용)
                 if st.session_state.rag_system:
+                    options = {
+                        "vector_weight": st.session_state.vector_weight,
+                        "bm25_weight": st.session_state.bm25_weight
+                    }
+                    quick_answers = st.session_state.get("quick_answers")
+                    result = quick_answers.get(question, **options) if quick_answers else None
+                    if result is not None:
+                        st.session_state.messages.append(build_assistant_message(result))
+                        st.rerun()
                     with st.spinner("답변 생성 중..."):
                         try:
-                            result = st.session_state.rag_system.rag_query(question)
-                            st.session_state.messages.append({
-                                "role": "assistant",
-                                "content": result["answer"],
-                                "search_results": result["search_results"],
-                                "search_score": f"{result['search_results'][0]['hybrid_score']:.3f}" if result["search_results"] else "N/A",
-                                "timestamp": datetime.now().isoformat()
-                            })
+                            result = st.session_state.rag_system.rag_query(question, **options)
+                            st.session_state.messages.append(build_assistant_message(result))
                             st.rerun()
                         except Exception as e:
                             st.error(f"답변 생성 실패: {str(e)}")
@@ -310,7 +348,7 @@ class SidebarUI:
             st.markdown("""
             **RAG 시스템 구성:**
             - **임베딩 모델**: E5 (multilingual-e5-base)
-            - **벡터 DB**: Pinecone
+            - **벡터 DB**: Pinecone 또는 로컬 인덱스 (exact/IVF/HNSW)
             - **검색 방식**: 하이브리드 (벡터 + BM25)
             - **생성 모델**: GPT-4o-mini
             
@@ -348,7 +386,7 @@ class SidebarUI:
                 <div style='font-size: 0.8em; color: #666;'>
                     <p><strong>📚 문서:</strong> {system_info['total_documents']}개</p>
                     <p><strong>🔍 임베딩:</strong> {system_info['embedding_dimension']}차원</p>
-                    <p><strong>📊 벡터:</strong> {system_info['pinecone_index'].get('total_vector_count', 0)}개</p>
+                    <p><strong>📊 벡터:</strong> {system_info['vector_store'].get('total_vector_count', 0)}개</p>
                     <p><strong>🤖 모델:</strong> E5-base</p>
                 </div>
                 """, unsafe_allow_html=True)
@@ -0,0 +1,589 @@
+#!/usr/bin/env python3
+"""
+벡터 저장소 백엔드
+
+RAGSystem은 Pinecone Index와 같은 인터페이스(`upsert`, `query`, `list`, `fetch`,
+`delete`, `describe_index_stats`)로 벡터 저장소를 사용하므로 CorpusLoader와 검색 경로를
+바꾸지 않고 백엔드를 교체할 수 있습니다. Config.VECTOR_STORE로 선택합니다.
+
+    pinecone   Pinecone 서버리스 인덱스 (검색마다 네트워크 왕복)
+    local      프로세스 내 인덱스 (float32/float16 행렬 정확 검색, IVF, HNSW)
+
+로컬 인덱스는 Pinecone에서 한 번 복사해 디스크에 저장합니다:
+
+    python vector_store.py sync --method auto
+"""
+
+import os
+import json
+import time
+import shutil
+import logging
+import argparse
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+METHODS = ("auto", "exact", "ivf", "hnsw")
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+def _write_json(path: str, data: Any):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+class VectorStore:
+    """벡터 저장소 인터페이스 (Pinecone Index 호환 부분집합)
+
+    응답은 Pinecone 클라이언트처럼 `matches`/`vectors` 키를 가진 dict입니다.
+    """
+
+    backend = "base"
+
+    def upsert(self, vectors: List[Any], namespace: Optional[str] = None) -> Dict[str, int]:
+        """(id, values, metadata) 튜플 또는 dict 목록 저장"""
+        raise NotImplementedError
+
+    def query(self, vector: List[float], top_k: int = 10, include_metadata: bool = False,
+              **kwargs) -> Dict[str, Any]:
+        """코사인 유사도 상위 top_k 검색"""
+        raise NotImplementedError
+
+    def list(self, prefix: Optional[str] = None, limit: int = 100,
+             namespace: Optional[str] = None) -> Iterator[List[str]]:
+        """벡터 ID를 limit 크기 페이지로 나열"""
+        raise NotImplementedError
+
+    def fetch(self, ids: List[str], namespace: Optional[str] = None) -> Dict[str, Any]:
+        """ID로 벡터 값과 메타데이터 조회"""
+        raise NotImplementedError
+
+    def delete(self, ids: List[str], namespace: Optional[str] = None):
+        """ID로 벡터 삭제"""
+        raise NotImplementedError
+
+    def describe_index_stats(self) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def persist(self):
+        """변경 사항을 영구 저장 (원격 저장소는 아무 것도 하지 않음)"""
+
+
+class PineconeVectorStore(VectorStore):
+    """Pinecone 인덱스 래퍼"""
+
+    backend = "pinecone"
+
+    def __init__(self, api_key: str, index_name: str):
+        from pinecone import Pinecone
+
+        self.api_key = api_key
+        self.index_name = index_name
+        self.pc = Pinecone(api_key=api_key)
+        self.index = self.pc.Index(index_name)
+        self._host: Optional[str] = None
+
+    @property
+    def host(self) -> str:
+        """데이터 플레인 호스트 URL (REST 직접 호출용, 처음 조회 후 재사용)"""
+        if self._host is None:
+            host = self.pc.describe_index(self.index_name).host
+            self._host = host if host.startswith("http") else f"https://{host}"
+        return self._host
+
+    def upsert(self, vectors, namespace=None):
+        kwargs = {"namespace": namespace} if namespace else {}
+        return self.index.upsert(vectors=vectors, **kwargs)
+
+    def query(self, vector, top_k=10, include_metadata=False, **kwargs):
+        return self.index.query(vector=vector, top_k=top_k, include_metadata=include_metadata, **kwargs)
+
+    def list(self, prefix=None, limit=100, namespace=None):
+        kwargs = {"namespace": namespace} if namespace else {}
+        if prefix:
+            kwargs["prefix"] = prefix
+        return self.index.list(limit=limit, **kwargs)
+
+    def fetch(self, ids, namespace=None):
+        kwargs = {"namespace": namespace} if namespace else {}
+        return self.index.fetch(ids=ids, **kwargs)
+
+    def delete(self, ids, namespace=None):
+        kwargs = {"namespace": namespace} if namespace else {}
+        return self.index.delete(ids=ids, **kwargs)
+
+    def describe_index_stats(self):
+        return self.index.describe_index_stats()
+
+
+class LocalVectorStore(VectorStore):
+    """프로세스 내 벡터 인덱스
+
+    정규화한 벡터를 float32(기본) 또는 float16 행렬로 보관하고, 검색 방식을 선택합니다.
+        exact  행렬 곱 전수 검색 (float16은 블록 단위로 float32 변환, 작은 코퍼스에 충분)
+        ivf    구면 k-means 클러스터 중 nprobe개만 전수 검색 (NumPy만 사용)
+        hnsw   hnswlib 그래프 검색 (설치된 경우)
+        auto   exact_max_vectors 이하이면 exact, 그보다 크면 hnsw(미설치 시 ivf)
+
+    float16은 메모리를 절반으로 줄이지만 NumPy의 float16 → float32 변환 비용 때문에
+    전수 검색은 느려지므로 IVF처럼 후보만 점수화하는 방식과 함께 쓰는 것이 좋습니다.
+
+    `save`로 디렉터리에 저장하고 `load`로 열면 행렬과 IVF 배열은 메모리 맵으로
+    공유됩니다. 변경 후 첫 검색에서 ANN 색인을 다시 구축합니다.
+    """
+
+    backend = "local"
+
+    def __init__(self, path: Optional[str] = None, dtype: str = "float32", method: str = "auto",
+                 nlist: int = 0, nprobe: int = 8, hnsw_m: int = 16, hnsw_ef_construction: int = 200,
+                 hnsw_ef: int = 64, exact_max_vectors: int = 50000):
+        """
+        Args:
+            path: 저장 디렉터리 (persist 시 사용)
+            dtype: 벡터 저장 자료형 (float32 또는 float16)
+            method: 검색 방식 (auto, exact, ivf, hnsw)
+            nlist: IVF 클러스터 수 (0이면 4·√N)
+            nprobe: IVF 검색 시 살펴볼 클러스터 수
+            hnsw_m: HNSW 노드당 연결 수
+            hnsw_ef_construction: HNSW 구축 시 후보 수
+            hnsw_ef: HNSW 검색 시 후보 수
+            exact_max_vectors: auto 방식에서 정확 검색을 사용할 최대 벡터 수
+        """
+        if method not in METHODS:
+            raise ValueError(f"지원하지 않는 검색 방식입니다: {method}")
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.method = method
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef = hnsw_ef
+        self.exact_max_vectors = exact_max_vectors
+
+        self.dimension: Optional[int] = None
+        self._lock = threading.RLock()
+        self._ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._metadata: List[Dict[str, Any]] = []
+        self._vectors = np.zeros((0, 0), dtype=self.dtype)
+        self._pending: List[np.ndarray] = []
+        self._ann: Optional[Dict[str, Any]] = None
+        self._ann_method: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # === 변경 ===
+
+    def upsert(self, vectors, namespace=None):
+        with self._lock:
+            for vector in vectors:
+                if isinstance(vector, dict):
+                    vector_id, values, metadata = vector["id"], vector["values"], vector.get("metadata", {})
+                else:
+                    vector_id, values, metadata = vector
+                values = np.asarray(values, dtype=np.float32).reshape(1, -1)
+                if self.dimension is None:
+                    self.dimension = values.shape[1]
+                    self._vectors = np.zeros((0, self.dimension), dtype=self.dtype)
+                elif values.shape[1] != self.dimension:
+                    raise ValueError(f"벡터 차원이 다릅니다: {values.shape[1]} != {self.dimension}")
+                row = _normalize_rows(values).astype(self.dtype)
+
+                position = self._positions.get(vector_id)
+                if position is None:
+                    self._positions[vector_id] = len(self._ids)
+                    self._ids.append(vector_id)
+                    self._metadata.append(dict(metadata or {}))
+                    self._pending.append(row)
+                else:
+                    self._consolidate()
+                    if not self._vectors.flags.writeable:
+                        self._vectors = np.array(self._vectors)
+                    self._vectors[position] = row[0]
+                    self._metadata[position] = dict(metadata or {})
+            self._ann = None
+        return {"upserted_count": len(vectors)}
+
+    def delete(self, ids, namespace=None):
+        with self._lock:
+            remove = {self._positions[vector_id] for vector_id in ids if vector_id in self._positions}
+            if not remove:
+                return
+            self._consolidate()
+            keep = np.array([i for i in range(len(self._ids)) if i not in remove], dtype=np.int64)
+            self._vectors = np.ascontiguousarray(self._vectors[keep])
+            self._ids = [self._ids[i] for i in keep]
+            self._metadata = [self._metadata[i] for i in keep]
+            self._positions = {vector_id: i for i, vector_id in enumerate(self._ids)}
+            self._ann = None
+
+    def _consolidate(self):
+        """대기 중인 추가 벡터를 행렬에 합침"""
+        if self._pending:
+            self._vectors = np.concatenate([np.asarray(self._vectors)] + self._pending)
+            self._pending = []
+
+    # === 조회 ===
+
+    def list(self, prefix=None, limit=100, namespace=None):
+        page: List[str] = []
+        for vector_id in list(self._ids):
+            if prefix and not vector_id.startswith(prefix):
+                continue
+            page.append(vector_id)
+            if len(page) >= limit:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def fetch(self, ids, namespace=None):
+        with self._lock:
+            self._consolidate()
+            vectors = {}
+            for vector_id in ids:
+                position = self._positions.get(vector_id)
+                if position is not None:
+                    vectors[vector_id] = {
+                        "id": vector_id,
+                        "values": self._vectors[position].astype(np.float32).tolist(),
+                        "metadata": self._metadata[position]
+                    }
+        return {"vectors": vectors, "namespace": namespace or ""}
+
+    def describe_index_stats(self):
+        return {
+            "dimension": self.dimension or 0,
+            "total_vector_count": len(self._ids),
+            "namespaces": {"": {"vector_count": len(self._ids)}},
+            "backend": self.backend,
+            "method": self._ann_method or self.resolve_method(),
+            "dtype": self.dtype.name
+        }
+
+    def resolve_method(self) -> str:
+        """auto 방식을 실제 검색 방식으로 결정"""
+        if self.method != "auto":
+            return self.method
+        if len(self._ids) <= self.exact_max_vectors:
+            return "exact"
+        try:
+            import hnswlib  # noqa: F401
+            return "hnsw"
+        except ImportError:
+            return "ivf"
+
+    def query(self, vector, top_k=10, include_metadata=False, include_values=False,
+              namespace=None, **kwargs):
+        ann, method, matrix = self._ensure_index()
+        if matrix is None or len(matrix) == 0:
+            return {"matches": [], "namespace": namespace or ""}
+
+        query = np.asarray(vector, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        k = min(top_k, len(matrix))
+        if method == "hnsw":
+            positions, scores = self._search_hnsw(ann, query, k)
+        elif method == "ivf":
+            positions, scores = self._search_ivf(ann, matrix, query, k)
+        else:
+            positions, scores = self._search_exact(matrix, query, k)
+
+        matches = []
+        for position, score in zip(positions.tolist(), scores.tolist()):
+            match = {"id": self._ids[position], "score": float(score)}
+            if include_metadata:
+                match["metadata"] = self._metadata[position]
+            if include_values:
+                match["values"] = matrix[position].astype(np.float32).tolist()
+            matches.append(match)
+        return {"matches": matches, "namespace": namespace or ""}
+
+    # === 검색 방식 ===
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        k = min(k, len(scores))
+        if k <= 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return top, scores[top]
+
+    @staticmethod
+    def _scores(matrix: np.ndarray, query: np.ndarray, block: int = 32768) -> np.ndarray:
+        """행렬 · 질의 (float16은 블록 단위로 float32 변환 후 BLAS 사용)"""
+        if matrix.dtype == np.float32:
+            return matrix @ query
+        scores = np.empty(len(matrix), dtype=np.float32)
+        for start in range(0, len(matrix), block):
+            scores[start:start + block] = matrix[start:start + block].astype(np.float32) @ query
+        return scores
+
+    def _search_exact(self, matrix, query, k):
+        return self._top_k(self._scores(matrix, query), k)
+
+    def _search_ivf(self, ann, matrix, query, k):
+        centroids, order, offsets = ann["centroids"], ann["order"], ann["offsets"]
+        nprobe = min(self.nprobe, len(centroids))
+        probe = np.argpartition(-(centroids @ query), nprobe - 1)[:nprobe]
+        candidates = np.concatenate([order[offsets[c]:offsets[c + 1]] for c in probe])
+        if len(candidates) < k:
+            return self._search_exact(matrix, query, k)
+        candidates.sort()  # 메모리 맵 접근을 순차적으로
+        local, scores = self._top_k(self._scores(matrix[candidates], query), k)
+        return candidates[local], scores
+
+    def _search_hnsw(self, ann, query, k):
+        index = ann["hnsw"]
+        index.set_ef(max(self.hnsw_ef, k))
+        labels, distances = index.knn_query(query.reshape(1, -1), k=k)
+        return labels[0].astype(np.int64), 1.0 - distances[0]
+
+    # === ANN 색인 구축 ===
+
+    def _ensure_index(self):
+        """현재 행렬과 검색 방식에 맞는 색인 반환 (변경 후 첫 검색에서 재구축)"""
+        with self._lock:
+            self._consolidate()
+            if self._ann is None:
+                method = self.resolve_method()
+                start = time.perf_counter()
+                if method == "ivf" and len(self._vectors):
+                    self._ann = self._build_ivf(self._vectors)
+                elif method == "hnsw" and len(self._vectors):
+                    self._ann = self._build_hnsw(self._vectors)
+                else:
+                    self._ann = {}
+                self._ann_method = method
+                if method != "exact":
+                    logger.info(f"로컬 벡터 색인 구축 ({method}, {len(self._vectors)}개): "
+                                f"{time.perf_counter() - start:.2f}초")
+            return self._ann, self._ann_method, self._vectors
+
+    def _build_ivf(self, matrix: np.ndarray, iterations: int = 10, seed: int = 0) -> Dict[str, np.ndarray]:
+        """구면 k-means로 클러스터를 만들고 클러스터별 행 번호를 연속 배열로 정리"""
+        n = len(matrix)
+        nlist = self.nlist or max(1, int(4 * np.sqrt(n)))
+        nlist = min(nlist, n)
+        rng = np.random.default_rng(seed)
+        sample = matrix[np.sort(rng.choice(n, size=min(n, nlist * 40), replace=False))].astype(np.float32)
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(iterations):
+            assign = np.argmax(sample @ centroids.T, axis=1)
+            # 클러스터별 합 (정렬 후 구간 합)
+            order = np.argsort(assign, kind="stable")
+            counts = np.bincount(assign, minlength=nlist)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            nonempty = counts > 0
+            sums = centroids.copy()  # 빈 클러스터는 유지
+            sums[nonempty] = np.add.reduceat(sample[order], starts[nonempty], axis=0)
+            centroids = _normalize_rows(sums)
+
+        assign = np.empty(n, dtype=np.int64)
+        for start in range(0, n, 32768):
+            assign[start:start + 32768] = np.argmax(
+                matrix[start:start + 32768].astype(np.float32) @ centroids.T, axis=1)
+        order = np.argsort(assign, kind="stable")
+        offsets = np.zeros(nlist + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=nlist), out=offsets[1:])
+        return {"centroids": centroids.astype(np.float32), "order": order, "offsets": offsets}
+
+    def _build_hnsw(self, matrix: np.ndarray) -> Dict[str, Any]:
+        import hnswlib
+
+        index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        index.init_index(max_elements=len(matrix), ef_construction=self.hnsw_ef_construction, M=self.hnsw_m)
+        for start in range(0, len(matrix), 32768):
+            block = np.asarray(matrix[start:start + 32768], dtype=np.float32)
+            index.add_items(block, np.arange(start, start + len(block)))
+        index.set_ef(self.hnsw_ef)
+        return {"hnsw": index}
+
+    # === 저장/로드 ===
+
+    def memory_bytes(self) -> int:
+        """벡터 행렬과 ANN 배열 크기"""
+        size = self._vectors.nbytes + sum(block.nbytes for block in self._pending)
+        for value in (self._ann or {}).values():
+            if isinstance(value, np.ndarray):
+                size += value.nbytes
+        return size
+
+    def persist(self):
+        if self.path:
+            self.save(self.path)
+
+    def save(self, path: str):
+        """디렉터리에 저장 (임시 디렉터리에 쓴 뒤 교체)"""
+        ann, method, matrix = self._ensure_index()
+        start = time.perf_counter()
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        if os.path.exists(tmp_path):
+            shutil.rmtree(tmp_path)
+        os.makedirs(tmp_path)
+
+        np.save(os.path.join(tmp_path, "vectors.npy"), np.ascontiguousarray(matrix))
+        _write_json(os.path.join(tmp_path, "ids.json"), self._ids)
+        _write_json(os.path.join(tmp_path, "metadata.json"), self._metadata)
+        if method == "ivf":
+            for name in ("centroids", "order", "offsets"):
+                np.save(os.path.join(tmp_path, f"ivf_{name}.npy"), ann[name])
+        elif method == "hnsw":
+            ann["hnsw"].save_index(os.path.join(tmp_path, "hnsw.bin"))
+
+        _write_json(os.path.join(tmp_path, MANIFEST_FILE), {
+            "format_version": FORMAT_VERSION,
+            "dimension": self.dimension,
+            "dtype": self.dtype.name,
+            "count": len(self._ids),
+            "method": method,
+            "nprobe": self.nprobe,
+            "hnsw_ef": self.hnsw_ef
+        })
+
+        old_path = f"{path}.old-{os.getpid()}"
+        if os.path.exists(path):
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        if os.path.exists(old_path):
+            shutil.rmtree(old_path, ignore_errors=True)
+        logger.info(f"로컬 벡터 저장소 저장: {path} ({len(self._ids)}개, {method}, "
+                    f"{time.perf_counter() - start:.2f}초)")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True, **kwargs) -> "LocalVectorStore":
+        """
+        저장된 디렉터리 열기
+
+        Args:
+            path: 저장 디렉터리
+            mmap: 행렬/IVF 배열을 메모리 맵으로 열지 여부
+            **kwargs: 생성자 인자 (검색 파라미터 재정의)
+        """
+        with open(os.path.join(path, MANIFEST_FILE), encoding="utf-8") as f:
+            manifest = json.load(f)
+        if manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 벡터 저장소 형식입니다: {path}")
+
+        kwargs.setdefault("dtype", manifest["dtype"])
+        kwargs.setdefault("method", manifest["method"])
+        store = cls(path=path, **kwargs)
+        mmap_mode = "r" if mmap else None
+        store.dimension = manifest["dimension"]
+        store._vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode=mmap_mode)
+        with open(os.path.join(path, "ids.json"), encoding="utf-8") as f:
+            store._ids = json.load(f)
+        with open(os.path.join(path, "metadata.json"), encoding="utf-8") as f:
+            store._metadata = json.load(f)
+        store._positions = {vector_id: i for i, vector_id in enumerate(store._ids)}
+
+        # 저장된 색인이 요청한 방식과 같으면 재사용
+        method = store.resolve_method()
+        if method == manifest["method"] == "ivf":
+            store._ann = {name: np.load(os.path.join(path, f"ivf_{name}.npy"), mmap_mode=mmap_mode)
+                          for name in ("centroids", "order", "offsets")}
+            store._ann_method = method
+        elif method == manifest["method"] == "hnsw":
+            import hnswlib
+
+            index = hnswlib.Index(space="ip", dim=store.dimension)
+            index.load_index(os.path.join(path, "hnsw.bin"), max_elements=len(store._ids))
+            store._ann = {"hnsw": index}
+            store._ann_method = method
+        elif method == "exact":
+            store._ann, store._ann_method = {}, method
+        return store
+
+    def copy_from(self, index, batch_size: int = 100,
+                  namespace: Optional[str] = None) -> int:
+        """다른 인덱스(Pinecone 등)의 벡터와 메타데이터를 모두 복사"""
+        from corpus_loader import CorpusLoader
+
+        loader = CorpusLoader(index, fetch_batch_size=batch_size, namespace=namespace)
+        copied = 0
+        for ids in loader.iter_id_batches():
+            response = index.fetch(ids=ids, **({"namespace": namespace} if namespace else {}))
+            vectors = response["vectors"] if isinstance(response, dict) else response.vectors
+            records = []
+            for vector_id in ids:
+                vector = vectors.get(vector_id)
+                if vector is None:
+                    continue
+                values = vector["values"] if isinstance(vector, dict) else vector.values
+                metadata = vector.get("metadata") if isinstance(vector, dict) else vector.metadata
+                records.append((vector_id, values, metadata or {}))
+            self.upsert(records)
+            copied += len(records)
+            logger.info(f"벡터 복사 중: {copied}개")
+        return copied
+
+
+def create_vector_store(backend: str, pinecone_api_key: Optional[str] = None,
+                        pinecone_index_name: Optional[str] = None) -> VectorStore:
+    """
+    Config 설정에 따른 벡터 저장소 생성
+
+    Args:
+        backend: pinecone 또는 local
+        pinecone_api_key: Pinecone API 키 (pinecone 백엔드)
+        pinecone_index_name: Pinecone 인덱스 이름 (pinecone 백엔드)
+    """
+    from config import Config
+
+    if backend == "pinecone":
+        return PineconeVectorStore(pinecone_api_key, pinecone_index_name)
+    if backend != "local":
+        raise ValueError(f"지원하지 않는 벡터 저장소입니다: {backend}")
+
+    options = {
+        "method": Config.LOCAL_VECTOR_METHOD,
+        "nprobe": Config.LOCAL_VECTOR_NPROBE,
+        "hnsw_ef": Config.LOCAL_VECTOR_HNSW_EF,
+        "exact_max_vectors": Config.LOCAL_VECTOR_EXACT_MAX
+    }
+    path = Config.LOCAL_VECTOR_DIR
+    if os.path.exists(os.path.join(path, MANIFEST_FILE)):
+        store = LocalVectorStore.load(path, **options)
+    else:
+        logger.warning(f"로컬 벡터 저장소가 없습니다: {path} (python vector_store.py sync로 생성)")
+        store = LocalVectorStore(path=path, dtype=Config.LOCAL_VECTOR_DTYPE, **options)
+    logger.info(f"로컬 벡터 저장소: {len(store)}개 벡터 ({store.resolve_method()})")
+    return store
+
+
+def main():
+    from config import Config
+
+    parser = argparse.ArgumentParser(description="로컬 벡터 저장소 관리")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Pinecone 인덱스를 로컬 저장소로 복사")
+    sync.add_argument("--path", default=Config.LOCAL_VECTOR_DIR)
+    sync.add_argument("--method", choices=METHODS, default=Config.LOCAL_VECTOR_METHOD)
+    sync.add_argument("--dtype", choices=("float32", "float16"), default=Config.LOCAL_VECTOR_DTYPE)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=Config.LOG_LEVEL, format=Config.LOG_FORMAT)
+    source = PineconeVectorStore(Config.PINECONE_API_KEY, Config.PINECONE_INDEX_NAME)
+    store = LocalVectorStore(path=args.path, dtype=args.dtype, method=args.method)
+    start = time.perf_counter()
+    copied = store.copy_from(source)
+    store.save(args.path)
+    print(f"✅ {copied}개 벡터 복사 완료 ({store.resolve_method()}, {store.dtype.name}, "
+          f"{store.memory_bytes() / 1e6:.1f}MB, {time.perf_counter() - start:.1f}초) → {args.path}")
+
+
+if __name__ == "__main__":
+    main()